@@ -5,29 +5,34 @@ from flask import Flask
 from flask_cors import CORS
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 
-from backend.api.routes import register_blueprints
-from backend.api.middleware import setup_error_handlers
-
-# Configure logging
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-    handlers=[
-        logging.StreamHandler(sys.stdout),
-        logging.FileHandler('redpather.log')
-    ]
-)
-
-# Set library log levels
-logging.getLogger('urllib3').setLevel(logging.WARNING)
-logging.getLogger('selenium').setLevel(logging.WARNING)
-logging.getLogger('appium').setLevel(logging.INFO)
+# Paralel analiz worker'ları (spawn) bu dosyayı yeniden import eder: modül seviyesinde
+# yalnızca tanımlar bulunur; log dosyası, rotalar ve context singleton'ları sunucuda kurulur
 
 logger = logging.getLogger(__name__)
 
 
+def configure_logging():
+    """Log to stdout and redpather.log"""
+    logging.basicConfig(
+        level=logging.INFO,
+        format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
+        handlers=[
+            logging.StreamHandler(sys.stdout),
+            logging.FileHandler('redpather.log')
+        ]
+    )
+
+    # Set library log levels
+    logging.getLogger('urllib3').setLevel(logging.WARNING)
+    logging.getLogger('selenium').setLevel(logging.WARNING)
+    logging.getLogger('appium').setLevel(logging.INFO)
+
+
 def create_app():
     """Application factory"""
+    from backend.api.routes import register_blueprints
+    from backend.api.middleware import setup_error_handlers
+
     app = Flask(__name__)
 
     # Enable CORS
@@ -46,11 +51,10 @@ def create_app():
     return app
 
 
-# Create app instance
-app = create_app()
-
-
 if __name__ == '__main__':
+    configure_logging()
+    app = create_app()
+
     logger.info("=" * 60)
     logger.info("🚀 QA Red Pather Server Starting...")
     logger.info("=" * 60)
@@ -10,11 +10,25 @@ from backend.core.context import driver_mgr, cache_mgr
 from backend.core.exceptions import DriverError, ValidationError
 from backend.api.middleware import create_error_response, create_success_response
 from backend.api.services.page_analyzer import PageAnalyzer
+from backend.api.services.tree_index import TreeIndex
 
 logger = logging.getLogger(__name__)
 actions_bp = Blueprint('actions', __name__)
 
 
+def _get_screen_index(source, platform):
+    """
+    Parsed tree + lookup index for a page source.
+    Reuses the index built by a recent scan; otherwise parses once and keeps it.
+    """
+    index = cache_mgr.get_screen_index(source, platform)
+    if index is None:
+        tree = etree.fromstring(source.encode('utf-8'))
+        index = TreeIndex(tree, platform)
+        cache_mgr.set_screen_index(source, index)
+    return index
+
+
 @actions_bp.route('/tap', methods=['POST'])
 def tap():
     """
@@ -64,14 +78,15 @@ def tap():
             logger.warning("⚠️ Cache miss for Smart Tap, fetching fresh source (Slower)")
             source = driver_mgr.get_page_source()
 
-        analyzer = PageAnalyzer(driver)
         element_clicked = False
         action_log = {}
         final_x, final_y = scaled_x, scaled_y
 
         if source:
             try:
-                tree = etree.fromstring(source.encode('utf-8'))
+                index = _get_screen_index(source, platform)
+                analyzer = PageAnalyzer(driver, index=index)
+                tree = index.root
                 target_elem = None
 
                 # 1. Raw Point (iOS priority)
@@ -160,6 +175,88 @@ def tap():
         return jsonify(create_error_response("Tap action failed", str(e))), 500
 
 
+@actions_bp.route('/hit-test', methods=['POST'])
+def hit_test():
+    """
+    Return the z-ordered element stack under a point of the last scanned screen.
+    Works on the cached XML only (no device round trip), for hover highlighting.
+    """
+    try:
+        req = request.json or {}
+
+        x = req.get('x')
+        y = req.get('y')
+        img_w = req.get('img_w')
+        img_h = req.get('img_h')
+        platform = req.get('platform', 'ANDROID')
+
+        if x is None or y is None:
+            raise ValidationError("Missing coordinates", "x and y coordinates are required")
+
+        cached_data = cache_mgr.get_last_scan()
+        if not cached_data:
+            raise ValidationError("No cached screen", "Scan the screen before hit-testing")
+
+        # Image coordinates -> device coordinates (optional)
+        if img_w and img_h:
+            win_size = cached_data["window"]
+            x = x * win_size['width'] / img_w
+            y = y * win_size['height'] / img_h
+
+        index = _get_screen_index(cached_data["source"], platform)
+        analyzer = PageAnalyzer(None, index=index)
+        stack = analyzer.hit_test(index.root, int(x), int(y), platform)
+        target = next((i for i, item in enumerate(stack) if item["tap_target"]), -1)
+
+        return jsonify(create_success_response(data={
+            "x": int(x),
+            "y": int(y),
+            "stack": stack,
+            "target": target
+        }))
+
+    except ValidationError as e:
+        raise
+    except Exception as e:
+        logger.error(f"Hit-test error: {e}", exc_info=True)
+        return jsonify(create_error_response("Hit-test failed", str(e))), 500
+
+
+@actions_bp.route('/elements/<int:node>/xpath', methods=['GET'])
+def element_full_xpath(node):
+    """
+    Absolute XPath of an element of a scanned screen (built on demand).
+    `node` is the element's "node" field and `source_hash` the "source_hash"
+    of the scan result it comes from (not necessarily the last scan).
+    """
+    try:
+        platform = request.args.get('platform', 'ANDROID')
+        source_hash = request.args.get('source_hash')
+        if not source_hash:
+            raise ValidationError("Missing source_hash", "Send the source_hash of the scan the element belongs to")
+
+        cached_data = cache_mgr.get_scan(source_hash)
+        if not cached_data:
+            return jsonify(create_error_response("Screen not cached", "It may have expired, scan again")), 404
+
+        index = _get_screen_index(cached_data["source"], platform)
+        full_xpath = PageAnalyzer(None, index=index).get_full_xpath(index.root, platform, node)
+        if full_xpath is None:
+            return jsonify(create_error_response("Unknown element", f"No node at position {node}")), 404
+
+        return jsonify(create_success_response(data={
+            "node": node,
+            "source_hash": source_hash,
+            "full_xpath": full_xpath
+        }))
+
+    except ValidationError as e:
+        raise
+    except Exception as e:
+        logger.error(f"Full XPath error: {e}", exc_info=True)
+        return jsonify(create_error_response("Failed to build XPath", str(e))), 500
+
+
 @actions_bp.route('/scroll', methods=['POST'])
 def scroll():
     """Perform scroll action"""
@@ -23,7 +23,16 @@ ALLOWED_CONFIG_KEYS = {
     'IOS_UDID',
     'IOS_PLATFORM_VER',
     'IOS_ORG_ID',
-    'IOS_SIGN_ID'
+    'IOS_SIGN_ID',
+    'FINGERPRINT_SKIP_IDS',
+    'FINGERPRINT_SKIP_TYPES',
+    'FINGERPRINT_SKIP_ATTRS',
+    'FINGERPRINT_VOLATILE_TEXT',
+    'FINGERPRINT_SYSTEM_PKGS',
+    'SCREENSHOT_RECHECK_AGE',
+    'DISK_CACHE_DIR',
+    'WATCH_INTERVAL',
+    'WATCH_PRECOMPUTE'
 }
 
 
@@ -2,105 +2,659 @@
 Scan endpoint - Screen analysis with centralized caching
 """
 import concurrent.futures
-import hashlib
+import json
 import logging
+import re
 import time
-from flask import Blueprint, request, jsonify
+import zlib
+from flask import Blueprint, Response, request, jsonify, stream_with_context
 
 # ✅ GÜNCELLENDİ: cache_mgr eklendi
-from backend.core.context import driver_mgr, config_mgr, cache_mgr
+from backend.core.context import driver_mgr, config_mgr, cache_mgr, screen_store, scan_flights
 from backend.core.exceptions import DriverError, ParseError, ValidationError
-from backend.core.constants import VALID_PLATFORMS, SCREENSHOT_CACHE_TTL
+from backend.core.constants import (
+    VALID_PLATFORMS, SCREENSHOT_CACHE_TTL, IMAGE_CODECS, IMAGE_QUALITY_PROFILES, IMAGE_DEFAULT_PROFILE,
+    SCREENSHOT_PHASH_THRESHOLD, SCREENSHOT_RECHECK_AGE, STREAM_KEEPALIVE, WATCH_KEEPALIVE
+)
+from backend.core.fingerprint import screen_fingerprint
 from backend.api.services.page_analyzer import PageAnalyzer
+from backend.api.services import renditions
+from backend.api.services.locator_memo import locator_memo
 from backend.api.middleware import create_error_response, create_success_response
 
 logger = logging.getLogger(__name__)
 scan_bp = Blueprint('scan', __name__)
 
-@scan_bp.route('/scan', methods=['POST'])
-def scan():
+SCREENSHOT_ID = re.compile(r"[0-9a-f]{24}")
+
+
+def _device_key(platform: str, config: dict) -> tuple:
+    """Identity of the device a scan runs against"""
+    if platform == "IOS":
+        return platform, config.get("IOS_UDID") or config.get("IOS_DEVICE")
+    return platform, config.get("ANDROID_DEVICE")
+
+
+def _rendition_url(screenshot_id, level, codec, profile):
     """
-    Scan current screen and detect elements
+    URL of a screenshot rendition (content-addressed, see /screens/<id>.<codec>)
     """
+    return f"/api/screens/{screenshot_id}.{codec}?level={level}&q={profile}"
+
+
+def _rendition_options(req: dict) -> tuple:
+    """
+    Rendition options of a scan request: (codec, quality profile, viewport width, viewport height).
+    The viewport is the size of the screenshot box in physical pixels (CSS size x devicePixelRatio).
+    """
+    codec = req.get("image_format", "jpg")
+    profile = req.get("image_quality", IMAGE_DEFAULT_PROFILE)
+    if codec not in IMAGE_CODECS:
+        raise ValidationError(f"Invalid image format: {codec}", f"Must be one of: {', '.join(IMAGE_CODECS)}")
+    if profile not in IMAGE_QUALITY_PROFILES:
+        raise ValidationError(f"Invalid image quality: {profile}",
+                              f"Must be one of: {', '.join(IMAGE_QUALITY_PROFILES)}")
     try:
-        req = request.json or {}
-        platform = req.get("platform", "ANDROID")
-        verify = req.get("verify", True)
-        prefix = req.get("prefix", "").strip().lower()
+        viewport_w = float(req.get("viewport_w") or 0) or None
+        viewport_h = float(req.get("viewport_h") or 0) or None
+    except (TypeError, ValueError):
+        raise ValidationError("Invalid viewport size", "viewport_w and viewport_h must be numbers")
+    return codec, profile, viewport_w, viewport_h
 
-        if platform not in VALID_PLATFORMS:
-            raise ValidationError(f"Invalid platform: {platform}", f"Must be one of: {', '.join(VALID_PLATFORMS)}")
 
-        config = config_mgr.get_all()
-        is_valid, error_msg = config_mgr.validate_config(config, platform)
+def _screenshot_info(screenshot_id, win_size, options):
+    """
+    Screenshot part of a scan response: full resolution size, device scale
+    (image pixels per device unit) and the pyramid levels with their URLs.
+    Nothing is encoded here; each rendition is encoded on its first request.
+    """
+    codec, profile, viewport_w, viewport_h = options
+    image = cache_mgr.get_image(screenshot_id)
+    size = renditions.image_size(image) if image else None
+    levels = renditions.pyramid(*size) if size else [(win_size['width'], win_size['height'])]
+    fit = renditions.fit_level(levels, viewport_w, viewport_h)
+
+    info = renditions.levels_info(levels, win_size['width'])
+    for level in info:
+        level["url"] = _rendition_url(screenshot_id, level["level"], codec, profile)
+
+    return {
+        "id": screenshot_id,
+        "width": levels[0][0],
+        "height": levels[0][1],
+        "scale": info[0]["scale"],
+        "format": codec,
+        "quality": profile,
+        "fit_level": fit,
+        "url": info[fit]["url"],
+        "levels": info
+    }
 
-        if not is_valid:
-            raise ValidationError(f"Invalid {platform} configuration", error_msg)
 
-        driver = driver_mgr.start_driver(platform)
+def _capture_screen(platform: str, source: str = None):
+    """
+    Start the driver and capture page source, screenshot and window size.
+    Concurrent scans of the same device share one capture (single-flight).
+    The last scan is not changed here: scan endpoints set it, watch mode warm-ups do not.
+
+    Args:
+        platform: Platform name
+        source: Page source already read from the device (watch mode), None to read it
 
-        # 1. Kaynağı al
+    Returns:
+        tuple: (driver, screen dict, changes dict). The screen is the decoded cache entry
+               (source_hash, source, image, image_id, window, phash, checksum, timestamp).
+               Its source is the one stored with the entry: on a fingerprint hit it is the
+               cached source, not the one just read, so the node ids of an analysis match
+               the source later lookups resolve them on.
+    """
+    if platform not in VALID_PLATFORMS:
+        raise ValidationError(f"Invalid platform: {platform}", f"Must be one of: {', '.join(VALID_PLATFORMS)}")
+
+    config = config_mgr.get_all()
+    is_valid, error_msg = config_mgr.validate_config(config, platform)
+
+    if not is_valid:
+        raise ValidationError(f"Invalid {platform} configuration", error_msg)
+
+    # UI yeniden denemeleri / ikinci sekme aynı cihaz çağrılarını tekrar yapmaz
+    return scan_flights.do(("capture",) + _device_key(platform, config),
+                           lambda: _capture_device(platform, config, source))
+
+
+def _capture_device(platform: str, config: dict, source: str = None):
+    """
+    Device part of _capture_screen (runs once per in-flight capture)
+    """
+    driver = driver_mgr.start_driver(platform)
+
+    # 1. Kaynağı al
+    if source is None:
         source = driver_mgr.get_page_source()
-        if not source:
-            raise DriverError("Failed to get page source", "Device might be locked or app is not running")
+    if not source:
+        raise DriverError("Failed to get page source", "Device might be locked or app is not running")
 
-        source_hash = hashlib.md5(source.encode()).hexdigest()
-        optimized_image = None
-        win_size = None
+    # Saat, pil, odak gibi değişken kısımlar hash'e girmez
+    source_hash = screen_fingerprint(source, config)
+    previous = cache_mgr.get_last_scan()
 
-        # 2. Önbellek kontrolü (Merkezi Cache)
-        # ✅ GÜNCELLENDİ: cache_mgr kullanılıyor
-        cached_data = cache_mgr.get_scan(source_hash)
+    # 2. Önbellek kontrolü (Merkezi Cache)
+    # ✅ GÜNCELLENDİ: cache_mgr kullanılıyor
+    cached_data = cache_mgr.get_scan(source_hash)
 
-        if cached_data:
-            optimized_image = cached_data["image"]
-            win_size = cached_data["window"]
-            logger.info("📸 Using cached screenshot (Central Cache)")
+    if cached_data and not _needs_recheck(cached_data, config):
+        logger.info("📸 Using cached screenshot (Central Cache)")
+        current = cached_data
+    else:
+        current = _capture_screenshot(source, source_hash, cached_data, previous)
 
-            # Son taramayı güncelle (Tap işlemi için kritik)
-            cache_mgr.last_scan_data = cached_data
-        else:
-            # Cache yoksa yeni görüntü al
-            with concurrent.futures.ThreadPoolExecutor() as executor:
-                future_shot = executor.submit(driver_mgr.take_screenshot)
-                future_win = executor.submit(driver_mgr.get_window_size)
+    return driver, current, _screen_changes(previous, current)
 
-                raw_screenshot = future_shot.result()
-                if not raw_screenshot:
-                    raise DriverError("Failed to capture screenshot", "Screen might be locked or device disconnected")
 
-                win_size = future_win.result()
+def _needs_recheck(cached_data, config):
+    """
+    Whether the cached screenshot of an unchanged source is compared with the device again.
+    Entries older than the cache TTL always are; fresh ones (including those just
+    promoted from the disk tier) only after SCREENSHOT_RECHECK_AGE seconds, if set
+    (opt-in, for animated screens).
+    """
+    try:
+        recheck_age = float(config.get("SCREENSHOT_RECHECK_AGE") or 0)
+    except (TypeError, ValueError):
+        recheck_age = SCREENSHOT_RECHECK_AGE
+    age = time.time() - cached_data["timestamp"]
+    return age > cache_mgr.ttl or 0 < recheck_age < age
 
-            if win_size['width'] == 0 or win_size['height'] == 0:
-                raise DriverError("Failed to get window size", "Device might be in an invalid state")
 
-            analyzer = PageAnalyzer(driver)
-            optimized_image = analyzer.optimize_image(raw_screenshot)
+def _capture_screenshot(source, source_hash, cached_data, previous):
+    """
+    Take a screenshot and cache it. A frame identical (perceptual hash and pixel
+    checksum) to the cached or the previous screenshot reuses it, so its renditions
+    are not encoded again; a changed frame of an unchanged source replaces the stale one.
+
+    Returns:
+        dict: Decoded cache entry of the current screen
+    """
+    if cached_data:
+        # Kaynak değişmedi: pikseller (animasyon) kontrol edilir
+        raw_screenshot = driver_mgr.take_screenshot()
+        win_size = cached_data["window"]
+    else:
+        # Cache yoksa yeni görüntü al
+        with concurrent.futures.ThreadPoolExecutor() as executor:
+            future_shot = executor.submit(driver_mgr.take_screenshot)
+            future_win = executor.submit(driver_mgr.get_window_size)
+
+            raw_screenshot = future_shot.result()
+            win_size = future_win.result()
+
+    if not raw_screenshot:
+        raise DriverError("Failed to capture screenshot", "Screen might be locked or device disconnected")
+    if win_size['width'] == 0 or win_size['height'] == 0:
+        raise DriverError("Failed to get window size", "Device might be in an invalid state")
+
+    phash, checksum = renditions.frame_signature(raw_screenshot)
+
+    if cached_data:
+        if renditions.same_image((phash, checksum), (cached_data["phash"], cached_data.get("checksum"))):
+            logger.info("📸 Cached screenshot still current (perceptual hash)")
+            cache_mgr.confirm_image(source_hash)
+            return cached_data
 
-            # ✅ GÜNCELLENDİ: Sonucu merkezi cache'e kaydet
-            cache_mgr.save_scan(source_hash, optimized_image, source, win_size)
-            logger.info(f"📸 Screenshot captured and cached (TTL: {SCREENSHOT_CACHE_TTL}s)")
+        replaced = cache_mgr.replace_image(source_hash, raw_screenshot, phash, checksum)
+        if replaced:
+            logger.info("📸 Screenshot changed on an unchanged screen, replaced")
+            return replaced
 
-        # 3. Analiz (XML Parse)
+    # Görünmeyen bir değişiklik (attribute) - önceki görüntü ve rendition'ları kullanılır
+    if previous and renditions.same_image((phash, checksum), (previous.get("phash"), previous.get("checksum"))):
+        logger.info("📸 Source changed but the frame did not, reusing the previous screenshot")
+        raw_screenshot, phash = previous["image"], previous["phash"]
+
+    # ✅ GÜNCELLENDİ: Sonucu merkezi cache'e kaydet
+    # Ham görüntü saklanır, istemcinin istediği boyutlar ilk istekte kodlanır
+    current = cache_mgr.save_scan(source_hash, raw_screenshot, source, win_size, phash, checksum)
+    logger.info(f"📸 Screenshot captured and cached (TTL: {SCREENSHOT_CACHE_TTL}s)")
+    return current
+
+
+def _screen_changes(previous, current):
+    """
+    What changed since the previous scan, as separate signals:
+    structural (page source fingerprint) and visual (screenshot perceptual hash + pixel checksum)
+    """
+    if not previous:
+        return {"structural": True, "visual": True, "visual_distance": None}
+
+    distance = renditions.hash_distance(previous.get("phash"), current.get("phash"))
+    if distance is None:
+        visual = previous.get("image_id") != current["image_id"]
+    else:
+        visual = distance > SCREENSHOT_PHASH_THRESHOLD or previous.get("checksum") != current.get("checksum")
+    return {
+        "structural": previous.get("source_hash") != current["source_hash"],
+        "visual": visual,
+        "visual_distance": distance
+    }
+
+
+def _remember_analysis(source, source_hash, analysis_key, index, elements, page_name):
+    """
+    Keep the analysis for Smart Tap and in the screen's cache entry.
+    The last analysis (incremental base) is set by the scan endpoints only.
+    """
+    # Smart Tap / hit-test aynı ekran için parse edilmiş ağacı kullanır
+    cache_mgr.set_screen_index(source, index)
+    cache_mgr.save_analysis(source_hash, analysis_key, {
+        "elements": elements,
+        "page_name": page_name
+    })
+
+
+def _analyze_screen(driver, source, source_hash, analysis_key, win_size, parallel):
+    """
+    Analyze a captured screen and remember the result.
+    Concurrent scans of the same screen with the same options share one analysis.
+
+    Returns:
+        tuple: (analysis result, analysis snapshot for set_last_analysis)
+    """
+    def run():
+        platform, prefix, verify, include_full_xpath = analysis_key
         analyzer = PageAnalyzer(driver)
-        result = analyzer.analyze(source, platform, verify, prefix, win_size)
+        result = analyzer.analyze(source, platform, verify, prefix, win_size,
+                                  parallel=parallel, include_full_xpath=include_full_xpath,
+                                  previous=cache_mgr.get_last_analysis(), screens=screen_store)
 
         if "error" in result:
             raise ParseError("Page analysis failed", result["error"])
 
+        _remember_analysis(source, source_hash, analysis_key, analyzer.index,
+                           result['elements'], result['page_name'])
+        return result, analyzer.snapshot
+
+    return scan_flights.do(("analyze", source_hash) + analysis_key, run)
+
+
+def _reuse_analysis(source_hash, analysis_key):
+    """
+    Cached analysis of an unchanged screen (None on cache miss)
+    """
+    cached = cache_mgr.get_analysis(source_hash, analysis_key)
+    if cached:
+        # Parse edilmiş ağaç ayrı tutulur (Smart Tap gerekirse yeniden parse eder)
+        logger.info("🧠 Using cached analysis (Central Cache)")
+    return cached
+
+
+def _warm_scan(platform, analysis_key, source):
+    """
+    Capture and analyze a changed screen ahead of the user's scan (watch mode).
+    Runs through the same flights as scans, so a scan started meanwhile joins it.
+    Only the screen's cache entry is filled: the last scan and the last analysis
+    stay those of the user's scans (Smart Tap, incremental base).
+
+    Returns:
+        tuple: (source hash, changes dict)
+    """
+    driver, current, changes = _capture_screen(platform, source)
+    source_hash = current["source_hash"]
+    if not cache_mgr.get_analysis(source_hash, analysis_key):
+        _analyze_screen(driver, current["source"], source_hash, analysis_key, current["window"], parallel=False)
+    return source_hash, changes
+
+
+def _sse(event, data):
+    """One Server-Sent Events message"""
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n"
+
+
+def _scan_etag(source_hash, screenshot_id, analysis_key, options):
+    """
+    ETag of a scan response: screen fingerprint + screenshot + analysis and rendition options
+    """
+    return f"{source_hash}-{zlib.crc32(repr((screenshot_id,) + analysis_key + options).encode('utf-8')):08x}"
+
+
+def _not_modified(etag):
+    """
+    Empty 304 response when the client already has this scan (If-None-Match), else None
+    """
+    if not request.if_none_match.contains(etag):
+        return None
+    logger.info("✅ Scan not modified (ETag match)")
+    response = Response(status=304)
+    response.set_etag(etag)
+    return response
+
+
+def _with_etag(response, etag):
+    """
+    Attach the scan ETag; the client revalidates on every scan
+    """
+    response.set_etag(etag)
+    response.headers["Cache-Control"] = "no-cache"
+    return response
+
+
+@scan_bp.route('/scan', methods=['POST'])
+def scan():
+    """
+    Scan current screen and detect elements.
+    Answers 304 (no body) when If-None-Match carries the ETag of the current screen.
+    """
+    try:
+        req = request.json or {}
+        platform = req.get("platform", "ANDROID")
+        verify = req.get("verify", True)
+        prefix = req.get("prefix", "").strip().lower()
+        parallel = req.get("parallel", False)
+        include_full_xpath = req.get("full_xpath", False)
+
+        options = _rendition_options(req)
+
+        driver, current, changes = _capture_screen(platform)
+        # Son taramayı güncelle (Tap işlemi için kritik)
+        cache_mgr.set_last_scan(current)
+        source, source_hash = current["source"], current["source_hash"]
+        screenshot_id, win_size = current["image_id"], current["window"]
+        analysis_key = (platform, prefix, verify, include_full_xpath)
+
+        # Ekran değişmediyse istemcideki sonuç geçerli
+        etag = _scan_etag(source_hash, screenshot_id, analysis_key, options)
+        not_modified = _not_modified(etag)
+        if not_modified:
+            return not_modified
+
+        # 3. Analiz (XML Parse) - aynı ekran daha önce analiz edildiyse cache'ten
+        result = _reuse_analysis(source_hash, analysis_key)
+        if not result:
+            result, snapshot = _analyze_screen(driver, source, source_hash, analysis_key, win_size, parallel)
+            cache_mgr.set_last_analysis(snapshot)
+
         logger.info(f"✅ Scan complete: {len(result['elements'])} elements found")
 
-        return jsonify(create_success_response(data={
-            "image": optimized_image,
+        screenshot_info = _screenshot_info(screenshot_id, win_size, options)
+        return _with_etag(jsonify(create_success_response(data={
+            "image_url": screenshot_info["url"],
+            "screenshot": screenshot_info,
+            "source_hash": source_hash,
+            "changes": changes,
             "elements": result['elements'],
             "page_name": result['page_name'],
             "window_w": win_size['width'],
             "window_h": win_size['height'],
             "raw_source": source
-        }))
+        })), etag)
 
     except (DriverError, ParseError, ValidationError) as e:
         raise
     except Exception as e:
         logger.error(f"Unexpected scan error: {e}", exc_info=True)
-        return jsonify(create_error_response("Unexpected error during scan", str(e))), 500
\ No newline at end of file
+        return jsonify(create_error_response("Unexpected error during scan", str(e))), 500
+
+
+@scan_bp.route('/scan/stream', methods=['POST'])
+def scan_stream():
+    """
+    Scan current screen and stream the result as NDJSON (one JSON record per line):
+    a "screen" record (image URL + window), "element" records as they are final,
+    then a "done" record (page name + raw source) or an "error" record.
+    Answers 304 (no body) when If-None-Match carries the ETag of the current screen.
+    """
+    try:
+        req = request.json or {}
+        platform = req.get("platform", "ANDROID")
+        verify = req.get("verify", True)
+        prefix = req.get("prefix", "").strip().lower()
+        include_full_xpath = req.get("full_xpath", False)
+
+        options = _rendition_options(req)
+
+        driver, current, changes = _capture_screen(platform)
+        cache_mgr.set_last_scan(current)
+        source, source_hash = current["source"], current["source_hash"]
+        screenshot_id, win_size = current["image_id"], current["window"]
+        analysis_key = (platform, prefix, verify, include_full_xpath)
+
+        etag = _scan_etag(source_hash, screenshot_id, analysis_key, options)
+        not_modified = _not_modified(etag)
+        if not_modified:
+            return not_modified
+
+        screenshot_info = _screenshot_info(screenshot_id, win_size, options)
+
+        def generate():
+            yield json.dumps({
+                "type": "screen",
+                "image_url": screenshot_info["url"],
+                "screenshot": screenshot_info,
+                "source_hash": source_hash,
+                "changes": changes,
+                "window_w": win_size['width'],
+                "window_h": win_size['height']
+            }) + "\n"
+
+            # Aynı ekran daha önce analiz edildiyse kayıtlar cache'ten gönderilir
+            cached = _reuse_analysis(source_hash, analysis_key)
+            if cached:
+                for element in cached["elements"]:
+                    yield json.dumps(dict(element, type="element")) + "\n"
+                yield json.dumps({
+                    "type": "done",
+                    "page_name": cached["page_name"],
+                    "count": len(cached["elements"]),
+                    "raw_source": source
+                }) + "\n"
+                return
+
+            # 3. Analiz (iterparse, kayıtlar hazır oldukça gönderilir)
+            analyzer = PageAnalyzer(driver)
+            for record in analyzer.analyze_stream(source, platform, verify, prefix, win_size,
+                                                  include_full_xpath=include_full_xpath,
+                                                  screens=screen_store):
+                if record["type"] == "done":
+                    snapshot = analyzer.snapshot
+                    elements = [res for res in snapshot["results"].values() if res]
+                    _remember_analysis(source, source_hash, analysis_key, analyzer.index,
+                                       elements, record["page_name"])
+                    cache_mgr.set_last_analysis(snapshot)
+                    logger.info(f"✅ Streaming scan complete: {record['count']} elements found")
+                    record["raw_source"] = source
+                yield json.dumps(record) + "\n"
+
+        return _with_etag(Response(stream_with_context(generate()), mimetype='application/x-ndjson'), etag)
+
+    except (DriverError, ParseError, ValidationError) as e:
+        raise
+    except Exception as e:
+        logger.error(f"Unexpected scan error: {e}", exc_info=True)
+        return jsonify(create_error_response("Unexpected error during scan", str(e))), 500
+
+
+@scan_bp.route('/screens/<screenshot_id>.<codec>', methods=['GET'])
+def screenshot(screenshot_id, codec):
+    """
+    Screenshot rendition by content address.
+    Query: level (pyramid level, 0 = full resolution), q (quality profile).
+    The URL never changes its content, so the browser may cache it forever.
+    """
+    try:
+        if codec not in IMAGE_CODECS:
+            raise ValidationError(f"Invalid image format: {codec}", f"Must be one of: {', '.join(IMAGE_CODECS)}")
+        profile = request.args.get("q", IMAGE_DEFAULT_PROFILE)
+        if profile not in IMAGE_QUALITY_PROFILES:
+            raise ValidationError(f"Invalid image quality: {profile}",
+                                  f"Must be one of: {', '.join(IMAGE_QUALITY_PROFILES)}")
+        level = request.args.get("level", 0, type=int)
+
+        image = cache_mgr.get_image(screenshot_id) if SCREENSHOT_ID.fullmatch(screenshot_id) else None
+        if image is None:
+            return jsonify(create_error_response("Screenshot not found", "It may have expired, scan again")), 404
+
+        size = renditions.image_size(image)
+        if size and not 0 <= level < len(renditions.pyramid(*size)):
+            raise ValidationError(f"Invalid level: {level}", "Level is out of the screenshot pyramid")
+
+        key = (level, codec, IMAGE_QUALITY_PROFILES[profile])
+        data = cache_mgr.get_rendition(screenshot_id, key)
+        if data is not None:
+            mimetype = IMAGE_CODECS[codec][1]
+        else:
+            data, mimetype = renditions.encode(image, *key)
+            # Görüntü çözülemediyse ham hali gönderilir (kaydedilmez)
+            if data is not image:
+                cache_mgr.save_rendition(screenshot_id, key, data)
+
+        response = Response(data, mimetype=mimetype)
+        response.set_etag(f"{screenshot_id}-{level}-{codec}-{profile}")
+        response.headers["Cache-Control"] = "public, max-age=31536000, immutable"
+        return response.make_conditional(request)
+
+    except ValidationError:
+        raise
+    except Exception as e:
+        logger.error(f"Screenshot error: {e}", exc_info=True)
+        return jsonify(create_error_response("Failed to serve screenshot", str(e))), 500
+
+
+def _live_frame(raw, level, quality):
+    """JPEG frame of the live view at a pyramid level"""
+    image, _ = renditions.encode(raw, level, "jpg", quality)
+    return image
+
+
+@scan_bp.route('/screen/live', methods=['GET'])
+def live_screen():
+    """
+    Live device screen as MJPEG (multipart/x-mixed-replace, usable as <img src>).
+    Query: platform, level (pyramid level of the frames, default 1 = half resolution).
+    Frames are sent only when the screen changes; the last one is repeated every
+    STREAM_KEEPALIVE seconds. The capture loop stops when the last client disconnects.
+    """
+    try:
+        platform = request.args.get("platform", "ANDROID")
+        level = request.args.get("level", 1, type=int)
+
+        if platform not in VALID_PLATFORMS:
+            raise ValidationError(f"Invalid platform: {platform}", f"Must be one of: {', '.join(VALID_PLATFORMS)}")
+        if level < 0:
+            raise ValidationError(f"Invalid level: {level}", "Level must be 0 or greater")
+        if not driver_mgr.is_active(platform):
+            raise DriverError("Driver not active", f"Please start {platform} driver first")
+
+        stream = driver_mgr.frame_stream(platform, level, _live_frame,
+                                         renditions.frame_signature, renditions.same_image)
+
+        def generate():
+            subscriber = stream.subscribe()
+            try:
+                while True:
+                    frame = subscriber.next_frame(STREAM_KEEPALIVE)
+                    if frame is None:
+                        if stream.closed:
+                            return
+                        continue
+                    yield (b"--frame\r\nContent-Type: image/jpeg\r\nContent-Length: "
+                           + str(len(frame["image"])).encode() + b"\r\n\r\n" + frame["image"] + b"\r\n")
+            finally:
+                # İstemci bağlantıyı kapattı (yazma hatası -> GeneratorExit)
+                subscriber.close()
+
+        response = Response(generate(), mimetype="multipart/x-mixed-replace; boundary=frame")
+        response.headers["Cache-Control"] = "no-cache, no-store"
+        return response
+
+    except (DriverError, ValidationError) as e:
+        raise
+    except Exception as e:
+        logger.error(f"Live screen error: {e}", exc_info=True)
+        return jsonify(create_error_response("Failed to start live screen", str(e))), 500
+
+
+@scan_bp.route('/screen/events', methods=['GET'])
+def screen_events():
+    """
+    Watch mode: screen change events as Server-Sent Events (usable with EventSource).
+    Query: platform, since (source hash the client already shows), and the scan
+    options prefix, verify, full_xpath used to precompute the analysis.
+    Events: "screen_changed" when the page source fingerprint changes, then
+    "analysis_ready" / "analysis_failed" if WATCH_PRECOMPUTE is on (the next scan
+    with the same options is served from the cache). The polling loop stops
+    when the last client disconnects.
+    """
+    try:
+        platform = request.args.get("platform", "ANDROID")
+        prefix = request.args.get("prefix", "").strip().lower()
+        verify = request.args.get("verify", "true").lower() == "true"
+        include_full_xpath = request.args.get("full_xpath", "false").lower() == "true"
+        since = request.args.get("since")
+
+        if platform not in VALID_PLATFORMS:
+            raise ValidationError(f"Invalid platform: {platform}", f"Must be one of: {', '.join(VALID_PLATFORMS)}")
+        if not driver_mgr.is_active(platform):
+            raise DriverError("Driver not active", f"Please start {platform} driver first")
+
+        watcher = driver_mgr.screen_watcher(platform)
+        analysis_key = (platform, prefix, verify, include_full_xpath)
+        precompute = config_mgr.get("WATCH_PRECOMPUTE", True)
+
+        def generate():
+            subscriber = watcher.subscribe()
+            last = since
+            try:
+                # Başlıklar hemen gitsin (EventSource "open"), koparsa 3 sn sonra yeniden bağlanır
+                yield "retry: 3000\n\n"
+                while True:
+                    event = subscriber.next_event(WATCH_KEEPALIVE)
+                    if event is None:
+                        if watcher.closed:
+                            return
+                        # Yorum satırı: bağlantı canlı tutulur, kapanan istemci fark edilir
+                        yield ": keepalive\n\n"
+                        continue
+                    if event["source_hash"] == last:
+                        continue
+                    last = event["source_hash"]
+                    yield _sse("screen_changed", {"source_hash": last, "timestamp": event["timestamp"],
+                                                  "precompute": precompute})
+
+                    if precompute:
+                        try:
+                            source_hash, changes = _warm_scan(platform, analysis_key, event["source"])
+                            yield _sse("analysis_ready", {"source_hash": source_hash, "changes": changes})
+                        except Exception as e:
+                            logger.warning(f"Watch precompute failed: {e}")
+                            yield _sse("analysis_failed", {"source_hash": last, "error": str(e)})
+            finally:
+                # İstemci bağlantıyı kapattı (yazma hatası -> GeneratorExit)
+                subscriber.close()
+
+        response = Response(generate(), mimetype="text/event-stream")
+        response.headers["Cache-Control"] = "no-cache"
+        response.headers["X-Accel-Buffering"] = "no"
+        return response
+
+    except (DriverError, ValidationError) as e:
+        raise
+    except Exception as e:
+        logger.error(f"Screen events error: {e}", exc_info=True)
+        return jsonify(create_error_response("Failed to start watch mode", str(e))), 500
+
+
+@scan_bp.route('/cache/stats', methods=['GET'])
+def cache_stats():
+    """
+    Scan cache counters (hits, misses, evictions, bytes) for tuning the cache budget
+    """
+    try:
+        stats = cache_mgr.stats()
+        stats["locator_memo"] = locator_memo.stats()
+        stats["screens"] = screen_store.stats()
+        stats["flights"] = scan_flights.stats()
+        stats["live_streams"] = driver_mgr.stream_stats()
+        stats["watchers"] = driver_mgr.watcher_stats()
+        return jsonify(create_success_response(data=stats))
+    except Exception as e:
+        logger.error(f"Cache stats error: {e}", exc_info=True)
+        return jsonify(create_error_response("Failed to read cache stats", str(e))), 500
@@ -0,0 +1,56 @@
+"""
+Analysis worker - Process-pool side of parallel page analysis
+
+Loaded only in the pool workers (and by page_analyzer when the first parallel
+analysis starts the pool), never by the server at import time.
+"""
+from multiprocessing import shared_memory
+from typing import Any, Dict, List, Optional, Tuple
+
+from lxml import etree
+
+from backend.api.services.page_analyzer import PageAnalyzer
+
+# Parsed tree + analyzer of the source being sharded (one per worker process)
+_worker_state: Dict[str, Any] = {}
+
+
+def warm_up() -> bool:
+    """No-op task: the pool counts as warm once its workers have run one"""
+    return True
+
+
+def analyze_shard(source_ref: Tuple[str, int, bytes], platform: str, should_verify: bool,
+                  prefix: str, include_full_xpath: bool,
+                  positions: List[int]) -> List[Optional[Dict[str, Any]]]:
+    """
+    Analyze one shard of candidate node positions.
+    The source is read from shared memory and parsed once per worker; the
+    remaining shards of the same source (same digest) reuse the parsed tree.
+
+    Args:
+        source_ref: (shared memory name, size, digest) of the UTF-8 page source
+    """
+    name, size, digest = source_ref
+    if _worker_state.get("digest") != digest:
+        shm = shared_memory.SharedMemory(name=name)
+        try:
+            data = bytes(shm.buf[:size])
+        finally:
+            shm.close()
+        tree = etree.fromstring(data)
+        analyzer = PageAnalyzer(None)
+        analyzer.get_index(tree, platform)
+        _worker_state.clear()
+        _worker_state.update(digest=digest, tree=tree, analyzer=analyzer)
+
+    tree = _worker_state["tree"]
+    analyzer = _worker_state["analyzer"]
+    index = analyzer.get_index(tree, platform)
+
+    return [
+        analyzer.process_single_element(
+            (index.nodes[pos], tree, platform, should_verify, pos, prefix, include_full_xpath)
+        )
+        for pos in positions
+    ]
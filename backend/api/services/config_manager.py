@@ -5,6 +5,11 @@ import logging
 from typing import Dict, Any, Optional
 from dotenv import load_dotenv
 
+from backend.core.constants import (
+    FINGERPRINT_SKIP_IDS, FINGERPRINT_SKIP_TYPES, FINGERPRINT_SKIP_ATTRIBUTES,
+    FINGERPRINT_SYSTEM_PACKAGES, FINGERPRINT_VOLATILE_TEXT, WATCH_INTERVAL, SCREENSHOT_RECHECK_AGE
+)
+
 logger = logging.getLogger(__name__)
 
 
@@ -112,7 +117,20 @@ IOS_SIGN_ID=iPhone Developer
             "IOS_UDID": os.getenv("IOS_UDID", ""),
             "IOS_PLATFORM_VER": os.getenv("IOS_PLATFORM_VER", ConfigConstants.DEFAULT_IOS_PLATFORM),
             "IOS_ORG_ID": os.getenv("IOS_ORG_ID", ""),
-            "IOS_SIGN_ID": os.getenv("IOS_SIGN_ID", ConfigConstants.DEFAULT_IOS_SIGN)
+            "IOS_SIGN_ID": os.getenv("IOS_SIGN_ID", ConfigConstants.DEFAULT_IOS_SIGN),
+            # Scan cache fingerprint (comma separated lists)
+            "FINGERPRINT_SKIP_IDS": os.getenv("FINGERPRINT_SKIP_IDS", ",".join(FINGERPRINT_SKIP_IDS)),
+            "FINGERPRINT_SKIP_TYPES": os.getenv("FINGERPRINT_SKIP_TYPES", ",".join(FINGERPRINT_SKIP_TYPES)),
+            "FINGERPRINT_SKIP_ATTRS": os.getenv("FINGERPRINT_SKIP_ATTRS", ",".join(FINGERPRINT_SKIP_ATTRIBUTES)),
+            "FINGERPRINT_VOLATILE_TEXT": os.getenv("FINGERPRINT_VOLATILE_TEXT", FINGERPRINT_VOLATILE_TEXT),
+            "FINGERPRINT_SYSTEM_PKGS": os.getenv("FINGERPRINT_SYSTEM_PKGS", ",".join(FINGERPRINT_SYSTEM_PACKAGES)),
+            # Re-check a cached screenshot of an unchanged screen after N seconds (0 = never)
+            "SCREENSHOT_RECHECK_AGE": os.getenv("SCREENSHOT_RECHECK_AGE", str(SCREENSHOT_RECHECK_AGE)),
+            # Persistent scan cache directory (empty = disabled, read at startup)
+            "DISK_CACHE_DIR": os.getenv("DISK_CACHE_DIR", ""),
+            # Watch mode: page source poll interval (seconds), analyze changed screens in advance
+            "WATCH_INTERVAL": os.getenv("WATCH_INTERVAL", str(WATCH_INTERVAL)),
+            "WATCH_PRECOMPUTE": str_to_bool(os.getenv("WATCH_PRECOMPUTE", "True"))
         }
 
         return config
@@ -234,6 +252,19 @@ IOS_SIGN_ID=iPhone Developer
             lines.append(f"IOS_PLATFORM_VER={config.get('IOS_PLATFORM_VER', '')}\n")
             lines.append(f"IOS_ORG_ID={config.get('IOS_ORG_ID', '')}\n")
             lines.append(f"IOS_SIGN_ID={config.get('IOS_SIGN_ID', '')}\n")
+            lines.append("\n# SCAN CACHE FINGERPRINT\n")
+            lines.append(f"FINGERPRINT_SKIP_IDS={config.get('FINGERPRINT_SKIP_IDS', '')}\n")
+            lines.append(f"FINGERPRINT_SKIP_TYPES={config.get('FINGERPRINT_SKIP_TYPES', '')}\n")
+            lines.append(f"FINGERPRINT_SKIP_ATTRS={config.get('FINGERPRINT_SKIP_ATTRS', '')}\n")
+            lines.append(f"FINGERPRINT_VOLATILE_TEXT={config.get('FINGERPRINT_VOLATILE_TEXT', '')}\n")
+            lines.append(f"FINGERPRINT_SYSTEM_PKGS={config.get('FINGERPRINT_SYSTEM_PKGS', '')}\n")
+            lines.append("\n# SCREENSHOT CACHE\n")
+            lines.append(f"SCREENSHOT_RECHECK_AGE={config.get('SCREENSHOT_RECHECK_AGE', SCREENSHOT_RECHECK_AGE)}\n")
+            lines.append("\n# PERSISTENT SCAN CACHE\n")
+            lines.append(f"DISK_CACHE_DIR={config.get('DISK_CACHE_DIR', '')}\n")
+            lines.append("\n# WATCH MODE\n")
+            lines.append(f"WATCH_INTERVAL={config.get('WATCH_INTERVAL', WATCH_INTERVAL)}\n")
+            lines.append(f"WATCH_PRECOMPUTE={config.get('WATCH_PRECOMPUTE', True)}\n")
 
             with open(self._env_path, 'w') as f:
                 f.writelines(lines)
@@ -0,0 +1,211 @@
+"""
+Geometry table - Columnar element bounds built once per page source
+"""
+import re
+import logging
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+from lxml import etree
+
+logger = logging.getLogger(__name__)
+
+ANDROID_BOUNDS_RE = re.compile(r'\[(\d+),(\d+)\]\[(\d+),(\d+)\]')
+
+Bounds = Tuple[int, int, int, int]
+
+
+def parse_android_bounds(bounds_str: Optional[str]) -> Optional[Bounds]:
+    """
+    Parse Android bounds string "[x1,y1][x2,y2]" into (x, y, w, h)
+    """
+    if not bounds_str:
+        return None
+
+    match = ANDROID_BOUNDS_RE.search(bounds_str)
+    if not match:
+        return None
+
+    x1, y1, x2, y2 = map(int, match.groups())
+    w = x2 - x1
+    h = y2 - y1
+    if w <= 0 or h <= 0:
+        return None
+    return x1, y1, w, h
+
+
+def parse_ios_bounds(elem: etree.Element) -> Optional[Bounds]:
+    """
+    Parse iOS x/y/width/height attributes into (x, y, w, h)
+    """
+    try:
+        x = int(elem.attrib.get('x', 0))
+        y = int(elem.attrib.get('y', 0))
+        w = int(elem.attrib.get('width', 0))
+        h = int(elem.attrib.get('height', 0))
+    except (ValueError, TypeError) as e:
+        logger.debug(f"Failed to parse iOS bounds: {e}")
+        return None
+
+    if w <= 0 or h <= 0:
+        return None
+    return x, y, w, h
+
+
+def bounds_to_dict(bounds: Optional[Bounds]) -> Optional[Dict[str, int]]:
+    """Convert (x, y, w, h) into the analyzer's coords dict"""
+    if bounds is None:
+        return None
+    x, y, w, h = bounds
+    return {"x": x, "y": y, "w": w, "h": h, "area": w * h}
+
+
+class GeometryTable:
+    """
+    NumPy-backed bounds table, one row per node in document order.
+    Columns: x, y, w, h, area, depth, order, class_id (+ valid mask).
+    Rows without parseable bounds have w = h = 0 and valid = False.
+    """
+
+    def __init__(self, rows: List[Optional[Bounds]], depths: List[int],
+                 class_names: List[str]):
+        n = len(rows)
+        data = np.zeros((n, 4), dtype=np.int64)
+        valid = np.zeros(n, dtype=bool)
+        for i, bounds in enumerate(rows):
+            if bounds is not None:
+                data[i] = bounds
+                valid[i] = True
+
+        self.x = data[:, 0]
+        self.y = data[:, 1]
+        self.w = data[:, 2]
+        self.h = data[:, 3]
+        self.area = self.w * self.h
+        self.valid = valid
+        self.depth = np.asarray(depths, dtype=np.int32)
+        self.order = np.arange(n, dtype=np.int64)
+
+        # Class name interning
+        self.class_names: List[str] = []
+        lookup: Dict[str, int] = {}
+        class_ids = np.empty(n, dtype=np.int32)
+        for i, name in enumerate(class_names):
+            cid = lookup.get(name)
+            if cid is None:
+                cid = lookup[name] = len(self.class_names)
+                self.class_names.append(name)
+            class_ids[i] = cid
+        self.class_id = class_ids
+
+        # Spatial grid for point queries (built on first hit-test)
+        self._grid: Optional[SpatialGrid] = None
+
+    @classmethod
+    def from_nodes(cls, nodes: List[etree.Element], depths: List[int],
+                   platform: str) -> "GeometryTable":
+        """Parse bounds of every node exactly once"""
+        if platform == "ANDROID":
+            rows = [parse_android_bounds(elem.attrib.get("bounds")) for elem in nodes]
+            class_names = [elem.attrib.get("class", "") for elem in nodes]
+        else:
+            rows = [parse_ios_bounds(elem) for elem in nodes]
+            class_names = [elem.attrib.get("type", "") for elem in nodes]
+        return cls(rows, depths, class_names)
+
+    def __len__(self) -> int:
+        return len(self.valid)
+
+    def bounds(self, pos: int) -> Optional[Dict[str, int]]:
+        """Coords dict for a node position (None if bounds are missing)"""
+        if not self.valid[pos]:
+            return None
+        return {
+            "x": int(self.x[pos]),
+            "y": int(self.y[pos]),
+            "w": int(self.w[pos]),
+            "h": int(self.h[pos]),
+            "area": int(self.area[pos])
+        }
+
+    def candidate_mask(self, max_area: float, min_width: int, min_height: int) -> np.ndarray:
+        """Nodes with bounds, not fullscreen and above the minimum size"""
+        return (self.valid &
+                (self.area <= max_area) &
+                (self.w >= min_width) &
+                (self.h >= min_height))
+
+    def header_mask(self, header_limit: float) -> np.ndarray:
+        """Nodes with bounds whose top edge lies in the header region"""
+        return self.valid & (self.y <= header_limit)
+
+    def stack_at(self, x: int, y: int) -> np.ndarray:
+        """
+        Positions of all nodes under the point, topmost (last in document order) first
+        """
+        if self._grid is None:
+            self._grid = SpatialGrid(self)
+        return self._grid.query(x, y)
+
+
+class SpatialGrid:
+    """
+    Uniform grid over the geometry table for point hit-testing.
+    Every cell keeps the document-ordered positions of the nodes overlapping it,
+    so a point query only tests the handful of nodes in one cell.
+    """
+
+    CELLS_PER_AXIS = 32
+
+    def __init__(self, table: GeometryTable):
+        self.table = table
+        valid = np.flatnonzero(table.valid)
+
+        if len(valid) == 0:
+            self.x0 = self.y0 = 0
+            self.cell_w = self.cell_h = 1
+            self.cols = self.rows = 0
+            self.cells: List[np.ndarray] = []
+            return
+
+        x1 = table.x[valid]
+        y1 = table.y[valid]
+        x2 = x1 + table.w[valid]
+        y2 = y1 + table.h[valid]
+
+        self.x0 = int(x1.min())
+        self.y0 = int(y1.min())
+        self.cell_w = max(1, -(-(int(x2.max()) - self.x0 + 1) // self.CELLS_PER_AXIS))
+        self.cell_h = max(1, -(-(int(y2.max()) - self.y0 + 1) // self.CELLS_PER_AXIS))
+
+        c0 = (x1 - self.x0) // self.cell_w
+        c1 = (x2 - self.x0) // self.cell_w
+        r0 = (y1 - self.y0) // self.cell_h
+        r1 = (y2 - self.y0) // self.cell_h
+        self.cols = int(c1.max()) + 1
+        self.rows = int(r1.max()) + 1
+
+        # Positions are visited in document order, so every cell stays sorted
+        buckets: List[List[int]] = [[] for _ in range(self.cols * self.rows)]
+        for pos, ca, cb, ra, rb in zip(valid.tolist(), c0.tolist(), c1.tolist(),
+                                       r0.tolist(), r1.tolist()):
+            for row in range(ra, rb + 1):
+                base = row * self.cols
+                for col in range(ca, cb + 1):
+                    buckets[base + col].append(pos)
+
+        self.cells = [np.asarray(b, dtype=np.int64) for b in buckets]
+        logger.debug(f"SpatialGrid built: {self.cols}x{self.rows} cells, {len(valid)} nodes")
+
+    def query(self, x: int, y: int) -> np.ndarray:
+        """Node positions containing (x, y), topmost first"""
+        col = int((x - self.x0) // self.cell_w)
+        row = int((y - self.y0) // self.cell_h)
+        if col < 0 or row < 0 or col >= self.cols or row >= self.rows:
+            return np.empty(0, dtype=np.int64)
+
+        cand = self.cells[row * self.cols + col]
+        t = self.table
+        hit = ((t.x[cand] <= x) & (x <= t.x[cand] + t.w[cand]) &
+               (t.y[cand] <= y) & (y <= t.y[cand] + t.h[cand]))
+        return cand[hit][::-1]
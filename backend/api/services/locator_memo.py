@@ -0,0 +1,105 @@
+"""
+Locator memo - Process-wide LRU of locator results across scans
+"""
+import hashlib
+import logging
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from backend.core.constants import LOCATOR_MEMO_SIZE
+
+logger = logging.getLogger(__name__)
+
+# Uniqueness check made while generating a locator: (xpath, lookup, query, result)
+Fact = Tuple[str, Optional[Callable], Optional[Tuple[str, Dict[str, str]]], bool]
+
+
+class LocatorMemo:
+    """
+    Bounded LRU of get_best_locator results keyed by node signature.
+    The signature covers everything the strategies read besides uniqueness
+    (attributes, ancestor path, parent id, previous sibling label); the
+    uniqueness checks made while generating are stored with the result and
+    replayed on the new tree before it is reused.
+    Toolbars, bottom navigation and buttons shared by many screens are
+    computed once per session.
+    """
+
+    def __init__(self, max_size: int = LOCATOR_MEMO_SIZE):
+        self.max_size = max_size
+        # signature -> (locator result, variable suffix, facts)
+        self._entries: "OrderedDict[bytes, Tuple[Dict[str, str], str, List[Fact]]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.stale = 0
+
+    @staticmethod
+    def signature(*parts: Any) -> bytes:
+        """Digest of the signature parts"""
+        h = hashlib.blake2b(digest_size=16)
+        for part in parts:
+            h.update(str(part).encode('utf-8'))
+            h.update(b"\x00")
+        return h.digest()
+
+    def get(self, key: bytes, holds: Callable[[List[Fact]], bool]
+            ) -> Optional[Tuple[Dict[str, str], str]]:
+        """
+        Memoized (locator result, variable suffix) whose uniqueness facts still hold
+
+        Args:
+            key: Node signature
+            holds: Replays facts on the current tree, True if all results are unchanged
+
+        Returns:
+            tuple or None: (locator result, variable suffix)
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+
+        if entry is None:
+            with self._lock:
+                self.misses += 1
+            return None
+
+        res, suffix, facts = entry
+        if not holds(facts):
+            with self._lock:
+                self.stale += 1
+            return None
+
+        with self._lock:
+            self.hits += 1
+        return dict(res), suffix
+
+    def put(self, key: bytes, res: Dict[str, str], suffix: str, facts: List[Fact]):
+        """Remember a locator result with the uniqueness facts it was derived from"""
+        with self._lock:
+            self._entries[key] = (dict(res), suffix, facts)
+            self._entries.move_to_end(key)
+            if len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def stats(self) -> Dict[str, int]:
+        """Memo statistics"""
+        with self._lock:
+            return {
+                "size": len(self._entries),
+                "max_size": self.max_size,
+                "hits": self.hits,
+                "misses": self.misses,
+                "stale": self.stale
+            }
+
+    def clear(self):
+        """Drop all memoized results"""
+        with self._lock:
+            self._entries.clear()
+
+
+# Shared by all analyzers in this process
+locator_memo = LocatorMemo()
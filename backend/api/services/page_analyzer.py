@@ -1,16 +1,67 @@
 import re
 import io
-import base64
+import os
+import hashlib
 import logging
-from typing import Dict, List, Optional, Tuple, Any
+import threading
+import multiprocessing
+from multiprocessing import shared_memory
+from typing import Callable, Dict, Iterator, List, Optional, Tuple, Any
 from PIL import Image
 from lxml import etree
 from appium.webdriver.common.appiumby import AppiumBy
 import concurrent.futures
-from backend.core.context import driver_mgr
+import numpy as np
+from backend.api.services.tree_index import TreeIndex
+from backend.api.services.xpath_cache import compiled_xpaths
+from backend.api.services.locator_memo import Fact, locator_memo
+from backend.api.services.screen_store import ScreenStore
+from backend.api.services.geometry import (
+    bounds_to_dict, parse_android_bounds, parse_ios_bounds
+)
 
 logger = logging.getLogger(__name__)
 
+# Shared process pool for parallel analysis (see _warm_process_pool)
+_process_pool: Optional[concurrent.futures.ProcessPoolExecutor] = None
+_process_pool_warm_up: List[concurrent.futures.Future] = []
+_process_pool_lock = threading.Lock()
+
+
+def _warm_process_pool(workers: int) -> Optional[concurrent.futures.ProcessPoolExecutor]:
+    """
+    The analysis process pool once its workers are up, None while they are starting.
+    The first call starts the pool in the background: spawning the workers and
+    importing the analyzer in them takes seconds, so the scan that triggered it
+    (and any scan until the pool is warm) stays single-process.
+    Workers are spawned, not forked: a fork of the running server would inherit
+    locks held by its cache sweeper, screen watcher and live view threads.
+    """
+    global _process_pool
+    with _process_pool_lock:
+        if _process_pool is None:
+            # Worker modülü ilk paralel analizde yüklenir (page_analyzer'ı import eder)
+            from backend.api.services import analysis_worker
+            _process_pool = concurrent.futures.ProcessPoolExecutor(
+                max_workers=workers, mp_context=multiprocessing.get_context("spawn")
+            )
+            _process_pool_warm_up[:] = [_process_pool.submit(analysis_worker.warm_up) for _ in range(workers)]
+            logger.info(f"Analysis process pool starting ({workers} workers, spawn)")
+            return None
+        if not all(future.done() for future in _process_pool_warm_up):
+            return None
+        return _process_pool
+
+
+def shutdown_process_pool():
+    """Stop the analysis process pool (the next parallel scan starts a fresh one)"""
+    global _process_pool
+    with _process_pool_lock:
+        if _process_pool is not None:
+            _process_pool.shutdown(wait=False, cancel_futures=True)
+            _process_pool = None
+            _process_pool_warm_up.clear()
+
 
 class AnalyzerConstants:
     """Page analyzer constants"""
@@ -40,6 +91,18 @@ class AnalyzerConstants:
     MAX_XPATH_DEPTH = 4
     MAX_RELATIVE_SEARCH = 15
 
+    # Incremental re-analysis
+    REUSABLE_STRATEGIES = ["ID", "ACC_ID"]  # Independent of the rest of the tree
+    UNIQUENESS_STRATEGIES = ["TEXT_XP", "ROBUST_XP"]  # Reusable while their uniqueness facts hold
+    MAX_CHANGED_VALUES = 500  # Above this, uniqueness-based results are recomputed
+
+    # Parallel analysis (opt-in)
+    # Crossover: each worker parses + indexes the whole source (~17 µs/node) and pickles its
+    # results back, a candidate costs ~100 µs; smaller screens stay single-process
+    PARALLEL_MIN_CANDIDATES = 1000
+    PARALLEL_MAX_WORKERS = 4
+    PARALLEL_SHARDS_PER_WORKER = 2
+
     # Ignore patterns
     IGNORE_CLASSES = [
         "android.widget.FrameLayout", "android.widget.LinearLayout",
@@ -62,24 +125,53 @@ class PageAnalyzer:
     Supports Android and iOS platforms with intelligent element detection.
     """
 
-    def __init__(self, driver):
+    def __init__(self, driver, index: Optional[TreeIndex] = None):
         self.driver = driver
-        self._xpath_cache: Dict[str, bool] = {}
+        # (expression, params) -> uniqueness on the current tree
+        self._xpath_cache: Dict[Tuple, bool] = {}
+        self._index: Optional[TreeIndex] = index
+        self._snapshot: Optional[Dict[str, Any]] = None
+        # Uniqueness checks of the locator being generated (recorded for the locator memo)
+        self._facts: Optional[List[Fact]] = None
         logger.debug("PageAnalyzer initialized")
 
-    def optimize_image(self, base64_str: str, quality: int = AnalyzerConstants.IMAGE_QUALITY) -> str:
+    @property
+    def index(self) -> Optional[TreeIndex]:
+        """Lookup index of the last analyzed tree"""
+        return self._index
+
+    @property
+    def snapshot(self) -> Optional[Dict[str, Any]]:
+        """State of the last analyze() call, pass it back as `previous` for incremental scans"""
+        return self._snapshot
+
+    def get_index(self, tree: etree.Element, platform: str) -> TreeIndex:
+        """
+        Return lookup index for tree, building it once per parsed source
+
+        Args:
+            tree: XML tree
+            platform: Platform name
+
+        Returns:
+            TreeIndex: Index bound to this tree
+        """
+        if self._index is None or self._index.root is not tree or self._index.platform != platform:
+            self._index = TreeIndex(tree, platform)
+        return self._index
+
+    def optimize_image(self, image_data: bytes, quality: int = AnalyzerConstants.IMAGE_QUALITY) -> bytes:
         """
         Optimize image by converting to JPEG and reducing quality
 
         Args:
-            base64_str: Base64 encoded image
+            image_data: Encoded screenshot (PNG bytes from the driver)
             quality: JPEG quality (1-100)
 
         Returns:
-            str: Optimized base64 image
+            bytes: Optimized JPEG (the input unchanged if it cannot be decoded)
         """
         try:
-            image_data = base64.b64decode(base64_str)
             image = Image.open(io.BytesIO(image_data))
 
             # Convert to RGB if needed
@@ -93,9 +185,9 @@ class PageAnalyzer:
                        quality=quality,
                        optimize=True)
 
-            optimized = base64.b64encode(buffer.getvalue()).decode('utf-8')
+            optimized = buffer.getvalue()
 
-            original_size = len(base64_str)
+            original_size = len(image_data)
             optimized_size = len(optimized)
             reduction = ((original_size - optimized_size) / original_size) * 100
 
@@ -104,7 +196,7 @@ class PageAnalyzer:
 
         except Exception as e:
             logger.warning(f"Image optimization failed: {e}")
-            return base64_str
+            return image_data
 
     def clean_text_for_var(self, text: Optional[str]) -> str:
         """
@@ -170,7 +262,7 @@ class PageAnalyzer:
         if "'" not in val:
             return f"'{val}'"
         if '"' not in val:
-            return f'"{val}'
+            return f'"{val}"'
 
         # Her iki quote var, concat kullan
         parts = val.split("'")
@@ -186,30 +278,7 @@ class PageAnalyzer:
         Returns:
             dict or None: {"x", "y", "w", "h", "area"}
         """
-        if not bounds_str:
-            return None
-
-        try:
-            match = re.search(r'\[(\d+),(\d+)\]\[(\d+),(\d+)\]', bounds_str)
-            if match:
-                x1, y1, x2, y2 = map(int, match.groups())
-                w = x2 - x1
-                h = y2 - y1
-
-                if w <= 0 or h <= 0:
-                    return None
-
-                return {
-                    "x": x1,
-                    "y": y1,
-                    "w": w,
-                    "h": h,
-                    "area": w * h
-                }
-        except Exception as e:
-            logger.debug(f"Failed to parse Android bounds '{bounds_str}': {e}")
-
-        return None
+        return bounds_to_dict(parse_android_bounds(bounds_str))
 
     def parse_bounds_ios(self, elem: etree.Element) -> Optional[Dict[str, int]]:
         """
@@ -221,90 +290,89 @@ class PageAnalyzer:
         Returns:
             dict or None: {"x", "y", "w", "h", "area"}
         """
-        try:
-            x = int(elem.attrib.get('x', 0))
-            y = int(elem.attrib.get('y', 0))
-            w = int(elem.attrib.get('width', 0))
-            h = int(elem.attrib.get('height', 0))
-
-            if w <= 0 or h <= 0:
-                return None
-
-            return {
-                "x": x,
-                "y": y,
-                "w": w,
-                "h": h,
-                "area": w * h
-            }
-        except (ValueError, TypeError) as e:
-            logger.debug(f"Failed to parse iOS bounds: {e}")
-            return None
+        return bounds_to_dict(parse_ios_bounds(elem))
 
-    def _is_unique_in_tree(self, tree: etree.Element, xpath: str) -> bool:
+    def _is_unique_in_tree(self, tree: etree.Element, xpath: str,
+                           lookup: Optional[Callable[[TreeIndex], int]] = None,
+                           query: Optional[Tuple[str, Dict[str, str]]] = None) -> bool:
         """
         Check if XPath returns exactly one element
 
         Args:
             tree: XML tree
-            xpath: XPath expression
+            xpath: XPath expression (literal form, as used in the locator)
+            lookup: Optional index query equivalent to the XPath (skips evaluation)
+            query: Optional (expression with $variables, values) equivalent to the XPath,
+                   evaluated through the shared compiled XPath cache
 
         Returns:
             bool: True if unique
         """
-        # Check cache first
-        if xpath in self._xpath_cache:
-            return self._xpath_cache[xpath]
+        is_unique = self._check_unique(tree, xpath, lookup, query)
+        if self._facts is not None:
+            self._facts.append((xpath, lookup, query, is_unique))
+        return is_unique
+
+    def _check_unique(self, tree: etree.Element, xpath: str,
+                      lookup: Optional[Callable[[TreeIndex], int]],
+                      query: Optional[Tuple[str, Dict[str, str]]]) -> bool:
+        """Uniqueness check behind _is_unique_in_tree (index lookup, memo or compiled XPath)"""
+        indexed = self._index is not None and self._index.root is tree
+
+        # Answer from index when the shape is supported
+        if lookup is not None and indexed:
+            return lookup(self._index) == 1
+
+        expression, params = query if query is not None else (xpath, {})
+        key = (expression, tuple(sorted(params.items())))
+
+        # Check cache first (kept on the index, so it lives as long as the cached screen)
+        memo = self._index.xpath_results if indexed else self._xpath_cache
+        if key in memo:
+            return memo[key]
 
         try:
-            elements = tree.xpath(xpath)
-            is_unique = len(elements) == 1
+            is_unique = compiled_xpaths.count(tree, expression, **params) == 1
 
             # Cache result
-            if len(self._xpath_cache) < 1000:  # Limit cache size
-                self._xpath_cache[xpath] = is_unique
+            if len(memo) < 1000:  # Limit cache size
+                memo[key] = is_unique
 
             return is_unique
         except Exception as e:
             logger.debug(f"XPath evaluation failed: {e}")
             return False
 
-    def _build_hierarchical_xpath(self, elem: etree.Element, tree: etree.Element) -> str:
+    def _build_hierarchical_xpath(self, elem: etree.Element, tree: etree.Element,
+                                  platform: str) -> str:
         """
         Build hierarchical XPath from root
 
         Args:
             elem: Target element
             tree: XML tree
+            platform: Platform name
 
         Returns:
             str: Hierarchical XPath
         """
-        path_parts = []
-        current = elem
-        depth = 0
-
-        while current is not None and depth < AnalyzerConstants.MAX_XPATH_DEPTH:
-            parent = current.getparent()
-            if parent is None:
-                break
-
-            siblings = [s for s in parent if s.tag == current.tag]
-
-            if len(siblings) > 1:
-                try:
-                    index = siblings.index(current) + 1
-                    path_parts.insert(0, f"{current.tag}[{index}]")
-                except ValueError:
-                    path_parts.insert(0, current.tag)
-            else:
-                path_parts.insert(0, current.tag)
-
-            current = parent
-            depth += 1
+        index = self.get_index(tree, platform)
+        pos = index.position(elem)
+        if pos is None:
+            return f"//{elem.tag}"
 
+        path_parts = self._path_steps(index, pos)
         return "//" + "/".join(path_parts) if path_parts else f"//{elem.tag}"
 
+    def _path_steps(self, index: TreeIndex, pos: int) -> List[str]:
+        """Steps of the hierarchical XPath: up to MAX_XPATH_DEPTH innermost ancestors"""
+        # Sibling ordinals are precomputed in the index
+        path_parts = []
+        while len(path_parts) < AnalyzerConstants.MAX_XPATH_DEPTH and index.parents[pos] >= 0:
+            path_parts.insert(0, index.path_step(pos))
+            pos = index.parents[pos]
+        return path_parts
+
         # ==========================================
         # SMART TAP EKLENTİSİ (Mevcut kodların EN ALTINA ekleyin)
         # ==========================================
@@ -312,50 +380,74 @@ class PageAnalyzer:
         """
         Verilen koordinatlarda (x, y) en üstteki tıklanabilir elementi bulur.
         """
-        all_elements = tree.xpath('//*')
+        index = self.get_index(tree, platform)
 
-        # Tersten döngü: XML'de son gelen element UI'da en üsttedir (Z-index)
-        for elem in reversed(all_elements):
-            bounds = None
-            try:
-                if platform == "ANDROID":
-                    bounds = self.parse_bounds_android(elem.attrib.get("bounds"))
-                else:
-                    bounds = self.parse_bounds_ios(elem)
-            except Exception:
-                continue
+        # Stack is already topmost first (XML'de son gelen element UI'da en üsttedir)
+        for pos in index.geometry.stack_at(x, y):
+            elem = index.nodes[pos]
+            if self._is_tap_target(elem, platform):
+                return elem
 
-            if not bounds:
-                continue
+        return None
 
-            # Koordinat bu elementin sınırları içinde mi?
-            if (bounds['x'] <= x <= bounds['x'] + bounds['w']) and \
-                    (bounds['y'] <= y <= bounds['y'] + bounds['h']):
+    def hit_test(self, tree: etree.Element, x: int, y: int, platform: str) -> List[Dict[str, Any]]:
+        """
+        Return the full z-order stack of elements under (x, y), topmost first
 
-                # Gereksiz Container'ları (FrameLayout vb.) elemek için kontrol
-                class_name = elem.attrib.get("class") if platform == "ANDROID" else elem.attrib.get("type")
+        Args:
+            tree: XML tree
+            x: X coordinate (device space)
+            y: Y coordinate (device space)
+            platform: Platform name
 
-                # Ignore listesi kontrolü
-                is_ignored_class = False
-                if hasattr(AnalyzerConstants, 'IGNORE_CLASSES'):
-                    is_ignored_class = any(
-                        ignored in str(class_name) for ignored in AnalyzerConstants.IGNORE_CLASSES)
+        Returns:
+            list: [{"node", "class_name", "text", "res_id", "coords", "depth", "tap_target"}]
+        """
+        index = self.get_index(tree, platform)
+        geo = index.geometry
+        stack = []
 
-                # Elementin metni veya ayırt edici özelliği var mı?
-                has_text = False
-                if platform == "ANDROID":
-                    has_text = bool(elem.attrib.get("text") or elem.attrib.get("content-desc") or elem.attrib.get(
-                        "resource-id"))
-                else:
-                    has_text = bool(elem.attrib.get("label") or elem.attrib.get("name") or elem.attrib.get("value"))
+        for pos in index.geometry.stack_at(x, y):
+            pos = int(pos)
+            elem = index.nodes[pos]
+            att = elem.attrib
+            if platform == "ANDROID":
+                text = att.get("text") or att.get("content-desc") or ""
+                res_id = att.get("resource-id", "")
+            else:
+                text = att.get("label") or att.get("value") or att.get("name") or ""
+                res_id = ""
 
-                # Eğer ignore listesindeyse ve belirleyici bir özelliği yoksa (boş kutuysa) atla
-                if is_ignored_class and not has_text:
-                    continue
+            stack.append({
+                "node": pos,
+                "class_name": geo.class_names[geo.class_id[pos]],
+                "text": text,
+                "res_id": res_id,
+                "coords": geo.bounds(pos),
+                "depth": int(geo.depth[pos]),
+                "tap_target": self._is_tap_target(elem, platform)
+            })
 
-                return elem
+        return stack
 
-        return None
+    def _is_tap_target(self, elem: etree.Element, platform: str) -> bool:
+        """
+        Smart Tap filter: skip empty containers (FrameLayout vb.) under the finger
+        """
+        class_name = elem.attrib.get("class") if platform == "ANDROID" else elem.attrib.get("type")
+
+        # Ignore listesi kontrolü
+        is_ignored_class = any(ignored in str(class_name) for ignored in AnalyzerConstants.IGNORE_CLASSES)
+
+        # Elementin metni veya ayırt edici özelliği var mı?
+        if platform == "ANDROID":
+            has_text = bool(elem.attrib.get("text") or elem.attrib.get("content-desc") or elem.attrib.get(
+                "resource-id"))
+        else:
+            has_text = bool(elem.attrib.get("label") or elem.attrib.get("name") or elem.attrib.get("value"))
+
+        # Eğer ignore listesindeyse ve belirleyici bir özelliği yoksa (boş kutuysa) atla
+        return not (is_ignored_class and not has_text)
 
     def generate_relative_locator(self, elem: etree.Element, tree: etree.Element,
                                   platform: str) -> Optional[Dict[str, str]]:
@@ -378,32 +470,17 @@ class PageAnalyzer:
             if not is_input:
                 return None
 
-            # Find all nodes
-            all_nodes = tree.xpath('//*')
-
-            try:
-                my_index = all_nodes.index(elem)
-            except ValueError:
+            # Document position of the input
+            index = self.get_index(tree, platform)
+            my_index = index.position(elem)
+            if my_index is None:
                 return None
 
-            # Search previous elements for label
+            # Nearest preceding label, within the search window
             found_text = None
-            search_range = range(my_index - 1, max(-1, my_index - AnalyzerConstants.MAX_RELATIVE_SEARCH), -1)
-
-            for i in search_range:
-                node = all_nodes[i]
-
-                if platform == "ANDROID":
-                    txt = node.get("text") or node.get("content-desc")
-                else:
-                    txt = node.get("label") or node.get("value") or node.get("name")
-
-                # Validate text
-                if not txt or len(txt) > AnalyzerConstants.MAX_TEXT_LENGTH or txt.isdigit():
-                    continue
-
-                found_text = txt
-                break
+            label = index.nearest_preceding_label(my_index, AnalyzerConstants.MAX_TEXT_LENGTH)
+            if label and label[0] > my_index - AnalyzerConstants.MAX_RELATIVE_SEARCH:
+                found_text = label[1]
 
             if found_text:
                 safe_txt = self.safe_xpath_val(found_text)
@@ -424,6 +501,116 @@ class PageAnalyzer:
 
         return None
 
+    def generate_row_locator(self, elem: etree.Element, tree: etree.Element,
+                             platform: str, info: Dict[str, Any]) -> Optional[Dict[str, str]]:
+        """
+        Locator for an element inside a repeated list row (representative row included),
+        used where text and relative locators found nothing, instead of a robust XPath.
+        The row template is analyzed once per row group (see _row_template); each row
+        only substitutes its anchor: a unique label of the row, else the row index in
+        its container. Only index lookups are used (no XPath evaluation).
+        The variable name is "<anchor>_<element>", so rows never share a name.
+
+        Args:
+            elem: Target element
+            tree: XML tree
+            platform: Platform name
+            info: Element info dict
+
+        Returns:
+            dict or None: {"locator", "var_suffix", "strategy"}
+        """
+        index = self.get_index(tree, platform)
+        pos = index.position(elem)
+        if pos is None:
+            return None
+
+        row = index.repeated_rows.get(pos)
+        if row is None:
+            return None
+
+        template = self._row_template(index, index.row_representatives[row])
+        anchor, anchor_name = self._row_anchor(index, row, template)
+        res_id = info["res_id"]
+        leaf = info["text"] or info["content_desc"] or (res_id.split('/')[-1] if res_id else "")
+        return {
+            "locator": f"xpath={anchor}{template['paths'][pos - row]}",
+            "var_suffix": anchor_name if not leaf or leaf == anchor_name else f"{anchor_name} {leaf}",
+            "strategy": "ROW_XP"
+        }
+
+    def _row_template(self, index: TreeIndex, representative: int) -> Dict[str, Any]:
+        """
+        Analysis shared by all rows of a group, done on its representative row:
+        path from the row to each of its nodes, anchor candidates (nodes whose
+        nearest row-tag ancestor is the row) and the container locator.
+
+        Returns:
+            dict: {"tag", "anchor_attr", "paths", "anchors", "container"}
+        """
+        template = index.row_templates.get(representative)
+        if template is not None:
+            return template
+
+        row_tag = index.nodes[representative].tag
+        size = index.subtree_sizes[representative]
+
+        # Same-tag indexes only where ambiguous; identical for every row of the group
+        paths = [""] * size
+        anchors = []
+        for offset in range(1, size):
+            pos = representative + offset
+            parent = index.parents[pos]
+            paths[offset] = f"{paths[parent - representative]}/{index.path_step(pos)}"
+
+            ancestor = parent
+            while ancestor != representative and index.nodes[ancestor].tag != row_tag:
+                ancestor = index.parents[ancestor]
+            if ancestor == representative:
+                anchors.append(offset)
+
+        # Indexed rows need a container locator: unique resource-id, else robust XPath
+        container = index.nodes[index.parents[representative]]
+        container_id = container.get("resource-id")
+        if container_id and index.count_attr("resource-id", container_id) == 1:
+            container_xpath = f"//*[@resource-id={self.safe_xpath_val(container_id)}]"
+        else:
+            container_xpath = self.generate_robust_xpath(container, index.root, index.platform,
+                                                         self._element_info(container, index.platform))
+
+        template = {
+            "tag": row_tag,
+            "anchor_attr": "text" if index.platform == "ANDROID" else "label",
+            "paths": paths,
+            "anchors": anchors,
+            "container": container_xpath
+        }
+        index.row_templates[representative] = template
+        return template
+
+    def _row_anchor(self, index: TreeIndex, row: int, template: Dict[str, Any]) -> Tuple[str, str]:
+        """
+        XPath of a row: its first unique label among the template's anchor candidates,
+        else its index in the container
+
+        Returns:
+            tuple: (row XPath, anchor name for variables: the label, else "row <index>")
+        """
+        cached = index.row_anchors.get(row)
+        if cached is not None:
+            return cached
+
+        anchor = (f"{template['container']}/{index.path_step(row)}", f"row {index.ordinals[row]}")
+        attr = template["anchor_attr"]
+        for offset in template["anchors"]:
+            value = index.nodes[row + offset].get(attr)
+            if value and len(value) < AnalyzerConstants.MAX_TEXT_LENGTH and index.count_attr(attr, value) == 1:
+                anchor = (f"//*[@{attr}={self.safe_xpath_val(value)}]/ancestor::{template['tag']}[1]", value)
+                break
+
+        index.row_anchors[row] = anchor
+        return anchor
+
     def generate_robust_xpath(self, elem: etree.Element, tree: etree.Element,
                               platform: str, attribs: Dict[str, str]) -> str:
         """
@@ -444,42 +631,71 @@ class PageAnalyzer:
         text = attribs.get("text")
 
         # Level 1: Perfect match with unique attribute
-        if res_id and self._is_unique_in_tree(tree, f"//*[@resource-id='{res_id}']"):
-            return f"//*[@resource-id='{res_id}']"
+        if res_id:
+            xpath = f"//*[@resource-id={self.safe_xpath_val(res_id)}]"
+            if self._is_unique_in_tree(tree, xpath, lambda idx: idx.count_attr("resource-id", res_id),
+                                       ("//*[@resource-id=$rid]", {"rid": res_id})):
+                return xpath
 
-        if content_desc and self._is_unique_in_tree(tree, f"//*[@content-desc='{content_desc}']"):
-            return f"//*[@content-desc='{content_desc}']"
+        if content_desc:
+            xpath = f"//*[@content-desc={self.safe_xpath_val(content_desc)}]"
+            if self._is_unique_in_tree(tree, xpath, lambda idx: idx.count_attr("content-desc", content_desc),
+                                       ("//*[@content-desc=$desc]", {"desc": content_desc})):
+                return xpath
 
         if text and len(text) < AnalyzerConstants.MAX_TEXT_LENGTH:
-            if self._is_unique_in_tree(tree, f"//*[@text='{text}']"):
-                return f"//*[@text='{text}']"
+            xpath = f"//*[@text={self.safe_xpath_val(text)}]"
+            if self._is_unique_in_tree(tree, xpath, lambda idx: idx.count_attr("text", text),
+                                       ("//*[@text=$text]", {"text": text})):
+                return xpath
 
         # Level 2: Parent context
         parent = elem.getparent()
         if parent is not None:
             parent_id = parent.get("resource-id")
             if parent_id:
-                xpath = f"//*[@resource-id='{parent_id}']//{cls}"
+                xpath = f"//*[@resource-id={self.safe_xpath_val(parent_id)}]//{cls}"
+                expression = f"//*[@resource-id=$rid]//{cls}"
+                params = {"rid": parent_id}
+                scope_attr, scope_val = None, None
                 if text:
-                    xpath += f"[@text='{text}']"
+                    xpath += f"[@text={self.safe_xpath_val(text)}]"
+                    expression += "[@text=$text]"
+                    scope_attr, scope_val = "text", text
+                    params["text"] = text
                 elif content_desc:
-                    xpath += f"[@content-desc='{content_desc}']"
-
-                if self._is_unique_in_tree(tree, xpath):
+                    xpath += f"[@content-desc={self.safe_xpath_val(content_desc)}]"
+                    expression += "[@content-desc=$desc]"
+                    scope_attr, scope_val = "content-desc", content_desc
+                    params["desc"] = content_desc
+
+                lookup = None
+                if cls:
+                    lookup = lambda idx: idx.count_scoped(parent_id, cls, scope_attr, scope_val)
+                if self._is_unique_in_tree(tree, xpath, lookup, (expression, params)):
                     return xpath
 
         # Level 3: Attribute combination
         conditions = []
+        variables = []
+        params = {}
         if res_id:
-            conditions.append(f"contains(@resource-id, '{res_id.split('/')[-1]}')")
+            conditions.append(f"contains(@resource-id, {self.safe_xpath_val(res_id.split('/')[-1])})")
+            variables.append("contains(@resource-id, $rid)")
+            params["rid"] = res_id.split('/')[-1]
         if text and len(text) < 50:
-            conditions.append(f"@text='{text}'")
+            conditions.append(f"@text={self.safe_xpath_val(text)}")
+            variables.append("@text=$text")
+            params["text"] = text
         if content_desc:
-            conditions.append(f"@content-desc='{content_desc}'")
+            conditions.append(f"@content-desc={self.safe_xpath_val(content_desc)}")
+            variables.append("@content-desc=$desc")
+            params["desc"] = content_desc
 
         if len(conditions) >= 2:
             xpath = f"//{cls}[{' and '.join(conditions)}]"
-            if self._is_unique_in_tree(tree, xpath):
+            expression = f"//{cls}[{' and '.join(variables)}]"
+            if self._is_unique_in_tree(tree, xpath, query=(expression, params)):
                 return xpath
 
         # Level 4: Sibling navigation
@@ -491,35 +707,29 @@ class PageAnalyzer:
                     prev_sibling = siblings[my_index - 1]
                     prev_text = prev_sibling.get("text") or prev_sibling.get("content-desc")
                     if prev_text:
-                        xpath = f"//*[@text='{prev_text}']/following-sibling::{cls}[1]"
-                        if self._is_unique_in_tree(tree, xpath):
+                        xpath = f"//*[@text={self.safe_xpath_val(prev_text)}]/following-sibling::{cls}[1]"
+                        expression = f"//*[@text=$text]/following-sibling::{cls}[1]"
+                        if self._is_unique_in_tree(tree, xpath, query=(expression, {"text": prev_text})):
                             return xpath
             except (ValueError, IndexError):
                 pass
 
         # Level 5: Hierarchical path (last resort)
-        return self._build_hierarchical_xpath(elem, tree)
+        return self._build_hierarchical_xpath(elem, tree, platform)
 
-    def get_best_locator(self, elem: etree.Element, tree: etree.Element,
-                         info: Dict[str, Any], platform: str,
-                         should_verify: bool) -> Optional[Dict[str, str]]:
+    def _identity_locator(self, info: Dict[str, Any], platform: str) -> Optional[Dict[str, str]]:
         """
-        Get best locator strategy for element
+        Locator strategies that need no tree-wide check (resource-id, accessibility id)
 
         Args:
-            elem: Element
-            tree: XML tree
             info: Element info dict
             platform: Platform name
-            should_verify: Whether to verify
 
         Returns:
             dict or None: {"locator", "var_suffix", "strategy"}
         """
-        cls = info["class_name"]
         res_id = info["res_id"]
         content_desc = info["content_desc"]
-        text = info["text"]
 
         # Priority 1: Resource ID (Android)
         if platform == "ANDROID" and res_id and res_id not in AnalyzerConstants.BLACKLIST_IDS:
@@ -537,6 +747,36 @@ class PageAnalyzer:
                 "strategy": "ACC_ID"
             }
 
+        return None
+
+    def get_best_locator(self, elem: etree.Element, tree: etree.Element,
+                         info: Dict[str, Any], platform: str,
+                         should_verify: bool) -> Optional[Dict[str, str]]:
+        """
+        Get best locator strategy for element
+
+        Args:
+            elem: Element
+            tree: XML tree
+            info: Element info dict
+            platform: Platform name
+            should_verify: Whether to verify
+
+        Returns:
+            dict or None: {"locator", "var_suffix", "strategy"}
+        """
+        cls = info["class_name"]
+        res_id = info["res_id"]
+        content_desc = info["content_desc"]
+        text = info["text"]
+
+        self.get_index(tree, platform)
+
+        # Priority 1-2: Resource ID / Accessibility ID
+        identity = self._identity_locator(info, platform)
+        if identity:
+            return identity
+
         # Priority 3: Text (if short and unique)
         if text and len(text) < AnalyzerConstants.MAX_TEXT_LENGTH:
             if text.count(' ') < AnalyzerConstants.MAX_TEXT_WORDS and not text.isdigit():
@@ -544,10 +784,14 @@ class PageAnalyzer:
 
                 if platform == "ANDROID":
                     text_xpath = f"//{cls}[@text={safe_txt}]"
+                    expression = f"//{cls}[@text=$text]"
+                    lookup = lambda idx: idx.count_attr("text", text, tag=cls)
                 else:
                     text_xpath = f"//{cls}[@label={safe_txt} or @value={safe_txt}]"
+                    expression = f"//{cls}[@label=$text or @value=$text]"
+                    lookup = lambda idx: idx.count_label_or_value(cls, text)
 
-                if self._is_unique_in_tree(tree, text_xpath):
+                if self._is_unique_in_tree(tree, text_xpath, lookup, (expression, {"text": text})):
                     return {
                         "locator": f"xpath={text_xpath}",
                         "var_suffix": text,
@@ -559,7 +803,12 @@ class PageAnalyzer:
         if relative_res:
             return relative_res
 
-        # Priority 5: Robust XPath
+        # Priority 5: Repeated list row (every row stamped from its group's template)
+        row_res = self.generate_row_locator(elem, tree, platform, info)
+        if row_res:
+            return row_res
+
+        # Priority 6: Robust XPath
         robust_xpath = self.generate_robust_xpath(elem, tree, platform, info)
         if robust_xpath:
             suffix_text = text or content_desc or (res_id.split('/')[-1] if res_id else "element")
@@ -571,65 +820,174 @@ class PageAnalyzer:
 
         return None
 
+    def _element_info(self, elem: etree.Element, platform: str) -> Dict[str, Any]:
+        """
+        Platform-specific attributes of an element
+
+        Args:
+            elem: Element
+            platform: Platform name
+
+        Returns:
+            dict: res_id, content_desc, text, class_name, is_password
+        """
+        att = elem.attrib
+
+        if platform == "ANDROID":
+            cls = att.get("class", "")
+            return {
+                "res_id": att.get("resource-id", ""),
+                "content_desc": att.get("content-desc", ""),
+                "text": att.get("text", ""),
+                "class_name": cls,
+                "is_password": att.get("password") == "true"
+            }
+
+        # IOS
+        cls = att.get("type", "")
+        return {
+            "res_id": "",
+            "content_desc": att.get("name", ""),
+            "text": att.get("label") or att.get("value", ""),
+            "class_name": cls,
+            "is_password": "Secure" in str(cls)
+        }
+
+    def _is_filtered_out(self, info: Dict[str, Any], platform: str) -> bool:
+        """Attribute filters: ignored classes without text, blacklisted IDs"""
+        cls = info["class_name"]
+
+        # Filter: Ignored classes without text
+        if any(b_cls in cls for b_cls in AnalyzerConstants.IGNORE_CLASSES):
+            if not info["text"] and not info["content_desc"]:
+                return True
+
+        # Filter: Blacklisted IDs
+        if platform == "ANDROID":
+            if any(b_id in info["res_id"] for b_id in AnalyzerConstants.BLACKLIST_IDS):
+                return True
+
+        return False
+
+    def _variable_suffix(self, res: Dict[str, str], info: Dict[str, Any]) -> str:
+        """Variable name part after the page prefix ("login_btn")"""
+        base_text = self.clean_text_for_var(res['var_suffix'])
+        type_suffix = self.get_element_type_suffix(info['class_name'], info['res_id'], info['is_password'])
+
+        if base_text.endswith(f"_{type_suffix}"):
+            return base_text
+        return f"{base_text}_{type_suffix}"
+
+    def _variable_name(self, prefix: Optional[str], suffix: str) -> str:
+        """Robot Framework variable: ${selector_<prefix>_<suffix>}"""
+        if not prefix or len(prefix) < 2:
+            prefix = "page"
+        return f"${{selector_{prefix}_{suffix}}}"
+
+    def _element_record(self, coords: Dict[str, int], variable: Optional[str],
+                        res: Dict[str, str], info: Dict[str, Any], node: int) -> Dict[str, Any]:
+        """Element data as returned to the UI"""
+        return {
+            "coords": coords,
+            "variable": variable,
+            "locator": res['locator'],
+            "strategy": res['strategy'],
+            "text": info["text"] or info["content_desc"] or "",
+            "node": node
+        }
+
+    def _memo_key(self, elem: etree.Element, info: Dict[str, Any], platform: str,
+                  should_verify: bool, index: TreeIndex, pos: int) -> Optional[bytes]:
+        """
+        Locator memo signature of a node: its attributes, ancestor path, parent id and
+        previous sibling label (everything the strategies read besides uniqueness).
+        Identity locators (no tree-wide check), inputs (nearby label) and repeated
+        rows (sibling rows) are not memoized.
+
+        Returns:
+            bytes or None: Signature, None if the node is not memoizable
+        """
+        if self._identity_locator(info, platform):
+            return None
+        cls = str(info["class_name"])
+        if "EditText" in cls or "TextField" in cls or "Secure" in cls:
+            return None
+        if pos in index.repeated_rows:
+            return None
+
+        parent = elem.getparent()
+        # Yorum / işlem talimatı düğümleri atlanır (TreeIndex gibi yalnızca elementler)
+        previous = next(elem.itersiblings(etree.Element, preceding=True), None)
+        return locator_memo.signature(
+            platform, should_verify, elem.tag, cls, info["res_id"], info["content_desc"],
+            info["text"], info["is_password"], index.tag_path(pos),
+            parent.get("resource-id") if parent is not None else None,
+            (previous.get("text") or previous.get("content-desc")) if previous is not None else None
+        )
+
+    def _facts_hold(self, tree: etree.Element, facts: List[Fact]) -> bool:
+        """Replay recorded uniqueness checks on this tree"""
+        return all(self._check_unique(tree, xpath, lookup, query) == result
+                   for xpath, lookup, query, result in facts)
+
+    def _memoized_locator(self, elem: etree.Element, tree: etree.Element, info: Dict[str, Any],
+                          platform: str, should_verify: bool,
+                          pos: int) -> Tuple[Optional[Dict[str, str]], Optional[str]]:
+        """
+        get_best_locator through the cross-scan locator memo
+
+        Returns:
+            tuple: (locator result, variable suffix) - (None, None) if no locator
+        """
+        index = self.get_index(tree, platform)
+        key = self._memo_key(elem, info, platform, should_verify, index, pos)
+        if key is None:
+            return self.get_best_locator(elem, tree, info, platform, should_verify), None
+
+        cached = locator_memo.get(key, lambda facts: self._facts_hold(tree, facts))
+        if cached is not None:
+            return cached
+
+        self._facts = []
+        try:
+            res = self.get_best_locator(elem, tree, info, platform, should_verify)
+            facts = self._facts
+        finally:
+            self._facts = None
+
+        if not res:
+            return None, None
+        suffix = self._variable_suffix(res, info)
+        locator_memo.put(key, res, suffix, facts)
+        return res, suffix
+
     def process_single_element(self, args: Tuple) -> Optional[Dict[str, Any]]:
         """
         Process single element (designed for parallel execution)
 
         Args:
-            args: Tuple of (elem, tree, platform, should_verify, index, prefix)
+            args: Tuple of (elem, tree, platform, should_verify, index, prefix[, include_full_xpath])
 
         Returns:
             dict or None: Element data
         """
-        elem, tree, platform, should_verify, index, prefix = args
+        elem, tree, platform, should_verify, index, prefix = args[:6]
+        include_full_xpath = len(args) > 6 and args[6]
 
         try:
-            att = elem.attrib
-
-            # Parse platform-specific attributes
-            if platform == "ANDROID":
-                cls = att.get("class", "")
-                coords = self.parse_bounds_android(att.get("bounds"))
-                is_pwd = att.get("password") == "true"
-                info = {
-                    "res_id": att.get("resource-id", ""),
-                    "content_desc": att.get("content-desc", ""),
-                    "text": att.get("text", ""),
-                    "class_name": cls,
-                    "is_password": is_pwd
-                }
-            else:  # IOS
-                cls = att.get("type", "")
-                coords = self.parse_bounds_ios(elem)
-                is_pwd = "Secure" in str(cls)
-                info = {
-                    "res_id": "",
-                    "content_desc": att.get("name", ""),
-                    "text": att.get("label") or att.get("value", ""),
-                    "class_name": cls,
-                    "is_password": is_pwd
-                }
+            info = self._element_info(elem, platform)
+            cls = info["class_name"]
 
-            # Filter: Check coordinates
+            # Filter: Check coordinates (size filters run as masks in analyze)
+            coords = self.get_index(tree, platform).geometry.bounds(index)
             if not coords:
                 return None
 
-            if (coords['w'] < AnalyzerConstants.MIN_ELEMENT_WIDTH or
-                    coords['h'] < AnalyzerConstants.MIN_ELEMENT_HEIGHT):
+            if self._is_filtered_out(info, platform):
                 return None
 
-            # Filter: Ignored classes without text
-            if any(b_cls in cls for b_cls in AnalyzerConstants.IGNORE_CLASSES):
-                if not info["text"] and not info["content_desc"]:
-                    return None
-
-            # Filter: Blacklisted IDs
-            if platform == "ANDROID":
-                if any(b_id in info["res_id"] for b_id in AnalyzerConstants.BLACKLIST_IDS):
-                    return None
-
-            # Generate locator
-            res = self.get_best_locator(elem, tree, info, platform, should_verify)
+            # Generate locator (reused from earlier screens while its uniqueness facts hold)
+            res, suffix = self._memoized_locator(elem, tree, info, platform, should_verify, index)
 
             # Fallback for inputs
             is_input = "EditText" in str(cls) or "Secure" in str(cls) or "TextField" in str(cls)
@@ -641,37 +999,37 @@ class PageAnalyzer:
                 }
 
             if res:
-                # Generate variable name
-                base_text = self.clean_text_for_var(res['var_suffix'])
-                type_suffix = self.get_element_type_suffix(cls, info['res_id'], info['is_password'])
-
-                if base_text.endswith(f"_{type_suffix}"):
-                    final_variable_suffix = base_text
-                else:
-                    final_variable_suffix = f"{base_text}_{type_suffix}"
-
-                if not prefix or len(prefix) < 2:
-                    prefix = "page"
+                variable = self._variable_name(prefix, suffix or self._variable_suffix(res, info))
+                data = self._element_record(coords, variable, res, info, index)
 
-                v_name = f"${{selector_{prefix}_{final_variable_suffix}}}"
+                # Full XPath for debugging (on demand, see get_full_xpath)
+                if include_full_xpath:
+                    data["full_xpath"] = self.get_index(tree, platform).tag_path(index)
 
-                # Get full XPath for debugging
-                full_xpath = elem.getroottree().getpath(elem)
-
-                return {
-                    "coords": coords,
-                    "variable": v_name,
-                    "locator": res['locator'],
-                    "strategy": res['strategy'],
-                    "text": info["text"] or info["content_desc"] or "",
-                    "full_xpath": full_xpath
-                }
+                return data
 
         except Exception as e:
             logger.debug(f"Failed to process element at index {index}: {e}")
 
         return None
 
+    def get_full_xpath(self, tree: etree.Element, platform: str, node: int) -> Optional[str]:
+        """
+        Absolute XPath of a node by document position
+
+        Args:
+            tree: XML tree
+            platform: Platform name
+            node: Document position (the "node" field of analyzed elements)
+
+        Returns:
+            str or None: Absolute tag path
+        """
+        index = self.get_index(tree, platform)
+        if node < 0 or node >= len(index.nodes):
+            return None
+        return index.tag_path(node)
+
     def estimate_page_name(self, tree: etree.Element, platform: str,
                            win_width: int, win_height: int) -> str:
         """
@@ -690,26 +1048,23 @@ class PageAnalyzer:
         header_limit = win_height * AnalyzerConstants.HEADER_RATIO
         center_x = win_width / 2
 
-        all_nodes = tree.xpath('//*')
+        index = self.get_index(tree, platform)
+        geo = index.geometry
 
-        for elem in all_nodes:
-            att = elem.attrib
+        # Only nodes with bounds inside the header area
+        for pos in np.flatnonzero(geo.header_mask(header_limit)):
+            att = index.nodes[pos].attrib
             text = ""
             res_id = ""
 
             if platform == "ANDROID":
                 text = att.get("text") or att.get("content-desc") or ""
                 res_id = att.get("resource-id", "").lower()
-                bounds = self.parse_bounds_android(att.get("bounds"))
             else:
                 text = att.get("label") or att.get("value") or att.get("name") or ""
-                bounds = self.parse_bounds_ios(elem)
-
-            if not bounds:
-                continue
 
-            y = bounds['y']
-            mid_x = bounds['x'] + (bounds['w'] / 2)
+            y = int(geo.y[pos])
+            mid_x = int(geo.x[pos]) + (int(geo.w[pos]) / 2)
 
             # Text validation
             if not text or len(text) < AnalyzerConstants.MIN_TITLE_LENGTH:
@@ -719,10 +1074,6 @@ class PageAnalyzer:
             if text.replace(":", "").replace("%", "").isdigit():
                 continue
 
-            # Must be in header area
-            if y > header_limit:
-                continue
-
             # Calculate score
             score = 0
 
@@ -743,7 +1094,7 @@ class PageAnalyzer:
                 score += 15
 
             # Size bonus
-            if bounds['h'] > AnalyzerConstants.MIN_HEADER_HEIGHT:
+            if geo.h[pos] > AnalyzerConstants.MIN_HEADER_HEIGHT:
                 score += 5
 
             possible_titles.append({"text": text, "score": score})
@@ -756,8 +1107,193 @@ class PageAnalyzer:
 
         return "page"
 
+    def _confirmed_name(self, user_prefix: str) -> Optional[str]:
+        """Page name given by the user (None for empty / generic prefixes)"""
+        if not user_prefix or user_prefix in ["page", "login"]:
+            return None
+        return user_prefix
+
+    def _page_name(self, tree: etree.Element, platform: str, user_prefix: str,
+                   win_size: Dict[str, int], known: Optional[Dict[str, Any]]) -> str:
+        """
+        Page name: user prefix, else the confirmed name of the recognized screen, else estimated
+
+        Args:
+            tree: XML tree
+            platform: Platform name
+            user_prefix: User-provided page name prefix
+            win_size: Window size dict
+            known: ScreenStore match of this screen
+
+        Returns:
+            str: Page name
+        """
+        confirmed = self._confirmed_name(user_prefix)
+        if confirmed:
+            return confirmed
+        if known and known["page_name"]:
+            logger.info(f"🧭 Known screen ({known['similarity']:.2f}): page name '{known['page_name']}'")
+            return known["page_name"]
+        return self.estimate_page_name(tree, platform, win_size['width'], win_size['height'])
+
+    def _process_parallel(self, page_source: str, platform: str, should_verify: bool,
+                          prefix: str, include_full_xpath: bool,
+                          positions: List[int]) -> Optional[List[Optional[Dict[str, Any]]]]:
+        """
+        Shard candidate positions across the process pool.
+        The source is placed in shared memory once; shards only carry its handle.
+        Workers need the whole tree (uniqueness checks are tree-wide), so each
+        parses the source once per screen instead of receiving a node snapshot.
+
+        Args:
+            page_source: XML page source (workers parse it once)
+            platform: Platform name
+            should_verify: Whether to verify
+            prefix: Page name prefix
+            include_full_xpath: Whether to add full_xpath to each element
+            positions: Candidate node positions in document order
+
+        Returns:
+            list or None: Per-position results in input order (None if the pool is
+                          still starting or failed)
+        """
+        workers = min(AnalyzerConstants.PARALLEL_MAX_WORKERS, os.cpu_count() or 1)
+        pool = _warm_process_pool(workers)
+        if pool is None:
+            logger.info("Analysis process pool not warm yet, analyzing single-process")
+            return None
+
+        from backend.api.services.analysis_worker import analyze_shard
+        shard_count = workers * AnalyzerConstants.PARALLEL_SHARDS_PER_WORKER
+        shard_size = -(-len(positions) // shard_count)
+        shards = [positions[i:i + shard_size] for i in range(0, len(positions), shard_size)]
+
+        data = page_source.encode('utf-8')
+        shm = None
+        try:
+            shm = shared_memory.SharedMemory(create=True, size=max(1, len(data)))
+            shm.buf[:len(data)] = data
+            source_ref = (shm.name, len(data), hashlib.blake2b(data, digest_size=16).digest())
+
+            futures = [
+                pool.submit(analyze_shard, source_ref, platform, should_verify, prefix,
+                            include_full_xpath, shard)
+                for shard in shards
+            ]
+            # Contiguous shards collected in submission order -> deterministic output
+            results = []
+            for future in futures:
+                results.extend(future.result())
+            logger.info(f"Parallel analysis: {len(positions)} candidates in {len(shards)} shards")
+            return results
+        except Exception as e:
+            logger.warning(f"Parallel analysis failed, falling back to serial: {e}")
+            shutdown_process_pool()
+            return None
+        finally:
+            if shm is not None:
+                shm.close()
+                shm.unlink()
+
+    def _node_values(self, index: TreeIndex, pos: int) -> List[str]:
+        """Values a node contributes to uniqueness checks: tag, attributes, parent id, previous sibling label"""
+        elem = index.nodes[pos]
+        att = elem.attrib
+        values = [elem.tag] + [att.get(name) for name in TreeIndex.INDEXED_ATTRIBUTES]
+
+        parent = index.parents[pos]
+        if parent >= 0:
+            values.append(index.nodes[parent].get("resource-id"))
+            siblings = index.children[parent]
+            i = siblings.index(pos)
+            if i > 0:
+                prev = index.nodes[siblings[i - 1]]
+                values.append(prev.get("text"))
+                values.append(prev.get("content-desc"))
+
+        return [v for v in values if v]
+
+    def _reuse_previous(self, previous: Optional[Dict[str, Any]], index: TreeIndex,
+                        context: Tuple) -> Dict[int, Optional[Dict[str, Any]]]:
+        """
+        Collect element results of the previous scan that still hold on this tree
+
+        Args:
+            previous: Snapshot of the previous analysis
+            index: Index of the new tree
+            context: Analysis parameters (must match the previous ones)
+
+        Returns:
+            dict: {new position: element result (None = filtered out)}
+        """
+        if not previous or previous.get("context") != context:
+            return {}
+
+        old_index: TreeIndex = previous["index"]
+        old_results: Dict[int, Optional[Dict[str, Any]]] = previous["results"]
+        blocks = index.match_unchanged(old_index)
+
+        # Identical screen: every result holds
+        if blocks == [(0, 0, len(index.nodes))] and len(old_index.nodes) == len(index.nodes):
+            return dict(old_results)
+
+        # Values of changed nodes on both sides: uniqueness of these may have moved
+        new_same = np.zeros(len(index.nodes), dtype=bool)
+        old_same = np.zeros(len(old_index.nodes), dtype=bool)
+        for new_start, old_start, size in blocks:
+            new_same[new_start:new_start + size] = True
+            old_same[old_start:old_start + size] = True
+
+        changed_values = set()
+        for idx, same in ((index, new_same), (old_index, old_same)):
+            for pos in np.flatnonzero(~same):
+                changed_values.update(self._node_values(idx, int(pos)))
+        values_usable = len(changed_values) <= AnalyzerConstants.MAX_CHANGED_VALUES
+
+        reused = {}
+        for new_start, old_start, size in blocks:
+            for k in range(size):
+                old_pos = old_start + k
+                if old_pos not in old_results:
+                    continue
+                new_pos = new_start + k
+                res = old_results[old_pos]
+
+                if res is not None and res["strategy"] not in AnalyzerConstants.REUSABLE_STRATEGIES:
+                    # Block roots have a changed parent (sibling/parent context may differ)
+                    if k == 0 or not values_usable:
+                        continue
+                    if res["strategy"] not in AnalyzerConstants.UNIQUENESS_STRATEGIES:
+                        continue
+                    own_values = self._node_values(index, new_pos)
+                    if any(v in changed_values for v in own_values):
+                        continue
+                    # contains(@resource-id, suffix) may match changed ids
+                    res_id = index.nodes[new_pos].get("resource-id")
+                    if res_id and any(res_id.split('/')[-1] in v for v in changed_values):
+                        continue
+                    # Row stamping depends on the sibling rows, not only on the subtree
+                    if (new_pos in index.repeated_rows) != (old_pos in old_index.repeated_rows):
+                        continue
+                    # Hierarchical paths index ancestors that may lie outside the block
+                    if (res["strategy"] == "ROBUST_XP" and
+                            self._path_steps(index, new_pos) != self._path_steps(old_index, old_pos)):
+                        continue
+
+                if res is not None:
+                    res = dict(res, node=new_pos)
+                    if "full_xpath" in res:
+                        res["full_xpath"] = index.tag_path(new_pos)
+                reused[new_pos] = res
+
+        logger.info(f"Incremental scan: {len(blocks)} unchanged subtrees, {len(reused)} results reused")
+        return reused
+
     def analyze(self, page_source: str, platform: str, should_verify: bool,
-                user_prefix: str, win_size: Dict[str, int]) -> Dict[str, Any]:
+                user_prefix: str, win_size: Dict[str, int],
+                parallel: bool = False, include_full_xpath: bool = False,
+                previous: Optional[Dict[str, Any]] = None,
+                screens: Optional[ScreenStore] = None) -> Dict[str, Any]:
         """
         Main analysis method
 
@@ -767,6 +1303,10 @@ class PageAnalyzer:
             should_verify: Whether to verify locators
             user_prefix: User-provided page name prefix
             win_size: Window size dict
+            parallel: Shard large screens across a process pool
+            include_full_xpath: Add full_xpath to every element (otherwise on demand)
+            previous: Snapshot of the previous analysis (reuses unchanged subtrees)
+            screens: Store of known screens (page name and incremental base of a recognized screen)
 
         Returns:
             dict: Analysis result
@@ -779,49 +1319,65 @@ class PageAnalyzer:
                 logger.error(f"XML parse error: {e}")
                 return {"error": "XML Parse Error: Invalid XML structure"}
 
-            # Clear XPath cache for new page
+            # Clear XPath cache and build lookup index for new page
             self._xpath_cache.clear()
+            index = self.get_index(tree, platform)
+            logger.info(f"Found {len(index.nodes)} total elements in XML")
 
-            # Determine page name
-            detected_page_name = user_prefix
-            if not user_prefix or user_prefix in ["page", "login"]:
-                detected_page_name = self.estimate_page_name(
-                    tree, platform, win_size['width'], win_size['height']
-                )
+            # Known screen: its snapshot is a closer incremental base than the last scan
+            signature = screens.signature(index) if screens is not None else None
+            known = screens.match(signature, platform) if screens is not None else None
+            if known and known["snapshot"] is not None:
+                previous = known["snapshot"]
 
-            # Get all elements
-            all_elements = tree.xpath('//*')
-            logger.info(f"Found {len(all_elements)} total elements in XML")
+            # Determine page name
+            detected_page_name = self._page_name(tree, platform, user_prefix, win_size, known)
 
-            # Prepare tasks for processing
-            task_args = []
+            # Filter: bounds present, not fullscreen (>90% of screen), minimum size
             area_total = win_size['width'] * win_size['height']
+            candidates = np.flatnonzero(index.geometry.candidate_mask(
+                area_total * AnalyzerConstants.MAX_ELEMENT_SCREEN_RATIO,
+                AnalyzerConstants.MIN_ELEMENT_WIDTH,
+                AnalyzerConstants.MIN_ELEMENT_HEIGHT
+            ))
 
-            for idx, elem in enumerate(all_elements):
-                # --- FİLTRELEME BAŞLANGIÇ ---
-                b = None
+            # Reuse results of unchanged subtrees from the previous scan
+            context = (platform, detected_page_name, win_size['width'], win_size['height'],
+                       should_verify, include_full_xpath)
+            reused = self._reuse_previous(previous, index, context)
 
-                # Platforma göre boyutları hesapla
-                if platform == "ANDROID":
-                    b = self.parse_bounds_android(elem.attrib.get("bounds"))
-                else:  # IOS
-                    b = self.parse_bounds_ios(elem)
+            # Prepare tasks for processing
+            task_args = [
+                (index.nodes[idx], tree, platform, should_verify, int(idx), detected_page_name,
+                 include_full_xpath)
+                for idx in candidates if int(idx) not in reused
+            ]
+            logger.info(f"Processing {len(task_args)} candidate elements")
 
-                # Eğer element ekranın %90'ından fazlasını kaplıyorsa LİSTEYE EKLEME
-                if b and b['area'] > (area_total * AnalyzerConstants.MAX_ELEMENT_SCREEN_RATIO):
-                    logger.debug(f"Skipping fullscreen element (area: {b['area']})")
-                    continue
-                # --- FİLTRELEME BİTİŞ ---
+            # Process elements (small screens stay single-process)
+            results = None
+            if (parallel and (os.cpu_count() or 1) > 1 and
+                    len(task_args) >= AnalyzerConstants.PARALLEL_MIN_CANDIDATES):
+                results = self._process_parallel(
+                    page_source, platform, should_verify, detected_page_name,
+                    include_full_xpath, [arg[4] for arg in task_args]
+                )
 
-                task_args.append((elem, tree, platform, should_verify, idx, detected_page_name))
-            logger.info(f"Processing {len(task_args)} candidate elements")
+            if results is None:
+                results = [self.process_single_element(arg) for arg in task_args]
 
-            # Process elements (can be parallelized in future)
-            final_data = []
-            for arg in task_args:
-                res = self.process_single_element(arg)
-                if res:
-                    final_data.append(res)
+            by_position = dict(reused)
+            by_position.update(zip((arg[4] for arg in task_args), results))
+            ordered = [by_position[int(idx)] for idx in candidates]
+            final_data = [res for res in ordered if res]
+
+            self._snapshot = {
+                "index": index,
+                "context": context,
+                "results": {int(idx): res for idx, res in zip(candidates, ordered)}
+            }
+            if screens is not None:
+                screens.remember(signature, platform, known, self._confirmed_name(user_prefix), self._snapshot)
 
             logger.info(f"✅ Analysis complete: {len(final_data)} elements detected")
 
@@ -832,4 +1388,143 @@ class PageAnalyzer:
 
         except Exception as e:
             logger.error(f"Analysis failed: {e}", exc_info=True)
-            return {"error": f"Analysis failed: {str(e)}"}
\ No newline at end of file
+            return {"error": f"Analysis failed: {str(e)}"}
+
+    def analyze_stream(self, page_source: str, platform: str, should_verify: bool,
+                       user_prefix: str, win_size: Dict[str, int],
+                       include_full_xpath: bool = False,
+                       screens: Optional[ScreenStore] = None) -> Iterator[Dict[str, Any]]:
+        """
+        Streaming variant of analyze(): parses with iterparse and yields element
+        records as soon as they are final.
+
+        Elements with a resource-id / accessibility id locator need no tree-wide
+        check and are yielded while parsing. The rest need uniqueness checks and
+        are yielded after the last node closed.
+
+        Streaming only shortens the time to the first record. Memory use is that
+        of analyze(): the uniqueness checks need the complete tree and its index,
+        and every result is kept for the incremental snapshot.
+
+        Args:
+            page_source: XML page source
+            platform: "ANDROID" or "IOS"
+            should_verify: Whether to verify locators
+            user_prefix: User-provided page name prefix
+            win_size: Window size dict
+            include_full_xpath: Add full_xpath to every element (disables early records)
+            screens: Store of known screens (page name of a recognized screen)
+
+        Yields:
+            dict: {"type": "element", ...element data} records (early ones carry
+                  "var_suffix" and a "variable" only when the page name is known),
+                  then one {"type": "done"} or {"type": "error"} record
+        """
+        try:
+            self._xpath_cache.clear()
+
+            # Page name is only known upfront when the user gave one
+            page_name = user_prefix
+            estimate_name = self._confirmed_name(user_prefix) is None
+
+            area_total = win_size['width'] * win_size['height']
+            max_area = area_total * AnalyzerConstants.MAX_ELEMENT_SCREEN_RATIO
+
+            next_position = 0
+            open_positions: List[int] = []  # Positions of the open elements (start event seen)
+            candidates: List[int] = []
+            # position -> (coords, locator, info, variable suffix) of records sent early
+            early: Dict[int, Tuple] = {}
+            root = None
+
+            try:
+                events = etree.iterparse(io.BytesIO(page_source.encode('utf-8')),
+                                         events=("start", "end"))
+                for event, elem in events:
+                    if event == "start":
+                        # Start events arrive in document order (same numbering as TreeIndex)
+                        open_positions.append(next_position)
+                        next_position += 1
+                        if root is None:
+                            root = elem
+                        continue
+
+                    pos = open_positions.pop()
+                    if platform == "ANDROID":
+                        bounds = parse_android_bounds(elem.attrib.get("bounds"))
+                    else:
+                        bounds = parse_ios_bounds(elem)
+
+                    # Filter: bounds present, not fullscreen, minimum size (same as candidate_mask)
+                    if bounds is None:
+                        continue
+                    _, _, w, h = bounds
+                    if (w * h > max_area or w < AnalyzerConstants.MIN_ELEMENT_WIDTH or
+                            h < AnalyzerConstants.MIN_ELEMENT_HEIGHT):
+                        continue
+                    candidates.append(pos)
+
+                    if include_full_xpath:
+                        continue
+
+                    info = self._element_info(elem, platform)
+                    if self._is_filtered_out(info, platform):
+                        continue
+
+                    res = self._identity_locator(info, platform)
+                    if not res:
+                        continue
+
+                    coords = bounds_to_dict(bounds)
+                    suffix = self._variable_suffix(res, info)
+                    early[pos] = (coords, res, info, suffix)
+
+                    variable = None if estimate_name else self._variable_name(page_name, suffix)
+                    data = self._element_record(coords, variable, res, info, pos)
+                    if variable is None:
+                        del data["variable"]
+                    yield dict(data, type="element", var_suffix=suffix)
+            except etree.XMLSyntaxError as e:
+                logger.error(f"XML parse error: {e}")
+                yield {"type": "error", "error": "XML Parse Error: Invalid XML structure"}
+                return
+
+            # Remaining candidates need the complete tree
+            index = self.get_index(root, platform)
+            signature = screens.signature(index) if screens is not None else None
+            known = screens.match(signature, platform) if screens is not None else None
+            page_name = self._page_name(root, platform, user_prefix, win_size, known)
+
+            candidates.sort()
+            results: Dict[int, Optional[Dict[str, Any]]] = {}
+            for pos in candidates:
+                if pos in early:
+                    coords, res, info, suffix = early[pos]
+                    variable = self._variable_name(page_name, suffix)
+                    results[pos] = self._element_record(coords, variable, res, info, pos)
+                    continue
+
+                res = self.process_single_element(
+                    (index.nodes[pos], root, platform, should_verify, pos, page_name, include_full_xpath)
+                )
+                results[pos] = res
+                if res:
+                    yield dict(res, type="element")
+
+            self._snapshot = {
+                "index": index,
+                "context": (platform, page_name, win_size['width'], win_size['height'],
+                            should_verify, include_full_xpath),
+                "results": results
+            }
+            if screens is not None:
+                screens.remember(signature, platform, known, self._confirmed_name(user_prefix), self._snapshot)
+
+            count = sum(1 for res in results.values() if res)
+            logger.info(f"✅ Streaming analysis complete: {count} elements ({len(early)} streamed early)")
+
+            yield {"type": "done", "page_name": page_name, "count": count}
+
+        except Exception as e:
+            logger.error(f"Streaming analysis failed: {e}", exc_info=True)
+            yield {"type": "error", "error": f"Analysis failed: {str(e)}"}
@@ -0,0 +1,217 @@
+"""
+Screenshot renditions - Client-sized encodings of a raw screenshot (resolution pyramid)
+and its perceptual hash (visual change detection)
+"""
+import io
+import zlib
+import logging
+from typing import Dict, List, Optional, Tuple
+
+from PIL import Image
+
+from backend.core.constants import (
+    IMAGE_CODECS, IMAGE_MIN_LEVEL_WIDTH, SCREENSHOT_PHASH_GRID, SCREENSHOT_PHASH_THRESHOLD
+)
+
+logger = logging.getLogger(__name__)
+
+
+def image_size(data: bytes) -> Optional[Tuple[int, int]]:
+    """
+    Pixel size of an encoded screenshot (reads the header only)
+
+    Args:
+        data: Encoded screenshot
+
+    Returns:
+        tuple or None: (width, height), None if it cannot be decoded
+    """
+    try:
+        return Image.open(io.BytesIO(data)).size
+    except Exception:
+        return None
+
+
+def pyramid(width: int, height: int) -> List[Tuple[int, int]]:
+    """
+    Sizes of the pyramid levels: level 0 is full resolution, each next level
+    halves it, down to IMAGE_MIN_LEVEL_WIDTH (the last level is the thumbnail)
+
+    Args:
+        width: Full resolution width
+        height: Full resolution height
+
+    Returns:
+        list: (width, height) per level
+    """
+    levels = [(width, height)]
+    factor = 2
+    while -(-width // factor) >= IMAGE_MIN_LEVEL_WIDTH:
+        # Image.reduce() yuvarlamayı yukarı yapar
+        levels.append((-(-width // factor), -(-height // factor)))
+        factor *= 2
+    return levels
+
+
+def fit_level(levels: List[Tuple[int, int]], viewport_w: Optional[float], viewport_h: Optional[float]) -> int:
+    """
+    Smallest level that is not upscaled when shown contained in the viewport
+
+    Args:
+        levels: Pyramid level sizes
+        viewport_w: Viewport width in physical pixels (None: unknown)
+        viewport_h: Viewport height in physical pixels (None: unknown)
+
+    Returns:
+        int: Level index (0 - full resolution - when the viewport is unknown)
+    """
+    width, height = levels[0]
+    ratios = [size / full for size, full in ((viewport_w, width), (viewport_h, height)) if size]
+    if not ratios:
+        return 0
+
+    needed = width * min(ratios)
+    level = 0
+    for i, (level_width, _) in enumerate(levels):
+        if level_width >= needed:
+            level = i
+    return level
+
+
+def encode(data: bytes, level: int, codec: str, quality: int) -> Tuple[bytes, str]:
+    """
+    Encode one rendition of a raw screenshot
+
+    Args:
+        data: Raw screenshot (PNG bytes from the driver)
+        level: Pyramid level (each level halves the resolution)
+        codec: URL extension of the codec (IMAGE_CODECS)
+        quality: Encoder quality (1-100)
+
+    Returns:
+        tuple: (encoded bytes, mimetype) - the raw screenshot if it cannot be decoded
+    """
+    image_format, mimetype = IMAGE_CODECS[codec]
+    try:
+        image = Image.open(io.BytesIO(data))
+        if image.mode not in ("RGB", "L"):
+            image = image.convert("RGB")
+
+        # Kutu filtresiyle 2^level küçültme (resize'dan çok daha hızlı)
+        if level:
+            image = image.reduce(2 ** level)
+
+        buffer = io.BytesIO()
+        image.save(buffer, format=image_format, quality=quality, optimize=image_format == "JPEG")
+        encoded = buffer.getvalue()
+        logger.debug(f"Rendition encoded: level {level}, {codec} q{quality}, {len(data)} -> {len(encoded)} bytes")
+        return encoded, mimetype
+
+    except Exception as e:
+        logger.warning(f"Rendition encoding failed: {e}")
+        return data, raw_mimetype(data)
+
+
+def dhash(data: bytes) -> Optional[int]:
+    """
+    Difference hash of a raw screenshot: the image is box-reduced to a
+    (columns + 1) x rows grayscale grid (SCREENSHOT_PHASH_GRID) and each bit is
+    "cell brighter than its right neighbour". Invisible attribute flips and
+    re-captures of a still frame keep the hash; visible edits, even a few
+    characters of text, flip bits.
+
+    Args:
+        data: Raw screenshot (PNG bytes from the driver)
+
+    Returns:
+        int or None: Hash, None if the screenshot cannot be decoded
+    """
+    pixels = _grid(data)
+    return _difference_bits(pixels) if pixels is not None else None
+
+
+def frame_signature(data: bytes) -> Tuple[Optional[int], Optional[int]]:
+    """
+    Difference hash and pixel checksum of a raw screenshot, from one decode.
+    The dHash only sees edges, so a brightness or colour change (dimming,
+    night mode, a fading overlay) keeps it; the checksum of the grayscale
+    grid it is computed from does change.
+
+    Args:
+        data: Raw screenshot (PNG bytes from the driver)
+
+    Returns:
+        tuple: (hash, checksum) - (None, None) if the screenshot cannot be decoded
+    """
+    pixels = _grid(data)
+    if pixels is None:
+        return None, None
+    return _difference_bits(pixels), zlib.adler32(pixels)
+
+
+def _grid(data: bytes) -> Optional[bytes]:
+    """Grayscale (columns + 1) x rows grid of a raw screenshot (None if it cannot be decoded)"""
+    try:
+        image = Image.open(io.BytesIO(data))
+        if image.mode not in ("RGB", "RGBA", "L"):
+            image = image.convert("RGB")
+
+        # Önce tam sayı oranında küçült (hızlı), sonra ızgaraya indir
+        columns, rows = SCREENSHOT_PHASH_GRID
+        factor = max(1, min(image.width // (2 * (columns + 1)), image.height // (2 * rows)))
+        if factor > 1:
+            image = image.reduce(factor)
+        return image.convert("L").resize((columns + 1, rows), Image.BOX).tobytes()
+    except Exception as e:
+        logger.warning(f"Perceptual hash failed: {e}")
+        return None
+
+
+def _difference_bits(pixels: bytes) -> int:
+    """dHash bits of a grid: cell brighter than its right neighbour"""
+    columns, rows = SCREENSHOT_PHASH_GRID
+    bits = 0
+    for row in range(rows):
+        for col in range(row * (columns + 1), row * (columns + 1) + columns):
+            bits = (bits << 1) | (pixels[col] > pixels[col + 1])
+    return bits
+
+
+def hash_distance(a: Optional[int], b: Optional[int]) -> Optional[int]:
+    """Number of differing bits of two perceptual hashes (None if one is missing)"""
+    if a is None or b is None:
+        return None
+    return bin(a ^ b).count("1")
+
+
+def same_frame(a: Optional[int], b: Optional[int]) -> bool:
+    """True if two perceptual hashes belong to visually identical frames"""
+    distance = hash_distance(a, b)
+    return distance is not None and distance <= SCREENSHOT_PHASH_THRESHOLD
+
+
+def same_image(a: Tuple[Optional[int], Optional[int]], b: Tuple[Optional[int], Optional[int]]) -> bool:
+    """
+    True if two frame signatures (hash, checksum) belong to the same image:
+    same frame by dHash and an equal pixel checksum (brightness unchanged)
+    """
+    return same_frame(a[0], b[0]) and a[1] is not None and a[1] == b[1]
+
+
+def raw_mimetype(data: bytes) -> str:
+    """Mimetype of a screenshot as captured"""
+    return "image/png" if data.startswith(b"\x89PNG") else "image/jpeg"
+
+
+def levels_info(levels: List[Tuple[int, int]], window_w: int) -> List[Dict[str, float]]:
+    """
+    Level sizes with their explicit scale (rendition pixels per device unit)
+
+    Args:
+        levels: Pyramid level sizes
+        window_w: Device window width (points on iOS, pixels on Android)
+    """
+    return [
+        {"level": i, "width": w, "height": h, "scale": round(w / window_w, 4) if window_w else 1.0}
+        for i, (w, h) in enumerate(levels)
+    ]
@@ -0,0 +1,207 @@
+"""
+Screen store - Recognizes previously seen screens (MinHash signatures + LSH index)
+"""
+import zlib
+import logging
+import threading
+from collections import OrderedDict, defaultdict
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+import numpy as np
+
+from backend.api.services.tree_index import TreeIndex
+from backend.core.constants import (
+    SCREEN_STORE_SIZE, SCREEN_MINHASH_PERMUTATIONS, SCREEN_LSH_BANDS,
+    SCREEN_MATCH_THRESHOLD, MAX_SCREEN_SNAPSHOTS
+)
+
+logger = logging.getLogger(__name__)
+
+
+class ScreenStore:
+    """
+    Store of known screens. A screen is the set of its node shingles
+    (tag, resource-id, name, visible label - no bounds, so scrolling keeps it);
+    similar screens share most shingles. MinHash signatures estimate the
+    Jaccard similarity, LSH bands find candidates without scanning the store.
+
+    Per screen it keeps the page name confirmed by the user and, for the most
+    recent screens, the analysis snapshot (base for incremental re-analysis).
+    """
+
+    # Universal hashing h(x) = (a * x + b) mod p over 32-bit shingle hashes
+    PRIME = 4294967311  # smallest prime > 2^32
+
+    def __init__(self, max_screens: int = SCREEN_STORE_SIZE,
+                 permutations: int = SCREEN_MINHASH_PERMUTATIONS,
+                 bands: int = SCREEN_LSH_BANDS, threshold: float = SCREEN_MATCH_THRESHOLD,
+                 max_snapshots: int = MAX_SCREEN_SNAPSHOTS):
+        if permutations % bands:
+            raise ValueError("permutations must be a multiple of bands")
+
+        self.max_screens = max_screens
+        self.permutations = permutations
+        self.bands = bands
+        self.rows = permutations // bands
+        self.threshold = threshold
+        self.max_snapshots = max_snapshots
+
+        # Fixed seed: signatures stay comparable for the life of the process
+        rng = np.random.default_rng(0x5EED)
+        self._a = rng.integers(1, 1 << 31, size=permutations, dtype=np.uint64)
+        self._b = rng.integers(0, 1 << 31, size=permutations, dtype=np.uint64)
+
+        # screen id -> {"platform", "signature", "page_name"}
+        self._screens: "OrderedDict[int, Dict[str, Any]]" = OrderedDict()
+        # (platform, band, band bytes) -> screen ids
+        self._buckets: Dict[Tuple[str, int, bytes], Set[int]] = defaultdict(set)
+        # screen id -> analysis snapshot (last max_snapshots screens)
+        self._snapshots: "OrderedDict[int, Dict[str, Any]]" = OrderedDict()
+        self._next_id = 0
+        self._lock = threading.Lock()
+
+    # --- Signatures ---
+
+    @staticmethod
+    def _shingles(index: TreeIndex) -> Set[int]:
+        """32-bit hashes of the node shingles of a tree"""
+        shingles = set()
+        for pos, elem in enumerate(index.nodes):
+            token = "\x00".join((elem.tag, elem.get("resource-id", ""), elem.get("name", ""),
+                                 index.label_text(pos)))
+            shingles.add(zlib.crc32(token.encode('utf-8')))
+        return shingles
+
+    def signature(self, index: TreeIndex) -> np.ndarray:
+        """
+        MinHash signature of a parsed screen
+
+        Args:
+            index: Index of the parsed tree
+
+        Returns:
+            np.ndarray: permutations x uint64 minimum hashes
+        """
+        shingles = np.fromiter(self._shingles(index), dtype=np.uint64)
+        if not shingles.size:
+            return np.full(self.permutations, self.PRIME, dtype=np.uint64)
+        hashed = (shingles[:, None] * self._a + self._b) % np.uint64(self.PRIME)
+        return hashed.min(axis=0)
+
+    def _band_keys(self, platform: str, signature: np.ndarray) -> List[Tuple[str, int, bytes]]:
+        return [
+            (platform, band, signature[band * self.rows:(band + 1) * self.rows].tobytes())
+            for band in range(self.bands)
+        ]
+
+    # --- Lookup / update ---
+
+    def match(self, signature: np.ndarray, platform: str) -> Optional[Dict[str, Any]]:
+        """
+        Most similar known screen above the match threshold
+
+        Args:
+            signature: MinHash signature of the current screen
+            platform: Platform name
+
+        Returns:
+            dict or None: {"id", "similarity", "page_name", "snapshot"}
+        """
+        with self._lock:
+            candidates: Set[int] = set()
+            for key in self._band_keys(platform, signature):
+                candidates.update(self._buckets.get(key, ()))
+
+            if not candidates:
+                return None
+
+            # Fraction of equal MinHash values = estimated Jaccard similarity
+            ids = list(candidates)
+            matrix = np.stack([self._screens[screen_id]["signature"] for screen_id in ids])
+            similarities = (matrix == signature).mean(axis=1)
+            best = int(similarities.argmax())
+            best_id, best_similarity = ids[best], float(similarities[best])
+
+            if best_similarity < self.threshold:
+                return None
+
+            self._screens.move_to_end(best_id)
+            return {
+                "id": best_id,
+                "similarity": best_similarity,
+                "page_name": self._screens[best_id]["page_name"],
+                "snapshot": self._snapshots.get(best_id)
+            }
+
+    def remember(self, signature: np.ndarray, platform: str, match: Optional[Dict[str, Any]] = None,
+                 page_name: Optional[str] = None, snapshot: Optional[Dict[str, Any]] = None) -> int:
+        """
+        Store the current screen (updates the matched screen instead of adding a new one).
+        A matched screen keeps the signature it was first recorded with: overwriting
+        it with each new variant would let a chain of small changes drift it away
+        from the screen its page name was confirmed on.
+
+        Args:
+            signature: MinHash signature of the current screen
+            platform: Platform name
+            match: Result of match() for this screen
+            page_name: Page name confirmed by the user (None keeps the known one)
+            snapshot: Analysis snapshot of the current screen
+
+        Returns:
+            int: Screen id
+        """
+        with self._lock:
+            screen_id = match["id"] if match and match["id"] in self._screens else None
+            if screen_id is not None:
+                entry = self._screens[screen_id]
+                entry["page_name"] = page_name or entry["page_name"]
+                self._screens.move_to_end(screen_id)
+            else:
+                screen_id = self._next_id
+                self._next_id += 1
+                self._screens[screen_id] = {"platform": platform, "signature": signature,
+                                            "page_name": page_name}
+                for key in self._band_keys(platform, signature):
+                    self._buckets[key].add(screen_id)
+
+            if snapshot is not None:
+                self._snapshots[screen_id] = snapshot
+                self._snapshots.move_to_end(screen_id)
+                while len(self._snapshots) > self.max_snapshots:
+                    self._snapshots.popitem(last=False)
+
+            while len(self._screens) > self.max_screens:
+                evicted = next(iter(self._screens))
+                self._unlink(evicted)
+                self._snapshots.pop(evicted, None)
+
+            return screen_id
+
+    def _unlink(self, screen_id: int) -> Dict[str, Any]:
+        """Remove a screen from the store and its LSH buckets (lock must be held)"""
+        entry = self._screens.pop(screen_id)
+        for key in self._band_keys(entry["platform"], entry["signature"]):
+            bucket = self._buckets.get(key)
+            if bucket is not None:
+                bucket.discard(screen_id)
+                if not bucket:
+                    del self._buckets[key]
+        return entry
+
+    def stats(self) -> Dict[str, int]:
+        """Store statistics"""
+        with self._lock:
+            return {
+                "screens": len(self._screens),
+                "max_screens": self.max_screens,
+                "snapshots": len(self._snapshots),
+                "named": sum(1 for entry in self._screens.values() if entry["page_name"])
+            }
+
+    def clear(self):
+        """Forget all screens"""
+        with self._lock:
+            self._screens.clear()
+            self._buckets.clear()
+            self._snapshots.clear()
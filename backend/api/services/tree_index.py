@@ -0,0 +1,362 @@
+"""
+Tree index - One-pass lookup tables over a parsed page source
+"""
+import hashlib
+import logging
+from collections import Counter, defaultdict
+from typing import Dict, List, Optional, Tuple
+
+from lxml import etree
+
+from backend.api.services.geometry import GeometryTable
+
+logger = logging.getLogger(__name__)
+
+
+class TreeIndex:
+    """
+    Precomputed lookup tables for a parsed XML tree.
+    Built once per page source so that locator uniqueness checks become
+    dictionary lookups instead of full-tree XPath scans.
+    """
+
+    # Attributes used by the locator strategies (Android + iOS)
+    INDEXED_ATTRIBUTES = ("resource-id", "content-desc", "text", "label", "value", "name")
+    # Minimum number of structurally identical siblings treated as list rows
+    MIN_REPEATED_ROWS = 3
+
+    def __init__(self, root: etree.Element, platform: str):
+        self.root = root
+        self.platform = platform
+
+        # Document order (same as tree.xpath('//*'))
+        self.nodes: List[etree.Element] = []
+        # elem -> document position
+        self.positions: Dict[etree.Element, int] = {}
+        # position -> parent position (-1 for root)
+        self.parents: List[int] = []
+        self.depths: List[int] = []
+        # position -> 1-based index among same-tag siblings
+        self.ordinals: List[int] = []
+        # parent position -> {tag: number of children with that tag}
+        self._child_tag_counts: Dict[int, Counter] = defaultdict(Counter)
+        # position -> absolute tag path (lazily filled)
+        self._tag_paths: Dict[int, str] = {}
+
+        # (attr, value) -> count
+        self._attr_counts: Counter = Counter()
+        # (tag, attr, value) -> [elem]
+        self._tag_attr_nodes: Dict[Tuple[str, str, str], List[etree.Element]] = defaultdict(list)
+        # (tag, value) -> count of elements where @label=value or @value=value
+        self._label_value_counts: Counter = Counter()
+        # tag -> [elem]
+        self._tag_nodes: Dict[str, List[etree.Element]] = defaultdict(list)
+
+        # (expression, params) -> uniqueness of XPath checks on this tree (filled by the analyzer)
+        self.xpath_results: Dict[Tuple, bool] = {}
+        # (ancestor_id, tag, attr, value) -> count (lazily filled)
+        self._scoped_counts: Dict[Tuple, int] = {}
+        # max_length -> nearest preceding label position per node (lazily filled)
+        self._label_tables: Dict[int, List[int]] = {}
+        # Merkle hashes / subtree sizes / child lists (lazily filled)
+        self._subtree_hashes: Optional[List[bytes]] = None
+        self._subtree_sizes: Optional[List[int]] = None
+        self._children: Optional[List[List[int]]] = None
+        # node position -> its repeated row, row -> representative row of its group (lazily filled)
+        self._repeated_rows: Optional[Dict[int, int]] = None
+        self._row_representatives: Optional[Dict[int, int]] = None
+        # representative row -> row template / row -> (row anchor XPath, anchor name) (filled by the analyzer)
+        self.row_templates: Dict[int, Dict] = {}
+        self.row_anchors: Dict[int, Tuple[str, str]] = {}
+
+        self._build()
+
+        # Bounds of every node, parsed once
+        self.geometry = GeometryTable.from_nodes(self.nodes, self.depths, platform)
+
+    def _build(self):
+        """Single pass over the tree filling all lookup tables"""
+        positions = self.positions
+        for elem in self.root.iter(etree.Element):
+            tag = elem.tag
+            att = elem.attrib
+
+            parent = elem.getparent()
+            parent_pos = positions.get(parent, -1) if parent is not None else -1
+            positions[elem] = len(self.nodes)
+            self.parents.append(parent_pos)
+            self.depths.append(self.depths[parent_pos] + 1 if parent_pos >= 0 else 0)
+            sibling_tags = self._child_tag_counts[parent_pos]
+            sibling_tags[tag] += 1
+            self.ordinals.append(sibling_tags[tag])
+            self.nodes.append(elem)
+            self._tag_nodes[tag].append(elem)
+
+            for name in self.INDEXED_ATTRIBUTES:
+                value = att.get(name)
+                if value is None:
+                    continue
+                self._attr_counts[(name, value)] += 1
+                self._tag_attr_nodes[(tag, name, value)].append(elem)
+
+            label = att.get("label")
+            value = att.get("value")
+            if label is not None:
+                self._label_value_counts[(tag, label)] += 1
+            if value is not None and value != label:
+                self._label_value_counts[(tag, value)] += 1
+
+        logger.debug(f"TreeIndex built: {len(self.nodes)} nodes")
+
+    def position(self, elem: etree.Element) -> Optional[int]:
+        """Document position of elem (None if it is not part of this tree)"""
+        return self.positions.get(elem)
+
+    def path_step(self, pos: int) -> str:
+        """Tag of a node with its same-tag sibling index ("tag[2]"), only when ambiguous"""
+        tag = self.nodes[pos].tag
+        if self._child_tag_counts[self.parents[pos]][tag] > 1:
+            return f"{tag}[{self.ordinals[pos]}]"
+        return tag
+
+    def tag_path(self, pos: int) -> str:
+        """Absolute path from the root, same format as getroottree().getpath(elem)"""
+        path = self._tag_paths.get(pos)
+        if path is not None:
+            return path
+
+        # Walk up to the nearest ancestor with a known path
+        chain = []
+        current = pos
+        while current >= 0 and current not in self._tag_paths:
+            chain.append(current)
+            current = self.parents[current]
+
+        path = self._tag_paths[current] if current >= 0 else ""
+        for p in reversed(chain):
+            path = f"{path}/{self.path_step(p)}"
+            self._tag_paths[p] = path
+        return path
+
+    def label_text(self, pos: int) -> str:
+        """Visible label of a node (text/content-desc on Android, label/value/name on iOS)"""
+        att = self.nodes[pos].attrib
+        if self.platform == "ANDROID":
+            return att.get("text") or att.get("content-desc") or ""
+        return att.get("label") or att.get("value") or att.get("name") or ""
+
+    def nearest_preceding_label(self, pos: int, max_length: int) -> Optional[Tuple[int, str]]:
+        """
+        Closest node before pos (document order) carrying a usable label:
+        non-empty, at most max_length characters and not purely numeric.
+
+        Returns:
+            tuple or None: (position, label text)
+        """
+        table = self._label_tables.get(max_length)
+        if table is None:
+            table = []
+            last = -1
+            for i in range(len(self.nodes)):
+                table.append(last)
+                txt = self.label_text(i)
+                if txt and len(txt) <= max_length and not txt.isdigit():
+                    last = i
+            self._label_tables[max_length] = table
+
+        label_pos = table[pos]
+        if label_pos < 0:
+            return None
+        return label_pos, self.label_text(label_pos)
+
+    def count_attr(self, attr: str, value: str, tag: Optional[str] = None) -> int:
+        """
+        Count matches of //*[@attr=value] (or //tag[@attr=value])
+        """
+        if tag is None:
+            return self._attr_counts.get((attr, value), 0)
+        return len(self._tag_attr_nodes.get((tag, attr, value), ()))
+
+    def count_label_or_value(self, tag: str, value: str) -> int:
+        """
+        Count matches of //tag[@label=value or @value=value]
+        """
+        return self._label_value_counts.get((tag, value), 0)
+
+    def count_scoped(self, ancestor_id: str, tag: str,
+                     attr: Optional[str] = None, value: Optional[str] = None) -> int:
+        """
+        Count matches of //*[@resource-id=ancestor_id]//tag[@attr=value]
+        """
+        key = (ancestor_id, tag, attr, value)
+        cached = self._scoped_counts.get(key)
+        if cached is not None:
+            return cached
+
+        if attr is None:
+            candidates = self._tag_nodes.get(tag, ())
+        else:
+            candidates = self._tag_attr_nodes.get((tag, attr, value), ())
+
+        count = 0
+        for elem in candidates:
+            for ancestor in elem.iterancestors():
+                if ancestor.get("resource-id") == ancestor_id:
+                    count += 1
+                    break
+
+        self._scoped_counts[key] = count
+        return count
+
+    @property
+    def children(self) -> List[List[int]]:
+        """position -> child positions in document order"""
+        if self._children is None:
+            children = [[] for _ in self.nodes]
+            for pos, parent in enumerate(self.parents):
+                if parent >= 0:
+                    children[parent].append(pos)
+            self._children = children
+        return self._children
+
+    @property
+    def subtree_hashes(self) -> List[bytes]:
+        """
+        Merkle hash per node: tag + attributes + child hashes.
+        Equal hashes mean the whole subtree (attributes and structure) is identical.
+        """
+        if self._subtree_hashes is None:
+            self._compute_subtree_hashes()
+        return self._subtree_hashes
+
+    @property
+    def subtree_sizes(self) -> List[int]:
+        """Number of nodes in each subtree (a subtree spans [pos, pos + size))"""
+        if self._subtree_sizes is None:
+            self._compute_subtree_hashes()
+        return self._subtree_sizes
+
+    def _compute_subtree_hashes(self):
+        """Bottom-up pass (reverse document order visits children before parents)"""
+        n = len(self.nodes)
+        hashes: List[bytes] = [b""] * n
+        sizes = [1] * n
+        children = self.children
+
+        for pos in range(n - 1, -1, -1):
+            elem = self.nodes[pos]
+            h = hashlib.blake2b(elem.tag.encode('utf-8'), digest_size=8)
+            for name, value in elem.attrib.items():
+                h.update(b"\x00" + name.encode('utf-8') + b"\x01" + value.encode('utf-8'))
+            h.update(b"\x02")
+            for child in children[pos]:
+                h.update(hashes[child])
+                sizes[pos] += sizes[child]
+            hashes[pos] = h.digest()
+
+        self._subtree_hashes = hashes
+        self._subtree_sizes = sizes
+
+    def _structural_signatures(self) -> List[bytes]:
+        """
+        Row template hash per node: tag + resource-id + child signatures.
+        Text, descriptions and bounds are left out, so list rows with different
+        content but the same layout share a signature.
+        """
+        n = len(self.nodes)
+        signatures: List[bytes] = [b""] * n
+        children = self.children
+
+        for pos in range(n - 1, -1, -1):
+            elem = self.nodes[pos]
+            h = hashlib.blake2b(elem.tag.encode('utf-8'), digest_size=8)
+            h.update(b"\x00" + elem.get("resource-id", "").encode('utf-8') + b"\x02")
+            for child in children[pos]:
+                h.update(signatures[child])
+            signatures[pos] = h.digest()
+
+        return signatures
+
+    @property
+    def repeated_rows(self) -> Dict[int, int]:
+        """
+        Nodes inside repeated list rows (RecyclerView/ListView rows, XCUIElementTypeCell).
+        A row group is at least MIN_REPEATED_ROWS siblings with children and the same
+        structural signature, so node row + k of every row matches node
+        representative + k of the group's first row (see row_representatives).
+
+        Returns:
+            dict: node position -> position of the (innermost) row containing it
+        """
+        if self._repeated_rows is None:
+            self._find_repeated_rows()
+        return self._repeated_rows
+
+    @property
+    def row_representatives(self) -> Dict[int, int]:
+        """row position -> first row of its group (the template the group is analyzed on)"""
+        if self._row_representatives is None:
+            self._find_repeated_rows()
+        return self._row_representatives
+
+    def _find_repeated_rows(self):
+        signatures = self._structural_signatures()
+        sizes = self.subtree_sizes
+        rows: Dict[int, int] = {}
+        representatives: Dict[int, int] = {}
+
+        # Parents in document order: inner groups overwrite outer ones
+        for parent, children in enumerate(self.children):
+            if len(children) < self.MIN_REPEATED_ROWS:
+                continue
+            groups: Dict[bytes, List[int]] = defaultdict(list)
+            for child in children:
+                if sizes[child] > 1:
+                    groups[signatures[child]].append(child)
+
+            for members in groups.values():
+                if len(members) < self.MIN_REPEATED_ROWS:
+                    continue
+                for row in members:
+                    representatives[row] = members[0]
+                    for pos in range(row, row + sizes[row]):
+                        rows[pos] = row
+
+        self._repeated_rows = rows
+        self._row_representatives = representatives
+        logger.debug(f"Repeated rows: {len(representatives)} rows from "
+                     f"{len(set(representatives.values()))} templates")
+
+    def match_unchanged(self, previous: "TreeIndex") -> List[Tuple[int, int, int]]:
+        """
+        Diff against a previous tree by walking both from the root and pairing
+        children by (tag, same-tag ordinal), i.e. by identical tag path.
+
+        Returns:
+            list: (new_start, old_start, size) blocks of identical subtrees.
+                  Inside a block node new_start + k corresponds to old_start + k.
+        """
+        if not self.nodes or not previous.nodes:
+            return []
+        if self.nodes[0].tag != previous.nodes[0].tag:
+            return []
+
+        new_hashes, old_hashes = self.subtree_hashes, previous.subtree_hashes
+        blocks = []
+        stack = [(0, 0)]
+        while stack:
+            new_pos, old_pos = stack.pop()
+            if new_hashes[new_pos] == old_hashes[old_pos]:
+                blocks.append((new_pos, old_pos, self.subtree_sizes[new_pos]))
+                continue
+
+            old_children = {
+                (previous.nodes[c].tag, previous.ordinals[c]): c
+                for c in previous.children[old_pos]
+            }
+            for child in self.children[new_pos]:
+                match = old_children.get((self.nodes[child].tag, self.ordinals[child]))
+                if match is not None:
+                    stack.append((child, match))
+
+        return blocks
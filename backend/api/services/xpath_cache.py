@@ -0,0 +1,94 @@
+"""
+Compiled XPath cache - Process-wide LRU of parameterized etree.XPath objects
+"""
+import logging
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, Tuple
+
+from lxml import etree
+
+from backend.core.constants import XPATH_CACHE_SIZE
+
+logger = logging.getLogger(__name__)
+
+
+class CompiledXPathCache:
+    """
+    Bounded LRU of compiled XPath expressions.
+    Expressions take their values as variables ($text, $rid, $desc), so one
+    compiled object serves every element, scan and request with the same shape.
+    """
+
+    def __init__(self, max_size: int = XPATH_CACHE_SIZE):
+        self.max_size = max_size
+        self._entries: "OrderedDict[str, Tuple[etree.XPath, threading.Lock]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, expression: str) -> Tuple[etree.XPath, threading.Lock]:
+        """
+        Compiled expression (compiled on first use) with its evaluation lock
+
+        Args:
+            expression: XPath expression, values as $variables
+
+        Returns:
+            tuple: (etree.XPath, lock guarding its evaluation)
+        """
+        with self._lock:
+            entry = self._entries.get(expression)
+            if entry is not None:
+                self._entries.move_to_end(expression)
+                self.hits += 1
+                return entry
+
+        # Compile outside the lock (XPathSyntaxError propagates to the caller)
+        entry = (etree.XPath(expression), threading.Lock())
+
+        with self._lock:
+            self.misses += 1
+            current = self._entries.get(expression)
+            if current is not None:
+                return current
+            self._entries[expression] = entry
+            if len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+            return entry
+
+    def count(self, tree: etree.Element, expression: str, **params: Any) -> int:
+        """
+        Number of nodes matched by expression
+
+        Args:
+            tree: XML tree
+            expression: XPath expression
+            **params: Values of the $variables in the expression
+
+        Returns:
+            int: Match count
+        """
+        compiled, lock = self.get(expression)
+        # A compiled XPath object must not be evaluated by two threads at once
+        with lock:
+            return len(compiled(tree, **params))
+
+    def stats(self) -> Dict[str, int]:
+        """Cache statistics"""
+        with self._lock:
+            return {
+                "size": len(self._entries),
+                "max_size": self.max_size,
+                "hits": self.hits,
+                "misses": self.misses
+            }
+
+    def clear(self):
+        """Drop all compiled expressions"""
+        with self._lock:
+            self._entries.clear()
+
+
+# Shared by all analyzers in this process
+compiled_xpaths = CompiledXPathCache()
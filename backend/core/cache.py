@@ -1,78 +1,657 @@
 import time
-import sys
+import json
+import zlib
+import hashlib
 import logging
+import threading
 from collections import OrderedDict
-from backend.core.constants import MAX_CACHE_SIZE, SCREENSHOT_CACHE_TTL
+from backend.core.constants import (
+    CACHE_MAX_BYTES, CACHE_MAX_ENTRY_BYTES, CACHE_SWEEP_INTERVAL, CACHE_HOT_ENTRIES,
+    CACHE_COMPRESSION_LEVEL, MAX_SCREEN_INDEXES, SCREENSHOT_CACHE_TTL,
+    DISK_CACHE_MAX_BYTES, DISK_CACHE_TTL, DISK_CACHE_FLUSH_INTERVAL
+)
+from backend.core.disk_cache import DiskCache
+
+try:
+    import zstandard
+except ImportError:  # Optional: zlib is used without it
+    zstandard = None
 
 logger = logging.getLogger(__name__)
 
 
+def compress(data):
+    """Compress bytes (zstd if available, otherwise zlib)"""
+    if zstandard is not None:
+        return zstandard.ZstdCompressor(level=CACHE_COMPRESSION_LEVEL).compress(data)
+    return zlib.compress(data, CACHE_COMPRESSION_LEVEL)
+
+
+def decompress(data):
+    """Inverse of compress()"""
+    if zstandard is not None:
+        return zstandard.ZstdDecompressor().decompress(data)
+    return zlib.decompress(data)
+
+
+def image_id(data):
+    """Content address of a screenshot (URL-safe hex)"""
+    return hashlib.blake2b(data, digest_size=12).hexdigest()
+
+
 class CacheManager:
     """
-    Centralized cache for storing scan results (Image + XML + Window Size)
+    Centralized cache for storing scan results (Image + XML + Window Size + Analyses)
     Shared between Scan and Action endpoints.
+
+    Thread-safe LRU bounded by stored bytes. Entries are kept compressed:
+    screenshot as captured (served by content address, renditions encoded on demand
+    and kept with the entry), page source and analyses zstd/zlib-compressed. The few most recently used entries are also kept
+    decoded in a small hot tier. Expired entries are removed by a background sweeper.
+    With disk_dir set, entries are also written to a persistent DiskCache and
+    memory misses are served from it (warm hits after a restart).
     """
 
-    def __init__(self):
-        self.cache = OrderedDict()
+    def __init__(self, max_bytes=CACHE_MAX_BYTES, max_entry_bytes=CACHE_MAX_ENTRY_BYTES,
+                 ttl=SCREENSHOT_CACHE_TTL, sweep_interval=CACHE_SWEEP_INTERVAL,
+                 disk_dir=None, disk_max_bytes=DISK_CACHE_MAX_BYTES, disk_ttl=DISK_CACHE_TTL):
+        self.cache = OrderedDict()  # source_hash -> compressed entry
+        self._hot = OrderedDict()  # source_hash -> decoded entry (last CACHE_HOT_ENTRIES)
         self.last_scan_data = None  # En son yapılan taramayı hızlı erişim için tutar
-        self.max_size_mb = 50 * 1024 * 1024  # 50MB Limit
+        self.max_bytes = max_bytes  # 50MB Limit
+        self.max_entry_bytes = max_entry_bytes
+        self.ttl = ttl
+        self.sweep_interval = sweep_interval
         self.current_size = 0
+        self._screen_indexes = OrderedDict()  # (platform, page_source) -> TreeIndex, last N screens
+        self._images = {}  # image_id -> {source_hash: None} of the entries holding the screenshot (ordered set)
+        self.last_analysis = None  # Snapshot of the last analysis (incremental re-analysis)
+
+        # Flask request thread'leri + sweeper aynı anda erişir
+        self._lock = threading.RLock()
+        self._stats = {"hits": 0, "hot_hits": 0, "disk_hits": 0, "misses": 0, "evictions": 0,
+                       "expirations": 0, "rejected": 0}
+        self.raw_size = 0  # Decoded size of the cached entries (compression ratio)
+
+        # Kalıcı disk katmanı (opsiyonel)
+        self.disk = None
+        if disk_dir:
+            try:
+                self.disk = DiskCache(disk_dir, disk_max_bytes, disk_ttl, DISK_CACHE_FLUSH_INTERVAL)
+            except OSError as e:
+                logger.warning(f"Disk cache disabled ({disk_dir}): {e}")
+
+        # TTL sweeper (ilk kayıtta başlar)
+        self._sweeper = None
+        self._stop_event = threading.Event()
+
+    # --- Entry helpers ---
+
+    @staticmethod
+    def _unpack(item, source_hash):
+        """Decoded view of a compressed entry (image and analyses stay shared with the entry)"""
+        return {
+            "source_hash": source_hash,
+            "image": item["image"],
+            "image_id": item["image_id"],
+            "phash": item["phash"],
+            "checksum": item.get("checksum"),
+            "source": decompress(item["source"]).decode('utf-8') if item["source"] else "",
+            "window": item["window"],
+            "analyses": item["analyses"],
+            "timestamp": item["timestamp"]
+        }
+
+    def _is_expired(self, item, now=None):
+        return (now or time.time()) - item["timestamp"] > self.ttl
+
+    def _remove(self, source_hash):
+        """Remove an entry and release its bytes (lock must be held)"""
+        self._hot.pop(source_hash, None)
+        item = self.cache.pop(source_hash, None)
+        if item:
+            self.current_size -= item["size"]
+            self.raw_size -= item["raw_size"]
+            # Aynı görüntüyü tutan başka kayıt kalmadıysa eşleme silinir
+            holders = self._images.get(item["image_id"])
+            if holders is not None:
+                holders.pop(source_hash, None)
+                if not holders:
+                    del self._images[item["image_id"]]
+        return item
+
+    def _add(self, source_hash, item):
+        """Insert an entry as most recently used, evicting as needed (lock must be held)"""
+        self._evict_for(item["size"])
+        self.cache[source_hash] = item
+        self.current_size += item["size"]
+        self.raw_size += item["raw_size"]
+        self._images.setdefault(item["image_id"], {})[source_hash] = None
+
+    def _image_holder(self, screenshot_id):
+        """Source hash of the most recently stored entry holding a screenshot, or None (lock must be held)"""
+        holders = self._images.get(screenshot_id)
+        return next(reversed(holders)) if holders else None
+
+    def _make_hot(self, source_hash, decoded):
+        """Keep a decoded entry in the hot tier (lock must be held)"""
+        self._hot[source_hash] = decoded
+        self._hot.move_to_end(source_hash)
+        while len(self._hot) > CACHE_HOT_ENTRIES:
+            self._hot.popitem(last=False)
+
+    # --- Disk tier ---
+
+    def _disk_snapshot(self, item):
+        """
+        Meta and blob parts of an entry for the disk tier, None without one (lock must be held).
+        The parts are the entry's immutable bytes; they are joined outside the lock.
+        """
+        if self.disk is None:
+            return None
+        analyses = list(item["analyses"].items())
+        meta = {
+            "window": item["window"],
+            "timestamp": item["timestamp"],
+            # Renditions yalnızca bellekte tutulur
+            "raw_size": item["raw_size"] - sum(len(data) for data in item["renditions"].values()),
+            "image_id": item["image_id"],
+            "phash": item["phash"],
+            "checksum": item.get("checksum"),
+            "image": len(item["image"]),
+            "source": len(item["source"]),
+            "analyses": [[list(key), len(packed)] for key, packed in analyses]
+        }
+        return meta, [item["image"], item["source"]] + [packed for _, packed in analyses]
+
+    def _persist(self, source_hash, snapshot):
+        """Write an entry snapshot (_disk_snapshot) through to the disk tier (called outside the lock)"""
+        if snapshot is None:
+            return
+        meta, parts = snapshot
+        try:
+            self.disk.put(source_hash, meta, b"".join(parts))
+        except OSError as e:
+            logger.warning(f"Disk cache write failed: {e}")
 
-    def save_scan(self, source_hash, image_data, page_source, window_size):
+    def _persist_analysis(self, source_hash, key, source, raw_size, packed):
+        """
+        Append an analysis to the disk record of its screen as a small delta record
+        (called outside the lock). The delta names the source it belongs to: a delta
+        left behind a newer record of the same fingerprint is ignored on load.
+        """
+        if self.disk is None:
+            return
+        meta = {"analysis": list(key), "source_crc": zlib.crc32(source), "raw_size": raw_size}
+        try:
+            self.disk.append(source_hash, meta, packed)
+        except OSError as e:
+            logger.warning(f"Disk cache write failed: {e}")
+
+    def _load_from_disk(self, source_hash):
+        """Compressed entry from the disk tier, or None"""
+        if self.disk is None:
+            return None
+        try:
+            record = self.disk.get(source_hash)
+        except (OSError, ValueError) as e:
+            logger.warning(f"Disk cache read failed: {e}")
+            return None
+        if record is None:
+            return None
+
+        meta, blobs, deltas = record
+        offset = meta["image"] + meta["source"]
+        analyses = {}
+        for key, length in meta["analyses"]:
+            analyses[tuple(key)] = blobs[offset:offset + length]
+            offset += length
+
+        image = blobs[:meta["image"]]
+        source = blobs[meta["image"]:meta["image"] + meta["source"]]
+        raw_size = meta["raw_size"]
+        source_crc = zlib.crc32(source)
+        for delta, packed in deltas:
+            key = tuple(delta["analysis"])
+            if delta.get("source_crc") != source_crc or key in analyses:
+                continue
+            analyses[key] = packed
+            offset += len(packed)
+            raw_size += delta["raw_size"]
+
+        return {
+            "image": image,
+            "image_id": meta.get("image_id") or image_id(image),
+            "phash": meta.get("phash"),
+            "checksum": meta.get("checksum"),
+            "source": source,
+            "window": meta["window"],
+            "analyses": analyses,
+            "renditions": {},
+            # Disk TTL'i içindeki kayıt taze sayılır: yeniden başlatma sonrası her isabet cihazla doğrulanmaz
+            "timestamp": time.time(),
+            "size": offset,
+            "raw_size": raw_size
+        }
+
+    def _evict_for(self, size):
+        """Drop least recently used entries until size fits (lock must be held)"""
+        while self.current_size + size > self.max_bytes and self.cache:
+            removed_key = next(iter(self.cache))
+            removed_val = self._remove(removed_key)
+            self._stats["evictions"] += 1
+            logger.debug(f"Cache evicted {removed_key} ({removed_val['size']} bytes)")
+
+    # --- Scan entries ---
+
+    def save_scan(self, source_hash, image_data, page_source, window_size, phash=None, checksum=None):
         """
         Tarama sonucunu önbelleğe kaydeder.
+        A screenshot already cached under another entry (visually identical
+        screen) keeps its encoded renditions. The last scan is not changed
+        here: the scan endpoints set it (set_last_scan), background warm-ups do not.
+
+        Args:
+            source_hash: Fingerprint of the page source
+            image_data: Screenshot bytes as captured (PNG)
+            page_source: XML page source
+            window_size: Window size dict
+            phash: Perceptual hash of the screenshot
+            checksum: Pixel checksum of the screenshot (renditions.frame_signature)
+
+        Returns:
+            dict: Decoded entry (data packet); image_id is the content address of the screenshot (get_image)
         """
         timestamp = time.time()
+        analyses = {}  # (platform, prefix, verify, full_xpath) -> compressed analysis JSON
+        image = image_data or b""
+        screenshot_id = image_id(image)
 
-        # Veri paketi
+        # Veri paketi (çözülmüş hali - son tarama ve hot tier için)
         data_packet = {
-            "image": image_data,
+            "source_hash": source_hash,
+            "image": image,
+            "image_id": screenshot_id,
+            "phash": phash,
+            "checksum": checksum,
             "source": page_source,
             "window": window_size,
+            "analyses": analyses,
             "timestamp": timestamp
         }
 
-        # Son taramayı güncelle (Tap işlemi için)
-        self.last_scan_data = data_packet
-
         # Hash varsa cache'e ekle (Scan endpoint'i için)
         if source_hash:
-            # Boyut hesabı (tahmini)
-            size = sys.getsizeof(image_data) + sys.getsizeof(page_source)
+            # Sıkıştırma lock dışında
+            source = compress(page_source.encode('utf-8')) if page_source else b""
+            item = {
+                "image": image,
+                "image_id": screenshot_id,
+                "phash": phash,
+                "checksum": checksum,
+                "source": source,
+                "window": window_size,
+                "analyses": analyses,
+                "renditions": {},  # (level, codec, quality) -> encoded bytes
+                "timestamp": timestamp,
+                "size": len(image) + len(source),
+                "raw_size": len(image) + len((page_source or "").encode('utf-8'))
+            }
+
+            with self._lock:
+                self._remove(source_hash)
+
+                # Aynı görüntü başka kayıtta kodlandıysa rendition'lar yeniden kodlanmaz
+                shared = self.cache.get(self._image_holder(screenshot_id))
+                if shared is not None:
+                    item["renditions"].update(shared["renditions"])
+                    reused = sum(len(data) for data in shared["renditions"].values())
+                    item["size"] += reused
+                    item["raw_size"] += reused
+
+                if item["size"] > self.max_entry_bytes:
+                    self._stats["rejected"] += 1
+                    logger.warning(f"Scan not cached: entry too large ({item['size']} bytes)")
+                    return data_packet
+
+                # Yer açma (Eviction - LRU)
+                self._add(source_hash, item)
+                self._make_hot(source_hash, data_packet)
+                snapshot = self._disk_snapshot(item)
+
+            self._persist(source_hash, snapshot)
+
+        self._start_sweeper()
+        return data_packet
+
+    def replace_image(self, source_hash, image_data, phash=None, checksum=None):
+        """
+        Swap the screenshot of a cached screen whose pixels changed while its
+        source did not (animations); analyses are kept, renditions are dropped
+
+        Args:
+            source_hash: Fingerprint of the page source
+            image_data: New screenshot bytes as captured (PNG)
+            phash: Perceptual hash of the new screenshot
+            checksum: Pixel checksum of the new screenshot
+
+        Returns:
+            dict or None: Decoded entry with the new screenshot (None if not cached)
+        """
+        image = image_data or b""
+        with self._lock:
+            item = self.cache.get(source_hash)
+            if item is None:
+                return None
+            if item["size"] - len(item["image"]) + len(image) > self.max_entry_bytes:
+                self._stats["rejected"] += 1
+                return None
 
-            # Yer açma (Eviction)
-            while self.current_size + size > self.max_size_mb and self.cache:
-                removed_key, removed_val = self.cache.popitem(last=False)
-                # Basit boyut tahmini düşümü
-                removed_size = sys.getsizeof(removed_val["image"]) + sys.getsizeof(removed_val["source"])
-                self.current_size -= removed_size
+            self._remove(source_hash)
+            dropped = len(item["image"]) + sum(len(data) for data in item["renditions"].values())
+            item["size"] += len(image) - dropped
+            item["raw_size"] += len(image) - dropped
+            item["image"] = image
+            item["image_id"] = image_id(image)
+            item["phash"] = phash
+            item["checksum"] = checksum
+            item["renditions"] = {}
+            item["timestamp"] = time.time()
+            self._add(source_hash, item)
 
-            self.cache[source_hash] = data_packet
-            self.current_size += size
+            snapshot = self._disk_snapshot(item)
+
+        decoded = self._unpack(item, source_hash)
+        with self._lock:
+            if self.cache.get(source_hash) is item:
+                self._make_hot(source_hash, decoded)
+        self._persist(source_hash, snapshot)
+        return decoded
+
+    def confirm_image(self, source_hash):
+        """Cached screenshot re-checked against the device and still current"""
+        now = time.time()
+        with self._lock:
+            item = self.cache.get(source_hash)
+            if item is not None:
+                item["timestamp"] = now
+                decoded = self._hot.get(source_hash)
+                if decoded is not None:
+                    decoded["timestamp"] = now
 
     def get_scan(self, source_hash):
-        """Hash ile önbellekten veri getirir"""
-        item = self.cache.get(source_hash)
-        if item:
+        """Hash ile önbellekten veri getirir (çözülmüş: image bytes + source)"""
+        with self._lock:
+            item = self.cache.get(source_hash)
+
             # TTL Kontrolü
-            if time.time() - item["timestamp"] > SCREENSHOT_CACHE_TTL:
-                del self.cache[source_hash]
+            if item is not None and self._is_expired(item):
+                self._remove(source_hash)
+                self._stats["expirations"] += 1
+                item = None
+
+            if item is not None:
+                # LRU: son kullanılan sona
+                self.cache.move_to_end(source_hash)
+                self._stats["hits"] += 1
+
+                decoded = self._hot.get(source_hash)
+                if decoded is not None:
+                    self._hot.move_to_end(source_hash)
+                    self._stats["hot_hits"] += 1
+                    return decoded
+
+        if item is None:
+            return self._get_from_disk(source_hash)
+
+        # Sıkıştırılmış kayıttan çöz (lock dışında)
+        decoded = self._unpack(item, source_hash)
+        with self._lock:
+            if source_hash in self.cache:
+                self._make_hot(source_hash, decoded)
+        return decoded
+
+    def _get_from_disk(self, source_hash):
+        """
+        Memory miss: promote the disk entry to memory (lock not held).
+        The disk tier already dropped records older than its own TTL, so the
+        promoted entry starts a fresh memory TTL.
+        """
+        item = self._load_from_disk(source_hash)
+        if item is None:
+            with self._lock:
+                self._stats["misses"] += 1
+            return None
+
+        decoded = self._unpack(item, source_hash)
+        with self._lock:
+            self._stats["disk_hits"] += 1
+            if item["size"] <= self.max_entry_bytes:
+                self._remove(source_hash)
+                self._add(source_hash, item)
+                self._make_hot(source_hash, decoded)
+        self._start_sweeper()
+        return decoded
+
+    def get_image(self, screenshot_id):
+        """
+        Screenshot bytes by content address (None once its entry is gone)
+
+        Args:
+            screenshot_id: Content address of a saved screenshot (image_id)
+        """
+        with self._lock:
+            source_hash = self._image_holder(screenshot_id)
+            item = self.cache.get(source_hash) if source_hash else None
+            if item is None:
+                last = self.last_scan_data
+                if last and last["image_id"] == screenshot_id:
+                    return last["image"]
+                return None
+            return item["image"]
+
+    def get_rendition(self, screenshot_id, key):
+        """
+        Encoded rendition of a screenshot (None if not encoded yet)
+
+        Args:
+            screenshot_id: Content address of a saved screenshot (image_id)
+            key: (level, codec, quality) of the rendition
+        """
+        with self._lock:
+            source_hash = self._image_holder(screenshot_id)
+            item = self.cache.get(source_hash) if source_hash else None
+            return item["renditions"].get(key) if item is not None else None
+
+    def save_rendition(self, screenshot_id, key, data):
+        """
+        Rendition'ı ekran görüntüsünün cache kaydına ekler (yalnızca bellekte;
+        diskten yüklenen kayıtlar için yeniden kodlanır).
+        Kayıt yoksa veya limit aşılıyorsa kaydetmez.
+        """
+        with self._lock:
+            source_hash = self._image_holder(screenshot_id)
+            item = self.cache.get(source_hash) if source_hash else None
+            if item is None or key in item["renditions"]:
+                return
+            if item["size"] + len(data) > self.max_entry_bytes:
+                self._stats["rejected"] += 1
+                return
+
+            decoded = self._hot.get(source_hash)
+            self._remove(source_hash)
+            item["renditions"][key] = data
+            item["size"] += len(data)
+            item["raw_size"] += len(data)
+            self._add(source_hash, item)
+            if decoded is not None:
+                self._make_hot(source_hash, decoded)
+
+    def get_analysis(self, source_hash, key):
+        """
+        Analiz sonucunu önbellekten getirir (elements, page_name)
+
+        Args:
+            source_hash: Fingerprint of the page source
+            key: (platform, prefix, verify, full_xpath) of the analysis
+        """
+        # Ekran get_scan ile zaten sayıldı (ve diskten yüklendi); istatistik tekrar sayılmaz
+        with self._lock:
+            item = self.cache.get(source_hash)
+            if item is None or self._is_expired(item):
                 return None
-            return item
-        return None
+            packed = item["analyses"].get(key)
+        if packed is None:
+            return None
+        return json.loads(decompress(packed))
+
+    def save_analysis(self, source_hash, key, analysis):
+        """
+        Analiz sonucunu ekran görüntüsüyle aynı cache kaydına ekler.
+        Kayıt yoksa (süresi dolmuş / silinmiş) veya limit aşılıyorsa kaydetmez.
+        """
+        raw = json.dumps(analysis).encode('utf-8')
+        packed = compress(raw)
+
+        with self._lock:
+            item = self.cache.get(source_hash)
+            if item is None or self._is_expired(item) or key in item["analyses"]:
+                return
+            if item["size"] + len(packed) > self.max_entry_bytes:
+                self._stats["rejected"] += 1
+                return
+
+            # Kaydı çıkar, büyüt, yer açıp en sona geri ekle
+            decoded = self._hot.get(source_hash)
+            self._remove(source_hash)
+            item["analyses"][key] = packed
+            item["size"] += len(packed)
+            item["raw_size"] += len(raw)
+            self._add(source_hash, item)
+            if decoded is not None:
+                self._make_hot(source_hash, decoded)
+            source = item["source"]
+
+        self._persist_analysis(source_hash, key, source, len(raw), packed)
 
     def get_last_scan(self):
         """En son yapılan taramanın verisini döndürür"""
-        # TTL Kontrolü
-        if self.last_scan_data:
-            if time.time() - self.last_scan_data["timestamp"] > SCREENSHOT_CACHE_TTL:
+        with self._lock:
+            # TTL Kontrolü
+            if self.last_scan_data:
+                if self._is_expired(self.last_scan_data):
+                    self.last_scan_data = None
+                    return None
+                return self.last_scan_data
+            return None
+
+    def set_last_scan(self, data_packet):
+        """Son taramayı günceller (Tap işlemi için kritik)"""
+        with self._lock:
+            self.last_scan_data = data_packet
+
+    # --- Parsed screens ---
+
+    def get_screen_index(self, page_source, platform):
+        """Parsed tree + lookup index for this page source (None if not kept)"""
+        with self._lock:
+            index = self._screen_indexes.get((platform, page_source))
+            if index is not None:
+                self._screen_indexes.move_to_end((platform, page_source))
+            return index
+
+    def set_screen_index(self, page_source, index):
+        """
+        Keeps the parsed tree + lookup index (with its locator memos) of the last
+        MAX_SCREEN_INDEXES screens, so Smart Tap never re-parses a recent screen
+        """
+        key = (index.platform, page_source)
+        with self._lock:
+            self._screen_indexes[key] = index
+            self._screen_indexes.move_to_end(key)
+            while len(self._screen_indexes) > MAX_SCREEN_INDEXES:
+                self._screen_indexes.popitem(last=False)
+
+    def get_last_analysis(self):
+        """Snapshot of the last analysis (previous tree + element results)"""
+        with self._lock:
+            return self.last_analysis
+
+    def set_last_analysis(self, snapshot):
+        """Keeps the last analysis so the next scan can reuse unchanged subtrees"""
+        with self._lock:
+            self.last_analysis = snapshot
+
+    # --- Maintenance ---
+
+    def sweep_expired(self):
+        """Süresi dolan kayıtları siler"""
+        now = time.time()
+        with self._lock:
+            expired = [key for key, item in self.cache.items() if self._is_expired(item, now)]
+            for key in expired:
+                self._remove(key)
+            self._stats["expirations"] += len(expired)
+            if self.last_scan_data and self._is_expired(self.last_scan_data, now):
                 self.last_scan_data = None
-                return None
-            return self.last_scan_data
-        return None
+
+        if expired:
+            logger.debug(f"Cache sweep: {len(expired)} expired entries removed")
+        return len(expired)
+
+    def _sweep_loop(self):
+        while not self._stop_event.wait(self.sweep_interval):
+            try:
+                self.sweep_expired()
+            except Exception as e:
+                logger.error(f"Cache sweep failed: {e}")
+
+    def _start_sweeper(self):
+        """Background TTL sweeper (daemon, started on first save)"""
+        with self._lock:
+            if self._sweeper is not None and self._sweeper.is_alive():
+                return
+            self._stop_event.clear()
+            self._sweeper = threading.Thread(target=self._sweep_loop, name="cache-sweeper", daemon=True)
+            self._sweeper.start()
+
+    def stop(self):
+        """Stops the sweeper thread and flushes the disk index"""
+        self._stop_event.set()
+        sweeper = self._sweeper
+        if sweeper is not None and sweeper.is_alive():
+            sweeper.join(timeout=1)
+        self._sweeper = None
+        if self.disk is not None:
+            self.disk.close()
+
+    def stats(self):
+        """Hit/miss/eviction counters and byte usage"""
+        with self._lock:
+            served = self._stats["hits"] + self._stats["disk_hits"]
+            lookups = served + self._stats["misses"]
+            return {
+                **self._stats,
+                "hit_rate": round(served / lookups, 3) if lookups else 0.0,
+                "entries": len(self.cache),
+                "bytes": self.current_size,
+                "raw_bytes": self.raw_size,
+                "compression_ratio": round(self.raw_size / self.current_size, 2) if self.current_size else 0.0,
+                "hot_entries": len(self._hot),
+                "codec": "zstd" if zstandard is not None else "zlib",
+                "max_bytes": self.max_bytes,
+                "max_entry_bytes": self.max_entry_bytes,
+                "screen_indexes": len(self._screen_indexes),
+                "disk": self.disk.stats() if self.disk is not None else None
+            }
 
     def clear(self):
-        self.cache.clear()
-        self.last_scan_data = None
-        self.current_size = 0
\ No newline at end of file
+        with self._lock:
+            self.cache.clear()
+            self._hot.clear()
+            self.last_scan_data = None
+            self.current_size = 0
+            self.raw_size = 0
+            self._screen_indexes.clear()
+            self._images.clear()
+            self.last_analysis = None
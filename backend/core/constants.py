@@ -8,9 +8,33 @@ VALID_PLATFORMS = ["ANDROID", "IOS"]
 # Cache settings
 MAX_CACHE_SIZE = 10
 SCREENSHOT_CACHE_TTL = 300  # seconds
+CACHE_MAX_BYTES = 50 * 1024 * 1024  # Scan cache budget (image + source + analyses)
+CACHE_MAX_ENTRY_BYTES = 8 * 1024 * 1024  # Larger scans are not cached
+CACHE_SWEEP_INTERVAL = 60  # seconds between TTL sweeps
+CACHE_HOT_ENTRIES = 2  # Entries also kept decoded (no decompression on hit)
+CACHE_COMPRESSION_LEVEL = 3  # zstd / zlib level for cached sources and analyses
+DISK_CACHE_MAX_BYTES = 500 * 1024 * 1024  # Persistent scan cache budget (DISK_CACHE_DIR)
+DISK_CACHE_TTL = 7 * 24 * 3600  # seconds a persisted scan stays usable
+DISK_CACHE_FLUSH_INTERVAL = 2  # seconds between background fsync + index writes
+MAX_SCREEN_INDEXES = 5  # Parsed trees + indexes kept for Smart Tap
+
+# Known-screen recognition (MinHash + LSH)
+SCREEN_STORE_SIZE = 5000  # Screens remembered per process
+SCREEN_MINHASH_PERMUTATIONS = 64
+SCREEN_LSH_BANDS = 16  # 16 bands x 4 rows: screens above ~0.6 similarity become candidates
+SCREEN_MATCH_THRESHOLD = 0.8  # Estimated Jaccard similarity to treat as the same screen
+MAX_SCREEN_SNAPSHOTS = 5  # Analysis snapshots kept (incremental base for a recognized screen)
+
+# Screen fingerprint (scan cache key) - volatile parts are ignored
+FINGERPRINT_SKIP_IDS = ["com.android.systemui:id/"]  # resource-id prefixes (whole subtree)
+FINGERPRINT_SKIP_TYPES = ["XCUIElementTypeStatusBar"]  # element types (whole subtree)
+FINGERPRINT_SKIP_ATTRIBUTES = ["focused", "selected"]
+FINGERPRINT_SYSTEM_PACKAGES = ["com.android.systemui"]  # packages whose text is matched against the clock pattern
+FINGERPRINT_VOLATILE_TEXT = r"^\d{1,2}[:.]\d{2}(\s?[AaPp][Mm])?$"  # clock text (system UI only)
 
 # API settings
 API_TIMEOUT = 30  # seconds
+SCAN_FLIGHT_TIMEOUT = 60  # seconds a coalesced scan waits for the in-flight one
 MAX_RETRY_ATTEMPTS = 3
 
 # Element detection
@@ -22,10 +46,31 @@ MAX_ELEMENT_SCREEN_RATIO = 0.90
 # XPath generation
 MAX_XPATH_DEPTH = 4
 MAX_RELATIVE_SEARCH = 15
+XPATH_CACHE_SIZE = 256  # Compiled XPath objects kept per process
+LOCATOR_MEMO_SIZE = 5000  # Locator results kept per process (across scans)
 
 # Image optimization
 IMAGE_QUALITY = 60
 IMAGE_FORMAT = "JPEG"
+IMAGE_QUALITY_PROFILES = {"low": 40, "medium": 60, "high": 85}
+IMAGE_DEFAULT_PROFILE = "medium"
+IMAGE_CODECS = {"jpg": ("JPEG", "image/jpeg"), "webp": ("WEBP", "image/webp")}  # URL extension -> (PIL format, mimetype)
+IMAGE_MIN_LEVEL_WIDTH = 160  # Pyramid halves the screenshot down to this width (thumbnail level)
+SCREENSHOT_PHASH_GRID = (32, 64)  # dHash grid (columns, rows): finer grids tell small text edits apart
+SCREENSHOT_PHASH_THRESHOLD = 0  # dHash bits that may differ between visually identical frames
+SCREENSHOT_RECHECK_AGE = 0  # seconds before the cached screenshot of an unchanged source is re-checked (0 = never; opt-in for animated screens)
+
+# Live screen stream (MJPEG, Nav Mode)
+STREAM_MIN_INTERVAL = 0.2  # seconds between captures at full speed (~5 fps)
+STREAM_MAX_INTERVAL = 2.0  # slowest capture rate (idle screen or slow client)
+STREAM_MIN_QUALITY = 30
+STREAM_MAX_QUALITY = 70
+STREAM_KEEPALIVE = 10  # seconds: the last frame is re-sent (detects closed clients)
+
+# Watch mode (screen change events over SSE)
+WATCH_INTERVAL = 1.0  # seconds between page source polls (default of WATCH_INTERVAL in .env)
+WATCH_MIN_INTERVAL = 0.2
+WATCH_KEEPALIVE = 15  # seconds between SSE keep-alive comments
 
 # Appium settings
 APPIUM_SERVER_URL = "http://127.0.0.1:4723/wd/hub"
@@ -4,14 +4,22 @@ Global context - Singleton instances
 from backend.api.services.config_manager import ConfigManager
 from backend.core.driver_manager import DriverManager
 from backend.core.cache import CacheManager
+from backend.core.single_flight import SingleFlight
+from backend.api.services.screen_store import ScreenStore
+from backend.api.services.page_analyzer import shutdown_process_pool
 
 config_mgr = ConfigManager()
 driver_mgr = DriverManager(config_mgr)
-cache_mgr = CacheManager()
+cache_mgr = CacheManager(disk_dir=config_mgr.get("DISK_CACHE_DIR"))
+screen_store = ScreenStore()
+scan_flights = SingleFlight()  # Concurrent scans of the same device share one capture / analysis
 
 def cleanup():
     """
     Cleanup resources on shutdown
     """
     driver_mgr.quit_all()
-    cache_mgr.clear()
\ No newline at end of file
+    shutdown_process_pool()
+    cache_mgr.stop()
+    cache_mgr.clear()
+    screen_store.clear()
\ No newline at end of file
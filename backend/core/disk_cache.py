@@ -0,0 +1,401 @@
+"""
+Disk cache - Persistent, content-addressed tier of the scan cache (survives restarts)
+
+Layout of the cache directory:
+    data.bin    append-only records: header + key + meta JSON + blobs
+    index.json  key -> (offset, length, timestamp, last access, delta records), replaced atomically
+
+A key has one base record (put) and any number of small delta records appended
+after it (append), e.g. the analyses of a cached screen. Writes only append to
+data.bin; a background flusher makes them durable (fsync) and writes the index
+every flush_interval seconds, off the request threads. A write that takes the
+file over max_bytes wakes the flusher, which compacts it.
+
+A crash can only lose the tail of data.bin: records are checksummed, and on
+startup everything after the last indexed record is re-scanned and a torn
+record is truncated away.
+"""
+import os
+import json
+import mmap
+import time
+import zlib
+import struct
+import logging
+import threading
+from typing import Any, Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# magic, key length, meta length, blob length, crc32(key + meta + blobs)
+RECORD_HEADER = struct.Struct("<4sIIII")
+RECORD_MAGIC = b"RPC1"
+
+
+def _encode_record(key: str, meta: Dict[str, Any], blobs: bytes) -> bytes:
+    """Header + body of one record"""
+    key_bytes = key.encode("utf-8")
+    meta_bytes = json.dumps(meta).encode("utf-8")
+    body = key_bytes + meta_bytes + blobs
+    return RECORD_HEADER.pack(RECORD_MAGIC, len(key_bytes), len(meta_bytes), len(blobs), zlib.crc32(body)) + body
+
+
+def _decode_record(record: bytes) -> Optional[Tuple[str, Dict[str, Any], bytes]]:
+    """(key, meta, blobs) of one record, None if it is corrupt"""
+    magic, key_len, meta_len, blob_len, crc = RECORD_HEADER.unpack_from(record)
+    body = record[RECORD_HEADER.size:]
+    if magic != RECORD_MAGIC or zlib.crc32(body) != crc:
+        return None
+    return body[:key_len].decode("utf-8"), json.loads(body[key_len:key_len + meta_len]), body[key_len + meta_len:]
+
+
+class DiskCache:
+    """
+    Append-only record file with an in-memory index, mmap reads and
+    compaction-based eviction. Values are opaque blobs plus a JSON meta dict.
+    """
+
+    DATA_FILE = "data.bin"
+    INDEX_FILE = "index.json"
+    COMPACT_TARGET = 0.75  # Compaction keeps this fraction of max_bytes
+
+    def __init__(self, directory: str, max_bytes: int, ttl: float, flush_interval: float):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self.flush_interval = flush_interval
+        self._data_path = os.path.join(directory, self.DATA_FILE)
+        self._index_path = os.path.join(directory, self.INDEX_FILE)
+        self._lock = threading.RLock()
+        # key -> [offset, length, timestamp, last_access, [[delta offset, delta length], ...]]
+        self._index: Dict[str, list] = {}
+        self._size = 0
+        self._map: Optional[mmap.mmap] = None
+        self._map_file = None
+        self._append_file = None
+
+        # Arka plan flush: fsync + index yazımı istek thread'lerinde yapılmaz
+        self._dirty = False
+        self._generation = 0  # Compaction'da artar (eski index anlık görüntüsü yazılmaz)
+        self._compact_pending = False  # Bütçe aşıldı: flusher compaction yapar
+        self._flush_lock = threading.Lock()
+        self._flusher = None
+        self._stop_event = threading.Event()
+        self._wake_event = threading.Event()
+
+        os.makedirs(directory, exist_ok=True)
+        self._open()
+
+    # --- Startup / recovery ---
+
+    def _open(self):
+        """Load the index and recover records appended after it was written"""
+        if not os.path.exists(self._data_path):
+            open(self._data_path, "wb").close()
+        data_size = os.path.getsize(self._data_path)
+
+        indexed_size = 0
+        try:
+            with open(self._index_path, "r", encoding="utf-8") as f:
+                saved = json.load(f)
+            if saved.get("data_size", 0) <= data_size:
+                self._index = saved.get("entries", {})
+                indexed_size = saved.get("data_size", 0)
+        except (OSError, ValueError) as e:
+            logger.info(f"Disk cache index not usable, rebuilding: {e}")
+
+        # Delta kayıtlarından önceki index biçimi
+        for entry in self._index.values():
+            if len(entry) == 4:
+                entry.append([])
+
+        self._size = self._scan_records(indexed_size, data_size)
+        if self._size != indexed_size:
+            self._write_index()
+        self._append_file = open(self._data_path, "ab")
+        logger.info(f"💾 Disk cache ready: {len(self._index)} entries, {self._size} bytes ({self.directory})")
+
+    def _scan_records(self, start: int, end: int) -> int:
+        """Index valid records in [start, end); truncate a torn tail. Returns the valid size."""
+        if start >= end:
+            return start
+
+        offset = start
+        with open(self._data_path, "rb") as f:
+            f.seek(start)
+            while offset + RECORD_HEADER.size <= end:
+                header = f.read(RECORD_HEADER.size)
+                magic, key_len, meta_len, blob_len, crc = RECORD_HEADER.unpack(header)
+                length = RECORD_HEADER.size + key_len + meta_len + blob_len
+                if magic != RECORD_MAGIC or offset + length > end:
+                    break
+                body = f.read(key_len + meta_len + blob_len)
+                if zlib.crc32(body) != crc:
+                    break
+                key = body[:key_len].decode("utf-8")
+                meta = json.loads(body[key_len:key_len + meta_len])
+                if not meta.get("delta"):
+                    self._index[key] = [offset, length, meta.get("timestamp", 0), time.time(), []]
+                elif key in self._index:
+                    self._index[key][4].append([offset, length])
+                offset += length
+
+        if offset < end:
+            logger.warning(f"Disk cache: truncating torn tail ({end - offset} bytes)")
+            with open(self._data_path, "r+b") as f:
+                f.truncate(offset)
+        return offset
+
+    def _write_index(self):
+        """Atomically replace the index file (lock must be held)"""
+        tmp_path = self._index_path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump({"data_size": self._size, "entries": self._index}, f)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, self._index_path)
+
+    # --- Reads ---
+
+    def _view(self) -> Optional[mmap.mmap]:
+        """Read-only map of the data file, remapped when the file grew (lock must be held)"""
+        if self._size == 0:
+            return None
+        if self._map is None or len(self._map) < self._size:
+            self._close_map()
+            self._map_file = open(self._data_path, "rb")
+            self._map = mmap.mmap(self._map_file.fileno(), 0, access=mmap.ACCESS_READ)
+        return self._map
+
+    def _close_map(self):
+        if self._map is not None:
+            self._map.close()
+            self._map = None
+        if self._map_file is not None:
+            self._map_file.close()
+            self._map_file = None
+
+    def get(self, key: str) -> Optional[Tuple[Dict[str, Any], bytes, List[Tuple[Dict[str, Any], bytes]]]]:
+        """
+        Read a record with its delta records
+
+        Args:
+            key: Screen fingerprint
+
+        Returns:
+            tuple or None: (meta dict, blobs, [(delta meta, delta blobs), ...]) -
+                           None if missing, expired, corrupt or stored under another key
+        """
+        with self._lock:
+            entry = self._index.get(key)
+            if entry is None:
+                return None
+            offset, length, timestamp, _, deltas = entry
+            if time.time() - timestamp > self.ttl:
+                del self._index[key]
+                return None
+
+            view = self._view()
+            records = [view[start:start + size] for start, size in [(offset, length)] + deltas]
+            entry[3] = time.time()
+
+        decoded = [_decode_record(record) for record in records]
+        # Index'in gösterdiği kayıt başka bir anahtarınsa (bozuk index) miss sayılır
+        if any(record is None or record[0] != key for record in decoded):
+            logger.warning(f"Disk cache: corrupt record for {key}, dropped")
+            with self._lock:
+                self._index.pop(key, None)
+            return None
+
+        _, meta, blobs = decoded[0]
+        return meta, blobs, [(delta, data) for _, delta, data in decoded[1:]]
+
+    # --- Writes ---
+
+    def put(self, key: str, meta: Dict[str, Any], blobs: bytes):
+        """
+        Append a record (replaces an older record of the same key and its deltas)
+
+        Args:
+            key: Screen fingerprint
+            meta: JSON-serializable metadata (must contain "timestamp")
+            blobs: Binary payload
+        """
+        record = _encode_record(key, meta, blobs)
+        with self._lock:
+            offset = self._append(key, record)
+            if offset is not None:
+                self._index[key] = [offset, len(record), meta.get("timestamp", time.time()), time.time(), []]
+
+    def append(self, key: str, meta: Dict[str, Any], blobs: bytes):
+        """
+        Append a delta record to the record of key (ignored if key is not stored)
+
+        Args:
+            key: Screen fingerprint
+            meta: JSON-serializable metadata of the delta
+            blobs: Binary payload of the delta
+        """
+        record = _encode_record(key, dict(meta, delta=True), blobs)
+        with self._lock:
+            if key not in self._index:
+                return
+            offset = self._append(key, record)
+            # Compaction kaydı çıkarmış olabilir
+            if offset is not None and key in self._index:
+                self._index[key][4].append([offset, len(record)])
+
+    def _append(self, key: str, record: bytes) -> Optional[int]:
+        """
+        Append an encoded record; flushed to disk later by the flusher, which
+        also compacts the file once the budget is exceeded (lock must be held)
+
+        Returns:
+            int or None: Offset of the record (None if it is too large)
+        """
+        if self._append_file is None:  # Kapatıldı
+            return None
+        if len(record) > self.max_bytes * (1 - self.COMPACT_TARGET):
+            logger.debug(f"Disk cache: record for {key} too large ({len(record)} bytes)")
+            return None
+
+        # flush(): okuma map'i veriyi işletim sistemi önbelleğinden görür, fsync'e gerek yok
+        self._append_file.write(record)
+        self._append_file.flush()
+        offset = self._size
+        self._size += len(record)
+        self._dirty = True
+        self._start_flusher()
+        # Compaction istek thread'inde yapılmaz: flusher hemen uyandırılır
+        if self._size > self.max_bytes and not self._compact_pending:
+            self._compact_pending = True
+            self._wake_event.set()
+        return offset
+
+    def _compact(self, budget: float):
+        """
+        Rewrite live records (most recently used first) into a new data file
+        until budget is reached; the rest is evicted (lock must be held)
+        """
+        now = time.time()
+        live = [
+            (key, entry) for key, entry in self._index.items()
+            if now - entry[2] <= self.ttl
+        ]
+        live.sort(key=lambda item: item[1][3], reverse=True)
+
+        view = self._view()
+        tmp_path = self._data_path + ".tmp"
+        new_index: Dict[str, list] = {}
+        offset = 0
+        with open(tmp_path, "wb") as f:
+            for key, (old_offset, length, timestamp, last_access, deltas) in live:
+                if offset + length + sum(size for _, size in deltas) > budget:
+                    continue
+                f.write(view[old_offset:old_offset + length])
+                new_deltas = []
+                delta_offset = offset + length
+                for start, size in deltas:
+                    f.write(view[start:start + size])
+                    new_deltas.append([delta_offset, size])
+                    delta_offset += size
+                new_index[key] = [offset, length, timestamp, last_access, new_deltas]
+                offset = delta_offset
+            f.flush()
+            os.fsync(f.fileno())
+
+        self._close_map()
+        self._append_file.close()
+        os.replace(tmp_path, self._data_path)
+        self._append_file = open(self._data_path, "ab")
+        evicted = len(self._index) - len(new_index)
+        self._index = new_index
+        self._size = offset
+        self._generation += 1
+        self._compact_pending = False
+        self._write_index()
+        self._dirty = False
+        logger.info(f"💾 Disk cache compacted: {len(new_index)} kept, {evicted} evicted, {offset} bytes")
+
+    # --- Durability ---
+
+    def flush(self):
+        """
+        Compact the file if a write exceeded the budget, then make appended records
+        durable and write the index. The index snapshot is taken under the lock;
+        fsync and the file write are not.
+        """
+        with self._flush_lock:
+            with self._lock:
+                if self._compact_pending and self._append_file is not None:
+                    self._compact(self.max_bytes * self.COMPACT_TARGET)
+                if not self._dirty:
+                    return
+                self._dirty = False
+                generation = self._generation
+                state = json.dumps({"data_size": self._size, "entries": self._index})
+                fd = os.dup(self._append_file.fileno())
+
+            try:
+                os.fsync(fd)
+                tmp_path = self._index_path + ".flush"
+                with open(tmp_path, "w", encoding="utf-8") as f:
+                    f.write(state)
+                    f.flush()
+                    os.fsync(f.fileno())
+            except OSError:
+                with self._lock:
+                    self._dirty = True
+                raise
+            finally:
+                os.close(fd)
+
+            with self._lock:
+                # Compaction araya girdiyse kendi index'ini yazdı
+                if self._generation == generation:
+                    os.replace(tmp_path, self._index_path)
+                else:
+                    os.remove(tmp_path)
+
+    def _flush_loop(self):
+        while True:
+            self._wake_event.wait(self.flush_interval)
+            self._wake_event.clear()
+            if self._stop_event.is_set():
+                return
+            try:
+                self.flush()
+            except OSError as e:
+                logger.warning(f"Disk cache flush failed: {e}")
+
+    def _start_flusher(self):
+        """Background flusher (daemon, started on the first write; lock must be held)"""
+        if self._flusher is not None and self._flusher.is_alive():
+            return
+        self._stop_event.clear()
+        self._flusher = threading.Thread(target=self._flush_loop, name="disk-cache-flusher", daemon=True)
+        self._flusher.start()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {"entries": len(self._index), "bytes": self._size, "max_bytes": self.max_bytes}
+
+    def close(self):
+        """Flush pending records, persist access times and release the files"""
+        self._stop_event.set()
+        self._wake_event.set()
+        flusher = self._flusher
+        if flusher is not None and flusher.is_alive():
+            flusher.join(timeout=self.flush_interval + 1)
+        self._flusher = None
+
+        with self._flush_lock, self._lock:
+            if self._compact_pending and self._append_file is not None:
+                self._compact(self.max_bytes * self.COMPACT_TARGET)
+            if self._append_file is not None:
+                os.fsync(self._append_file.fileno())
+                self._append_file.close()
+                self._append_file = None
+            self._write_index()
+            self._dirty = False
+            self._close_map()
@@ -17,6 +17,10 @@ from backend.core.exceptions import (
     AppNotInstalledError,
     DriverError
 )
+from backend.core.constants import WATCH_INTERVAL, WATCH_MIN_INTERVAL
+from backend.core.fingerprint import screen_fingerprint
+from backend.core.frame_stream import FrameStream
+from backend.core.screen_watcher import ScreenWatcher
 
 logger = logging.getLogger(__name__)
 
@@ -27,6 +31,8 @@ class DriverManager:
         self.platform = "ANDROID"
         self.config_mgr = config_manager
         self._lock = threading.RLock()  # ✅ EKLENDİ: Re-entrant Lock (Aynı thread tekrar kilitleyebilir)
+        self._streams = {}  # (platform, level) -> FrameStream (live view)
+        self._watchers = {}  # platform -> ScreenWatcher (watch mode)
 
     def get_driver(self):
         """Aktif platformun Appium sürücüsünü döndürür."""
@@ -49,16 +55,93 @@ class DriverManager:
         return None
 
     def take_screenshot(self):
-        """Aktif sürücüden base64 formatında ekran görüntüsü alır."""
+        """Aktif sürücüden ekran görüntüsünü PNG bytes olarak alır."""
         driver = self.get_driver()
         if driver:
             try:
-                return driver.get_screenshot_as_base64()
+                return driver.get_screenshot_as_png()
             except Exception as e:
                 logger.error(f"Failed to take screenshot: {e}")
                 return None
         return None
 
+    def _capture_frame(self, platform):
+        """Screenshot of a platform's driver for its live view (None if unavailable)"""
+        with self._lock:
+            driver = self.drivers.get(platform)
+        if not driver:
+            return None
+        try:
+            return driver.get_screenshot_as_png()
+        except Exception as e:
+            logger.warning(f"Live view capture failed: {e}")
+            return None
+
+    def frame_stream(self, platform, level, encode, signature, same):
+        """
+        Live view of a platform's driver: background capture loop that runs
+        while it has subscribers (one loop per platform and pyramid level).
+        encode, signature and same are the frame encoder and change detection
+        of the stream (see FrameStream), supplied by the route layer.
+        """
+        with self._lock:
+            key = (platform, level)
+            stream = self._streams.get(key)
+            if stream is None or stream.closed:
+                stream = FrameStream(lambda: self._capture_frame(platform), encode, signature, same,
+                                     level, f"{platform.lower()}-{level}")
+                self._streams[key] = stream
+            return stream
+
+    def _poll_source(self, platform):
+        """Page source of a platform's driver for its watcher (None if unavailable)"""
+        with self._lock:
+            driver = self.drivers.get(platform)
+        if not driver:
+            return None
+        try:
+            return driver.page_source
+        except Exception as e:
+            logger.warning(f"Watch poll failed: {e}")
+            return None
+
+    def screen_watcher(self, platform):
+        """
+        Watch mode of a platform's driver: background page source polling that
+        runs while it has subscribers (interval: WATCH_INTERVAL config)
+        """
+        try:
+            interval = float(self.config_mgr.get("WATCH_INTERVAL", WATCH_INTERVAL))
+        except (TypeError, ValueError):
+            interval = WATCH_INTERVAL
+
+        with self._lock:
+            watcher = self._watchers.get(platform)
+            if watcher is None or watcher.closed:
+                watcher = ScreenWatcher(lambda: self._poll_source(platform),
+                                        lambda source: screen_fingerprint(source, self.config_mgr.get_all()),
+                                        interval, platform.lower())
+                self._watchers[platform] = watcher
+            else:
+                watcher.interval = max(WATCH_MIN_INTERVAL, interval)
+            return watcher
+
+    def stream_stats(self):
+        with self._lock:
+            return [stream.stats() for stream in self._streams.values()]
+
+    def watcher_stats(self):
+        with self._lock:
+            return [watcher.stats() for watcher in self._watchers.values()]
+
+    def _close_streams(self, platform):
+        """Stop the live views and the watcher of a driver that is quitting (lock must be held)"""
+        for key in [key for key in self._streams if key[0] == platform]:
+            self._streams.pop(key).close()
+        watcher = self._watchers.pop(platform, None)
+        if watcher is not None:
+            watcher.close()
+
     def is_active(self, platform=None):
         with self._lock:  # ✅ GÜNCELLENDİ
             target = platform or self.platform
@@ -87,6 +170,7 @@ class DriverManager:
 
             # Eski driver'ı temizle (varsa)
             if platform in self.drivers:
+                self._close_streams(platform)
                 try:
                     logger.info(f"🔄 Cleaning up old {platform} driver")
                     self.drivers[platform].quit()
@@ -192,6 +276,7 @@ class DriverManager:
         # ✅ GÜNCELLENDİ: Çıkış işlemleri kilitlendi
         with self._lock:
             if platform:
+                self._close_streams(platform)
                 if platform in self.drivers:
                     try:
                         logger.info(f"🛑 Quitting {platform} driver")
@@ -202,6 +287,7 @@ class DriverManager:
                         del self.drivers[platform]
             else:
                 for p in list(self.drivers.keys()):
+                    self._close_streams(p)
                     try:
                         logger.info(f"🛑 Quitting {p} driver")
                         self.drivers[p].quit()
@@ -0,0 +1,157 @@
+"""
+Screen fingerprint - Page source hash that ignores volatile UI parts
+"""
+import re
+import zlib
+import logging
+import threading
+from collections import OrderedDict
+from functools import lru_cache
+from typing import Any, Dict, Iterable, List, Optional
+
+from lxml import etree
+
+from backend.core.constants import (
+    FINGERPRINT_SKIP_IDS, FINGERPRINT_SKIP_TYPES, FINGERPRINT_SKIP_ATTRIBUTES,
+    FINGERPRINT_SYSTEM_PACKAGES, FINGERPRINT_VOLATILE_TEXT
+)
+
+logger = logging.getLogger(__name__)
+
+
+class ScreenFingerprinter:
+    """
+    Hashes a page source after normalization:
+    - subtrees of system UI (resource-id prefixes) and status bars (element types) are left out
+    - volatile attributes (focused, selected, ...) are left out
+    - text of system UI nodes (system packages and their subtrees) matching the
+      volatile pattern (clock) is replaced by a placeholder; app text is kept
+      as is, so a "10.30" price change is a different screen
+    Two sources with the same app content give the same fingerprint.
+    """
+
+    # Attributes checked against the volatile text pattern
+    TEXT_ATTRIBUTES = ("text", "content-desc", "label", "value", "name")
+    # Raw digest -> fingerprint memo (identical sources skip normalization)
+    MEMO_SIZE = 32
+
+    def __init__(self, skip_ids: Iterable[str], skip_types: Iterable[str],
+                 skip_attributes: Iterable[str], volatile_text: Optional[str],
+                 system_packages: Iterable[str] = ()):
+        self.skip_ids = tuple(skip_ids)
+        self.skip_types = frozenset(skip_types)
+        self.skip_attributes = frozenset(skip_attributes)
+        self.system_packages = frozenset(system_packages)
+        self.volatile_text = re.compile(volatile_text) if volatile_text else None
+        self._memo: "OrderedDict[str, str]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _is_skipped(self, elem: etree.Element) -> bool:
+        """Volatile subtree (system UI, status bar)"""
+        if self.skip_ids:
+            res_id = elem.get("resource-id")
+            if res_id and res_id.startswith(self.skip_ids):
+                return True
+        return elem.tag in self.skip_types or elem.get("type") in self.skip_types
+
+    def compute(self, page_source: str) -> str:
+        """
+        Fingerprint of a page source
+
+        Args:
+            page_source: XML page source
+
+        Returns:
+            str: 16 hex chars (crc32 + adler32 of the normalized tree)
+        """
+        data = page_source.encode('utf-8')
+        raw_digest = self._digest(data)
+        with self._lock:
+            fingerprint = self._memo.get(raw_digest)
+            if fingerprint is not None:
+                self._memo.move_to_end(raw_digest)
+                return fingerprint
+
+        fingerprint = self._normalized_digest(data, raw_digest)
+        with self._lock:
+            self._memo[raw_digest] = fingerprint
+            if len(self._memo) > self.MEMO_SIZE:
+                self._memo.popitem(last=False)
+        return fingerprint
+
+    def _normalized_digest(self, data: bytes, raw_digest: str) -> str:
+        """Digest of the tree without volatile subtrees, attributes and text"""
+        try:
+            root = etree.fromstring(data)
+        except etree.XMLSyntaxError as e:
+            # Not parseable: fall back to the raw bytes (analysis reports the error)
+            logger.debug(f"Fingerprint on raw source: {e}")
+            return raw_digest
+
+        parts: List[str] = []
+        stack = [(root, 0, False)]
+        while stack:
+            elem, depth, system = stack.pop()
+            if not isinstance(elem.tag, str):  # Comments / processing instructions
+                continue
+            if self._is_skipped(elem):
+                parts.append(f"{depth}\x03")
+                continue
+
+            # System UI node (status bar clock etc.): its subtree is system UI too
+            system = system or elem.get("package") in self.system_packages
+            parts.append(f"{depth}\x01{elem.tag}")
+            for name, value in elem.attrib.items():
+                if name in self.skip_attributes:
+                    continue
+                if (system and self.volatile_text and name in self.TEXT_ATTRIBUTES
+                        and self.volatile_text.match(value)):
+                    value = "\x04"
+                parts.append(f"{name}\x02{value}")
+
+            stack.extend((child, depth + 1, system) for child in reversed(elem))
+
+        return self._digest("\x00".join(parts).encode('utf-8'))
+
+    @staticmethod
+    def _digest(data: bytes) -> str:
+        """Fast non-cryptographic 64-bit digest"""
+        return f"{zlib.crc32(data):08x}{zlib.adler32(data):08x}"
+
+
+def _split_list(value: Any) -> List[str]:
+    """Comma separated config value (or list) -> list of non-empty items"""
+    if isinstance(value, (list, tuple)):
+        return [str(v).strip() for v in value if str(v).strip()]
+    return [v.strip() for v in str(value or "").split(",") if v.strip()]
+
+
+@lru_cache(maxsize=8)
+def _get_fingerprinter(skip_ids: str, skip_types: str, skip_attributes: str,
+                       volatile_text: str, system_packages: str) -> ScreenFingerprinter:
+    """Fingerprinter for one configuration (regex compiled once)"""
+    return ScreenFingerprinter(_split_list(skip_ids), _split_list(skip_types),
+                               _split_list(skip_attributes), volatile_text or None,
+                               _split_list(system_packages))
+
+
+def screen_fingerprint(page_source: str, config: Optional[Dict[str, Any]] = None) -> str:
+    """
+    Volatile-insensitive fingerprint of a page source (scan cache key)
+
+    Args:
+        page_source: XML page source
+        config: App configuration (FINGERPRINT_* keys, defaults from constants)
+
+    Returns:
+        str: Fingerprint
+    """
+    config = config or {}
+    fingerprinter = _get_fingerprinter(
+        str(config.get("FINGERPRINT_SKIP_IDS", ",".join(FINGERPRINT_SKIP_IDS))),
+        str(config.get("FINGERPRINT_SKIP_TYPES", ",".join(FINGERPRINT_SKIP_TYPES))),
+        str(config.get("FINGERPRINT_SKIP_ATTRS", ",".join(FINGERPRINT_SKIP_ATTRIBUTES))),
+        str(config.get("FINGERPRINT_VOLATILE_TEXT", FINGERPRINT_VOLATILE_TEXT)),
+        str(config.get("FINGERPRINT_SYSTEM_PKGS", ",".join(FINGERPRINT_SYSTEM_PACKAGES)))
+    )
+    return fingerprinter.compute(page_source)
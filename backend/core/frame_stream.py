@@ -0,0 +1,177 @@
+"""
+Frame stream - Background screen capture loop of one driver, shared by live view subscribers
+"""
+import time
+import logging
+import threading
+from typing import Any, Callable, Dict, Optional
+
+from backend.core.constants import (
+    STREAM_MIN_INTERVAL, STREAM_MAX_INTERVAL, STREAM_MIN_QUALITY, STREAM_MAX_QUALITY
+)
+
+logger = logging.getLogger(__name__)
+
+
+class FrameSubscriber:
+    """One live view client: reads the latest frame, skips the ones it was too slow for"""
+
+    def __init__(self, stream: "FrameStream"):
+        self.stream = stream
+        self.seq = 0  # Last frame delivered to this client
+
+    def next_frame(self, timeout: float) -> Optional[Dict[str, Any]]:
+        """
+        Wait for a frame newer than the last delivered one
+
+        Args:
+            timeout: Seconds to wait; on timeout the last frame is returned again
+
+        Returns:
+            dict or None: {"seq", "image", "timestamp"}, None if no frame yet or the stream is closed
+        """
+        return self.stream._next(self, timeout)
+
+    def close(self):
+        self.stream.unsubscribe(self)
+
+
+class FrameStream:
+    """
+    Captures the screen of one driver while someone is watching.
+    Frames are pushed only when their signature changes; every subscriber
+    sees the latest frame only, so a slow client skips frames instead of queueing them.
+    A push while a client has not taken the previous frame yet slows the capture
+    down and lowers the JPEG quality; clients that keep up speed it back up.
+    The loop stops with the last subscriber.
+
+    Encoding and change detection are passed in by the caller (route layer):
+    encode(raw, level, quality) -> frame bytes, signature(raw) -> signature,
+    same(signature, signature) -> True if the screen did not change.
+    """
+
+    def __init__(self, capture: Callable[[], Optional[bytes]], encode: Callable[[bytes, int, int], bytes],
+                 signature: Callable[[bytes], Any], same: Callable[[Any, Any], bool],
+                 level: int = 1, name: str = "screen"):
+        self._capture = capture
+        self._encode = encode
+        self._signature = signature
+        self._same = same
+        self.level = level
+        self.name = name
+        self.interval = STREAM_MIN_INTERVAL
+        self.quality = STREAM_MAX_QUALITY
+        self.closed = False
+
+        self._cond = threading.Condition()
+        self._subscribers = set()
+        self._frame: Optional[Dict[str, Any]] = None
+        self._thread: Optional[threading.Thread] = None
+        self._stats = {"captured": 0, "unchanged": 0, "pushed": 0, "skipped": 0}
+
+    # --- Subscribers ---
+
+    def subscribe(self) -> FrameSubscriber:
+        """Add a live view client (starts the capture loop if needed)"""
+        subscriber = FrameSubscriber(self)
+        with self._cond:
+            self._subscribers.add(subscriber)
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._loop, name=f"frames-{self.name}", daemon=True)
+                self._thread.start()
+        logger.info(f"📺 Live view subscribed ({self.name}, {len(self._subscribers)} watching)")
+        return subscriber
+
+    def unsubscribe(self, subscriber: FrameSubscriber):
+        with self._cond:
+            self._subscribers.discard(subscriber)
+            # Döngü beklemeden çıkabilsin
+            self._cond.notify_all()
+        logger.info(f"📺 Live view unsubscribed ({self.name}, {len(self._subscribers)} watching)")
+
+    def _next(self, subscriber: FrameSubscriber, timeout: float) -> Optional[Dict[str, Any]]:
+        deadline = time.time() + timeout
+        with self._cond:
+            while not self.closed and (self._frame is None or self._frame["seq"] == subscriber.seq):
+                remaining = deadline - time.time()
+                if remaining <= 0:
+                    break
+                self._cond.wait(remaining)
+
+            frame = self._frame
+            if self.closed or frame is None:
+                return None
+
+            skipped = frame["seq"] - subscriber.seq - 1
+            if subscriber.seq and skipped > 0:
+                self._stats["skipped"] += skipped
+            subscriber.seq = frame["seq"]
+            return frame
+
+    # --- Capture loop ---
+
+    def _loop(self):
+        last_signature = None
+        while True:
+            with self._cond:
+                if self.closed or not self._subscribers:
+                    self._thread = None
+                    self._frame = None
+                    return
+
+            started = time.time()
+            raw = self._capture()
+            if raw:
+                signature = self._signature(raw)
+                with self._cond:
+                    self._stats["captured"] += 1
+                    unchanged = last_signature is not None and self._same(signature, last_signature)
+                    if unchanged:
+                        # Ekran durağan: daha seyrek yakala
+                        self._stats["unchanged"] += 1
+                        self.interval = min(STREAM_MAX_INTERVAL, self.interval * 1.25)
+                if not unchanged:
+                    last_signature = signature
+                    self._push(raw)
+
+            with self._cond:
+                if self._subscribers and not self.closed:
+                    self._cond.wait(max(0.0, self.interval - (time.time() - started)))
+
+    def _push(self, raw: bytes):
+        """Encode a changed frame, hand it to the subscribers and adapt rate / quality"""
+        with self._cond:
+            quality = self.quality
+        image = self._encode(raw, self.level, quality)
+        with self._cond:
+            seq = self._frame["seq"] + 1 if self._frame else 1
+            # Önceki kareyi henüz almamış istemci varsa tüketimden hızlı üretiyoruz
+            slow = self._frame is not None and any(sub.seq < self._frame["seq"] for sub in self._subscribers)
+            self._frame = {"seq": seq, "image": image, "timestamp": time.time()}
+            self._stats["pushed"] += 1
+
+            if slow:
+                self.interval = min(STREAM_MAX_INTERVAL, self.interval * 1.5)
+                self.quality = max(STREAM_MIN_QUALITY, self.quality - 10)
+            else:
+                self.interval = max(STREAM_MIN_INTERVAL, self.interval * 0.8)
+                self.quality = min(STREAM_MAX_QUALITY, self.quality + 5)
+            self._cond.notify_all()
+
+    def close(self):
+        """Stop the loop and release all subscribers (driver quit)"""
+        with self._cond:
+            self.closed = True
+            self._cond.notify_all()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._cond:
+            return {
+                **self._stats,
+                "name": self.name,
+                "level": self.level,
+                "subscribers": len(self._subscribers),
+                "running": self._thread is not None,
+                "interval": round(self.interval, 3),
+                "quality": self.quality
+            }
@@ -0,0 +1,152 @@
+"""
+Screen watcher - Background page source polling of one device, shared by watch mode subscribers
+"""
+import time
+import logging
+import threading
+from typing import Any, Callable, Dict, Optional
+
+from backend.core.constants import WATCH_INTERVAL, WATCH_MIN_INTERVAL
+
+logger = logging.getLogger(__name__)
+
+
+class WatchSubscriber:
+    """One watch mode client: reads the latest screen event"""
+
+    def __init__(self, watcher: "ScreenWatcher"):
+        self.watcher = watcher
+        self.seq = 0  # Last event delivered to this client
+
+    def next_event(self, timeout: float) -> Optional[Dict[str, Any]]:
+        """
+        Wait for a screen event newer than the last delivered one
+
+        Args:
+            timeout: Seconds to wait
+
+        Returns:
+            dict or None: {"seq", "source_hash", "source", "timestamp"}, None on timeout or when closed
+        """
+        return self.watcher._next(self, timeout)
+
+    def close(self):
+        self.watcher.unsubscribe(self)
+
+
+class ScreenWatcher:
+    """
+    Polls the page source of one device while someone is watching and
+    publishes an event whenever its fingerprint changes (clock ticks and
+    other volatile parts do not count). Subscribers see the latest event
+    only: a screen that changed twice while a client was busy is reported once.
+    The loop stops with the last subscriber.
+    """
+
+    def __init__(self, poll: Callable[[], Optional[str]], fingerprint: Callable[[str], str],
+                 interval: float = WATCH_INTERVAL, name: str = "screen"):
+        self._poll = poll
+        self._fingerprint = fingerprint
+        self.interval = max(WATCH_MIN_INTERVAL, interval)
+        self.name = name
+        self.closed = False
+
+        self._cond = threading.Condition()
+        self._subscribers = set()
+        self._event: Optional[Dict[str, Any]] = None
+        self._thread: Optional[threading.Thread] = None
+        self._stats = {"polls": 0, "changes": 0, "failures": 0}
+
+    # --- Subscribers ---
+
+    def subscribe(self) -> WatchSubscriber:
+        """Add a watch mode client (starts the polling loop if needed)"""
+        subscriber = WatchSubscriber(self)
+        with self._cond:
+            self._subscribers.add(subscriber)
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._loop, name=f"watch-{self.name}", daemon=True)
+                self._thread.start()
+        logger.info(f"👁️ Watch mode subscribed ({self.name}, {len(self._subscribers)} watching)")
+        return subscriber
+
+    def unsubscribe(self, subscriber: WatchSubscriber):
+        with self._cond:
+            self._subscribers.discard(subscriber)
+            self._cond.notify_all()
+        logger.info(f"👁️ Watch mode unsubscribed ({self.name}, {len(self._subscribers)} watching)")
+
+    def _next(self, subscriber: WatchSubscriber, timeout: float) -> Optional[Dict[str, Any]]:
+        deadline = time.time() + timeout
+        with self._cond:
+            while not self.closed and (self._event is None or self._event["seq"] == subscriber.seq):
+                remaining = deadline - time.time()
+                if remaining <= 0:
+                    return None
+                self._cond.wait(remaining)
+
+            if self.closed:
+                return None
+            subscriber.seq = self._event["seq"]
+            return self._event
+
+    # --- Polling loop ---
+
+    def _loop(self):
+        while True:
+            with self._cond:
+                if self.closed or not self._subscribers:
+                    self._thread = None
+                    self._event = None
+                    return
+
+            started = time.time()
+            source = self._poll()
+            if source:
+                self._publish(source)
+            else:
+                with self._cond:
+                    self._stats["failures"] += 1
+
+            with self._cond:
+                if self._subscribers and not self.closed:
+                    self._cond.wait(max(0.0, self.interval - (time.time() - started)))
+
+    def _publish(self, source: str):
+        """Fingerprint a polled source, publish an event if the screen changed"""
+        try:
+            source_hash = self._fingerprint(source)
+        except Exception as e:
+            logger.warning(f"Watch fingerprint failed: {e}")
+            with self._cond:
+                self._stats["failures"] += 1
+            return
+
+        with self._cond:
+            self._stats["polls"] += 1
+            if self._event is not None and self._event["source_hash"] == source_hash:
+                return
+            if self._event is None:
+                seq = 1
+            else:
+                seq = self._event["seq"] + 1
+                self._stats["changes"] += 1
+            self._event = {"seq": seq, "source_hash": source_hash, "source": source, "timestamp": time.time()}
+            self._cond.notify_all()
+        logger.info(f"👁️ Screen changed ({self.name}): {source_hash}")
+
+    def close(self):
+        """Stop the loop and release all subscribers (driver quit)"""
+        with self._cond:
+            self.closed = True
+            self._cond.notify_all()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._cond:
+            return {
+                **self._stats,
+                "name": self.name,
+                "subscribers": len(self._subscribers),
+                "running": self._thread is not None,
+                "interval": self.interval
+            }
@@ -0,0 +1,85 @@
+"""
+Single-flight - Coalesces concurrent calls with the same key into one execution
+"""
+import logging
+import threading
+from typing import Any, Callable, Dict, Hashable, Optional
+
+from backend.core.constants import SCAN_FLIGHT_TIMEOUT
+from backend.core.exceptions import DriverTimeoutError
+
+logger = logging.getLogger(__name__)
+
+
+class _Flight:
+    """One in-flight call: followers wait on done, then read result / error"""
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result: Any = None
+        self.error: Optional[BaseException] = None
+
+
+class SingleFlight:
+    """
+    While a call for a key is running (the leader), later calls for the same
+    key (followers) do not run their function: they wait for the leader and
+    share its result or its exception.
+    """
+
+    def __init__(self, timeout: float = SCAN_FLIGHT_TIMEOUT):
+        self.timeout = timeout
+        self._flights: Dict[Hashable, _Flight] = {}
+        self._lock = threading.Lock()
+        self.leaders = 0
+        self.shared = 0
+
+    def do(self, key: Hashable, fn: Callable[[], Any]) -> Any:
+        """
+        Run fn once for all concurrent callers with the same key
+
+        Args:
+            key: Coalescing key
+            fn: Function to run (by the leader only)
+
+        Returns:
+            Result of fn (the leader's result for followers)
+
+        Raises:
+            DriverTimeoutError: A follower waited longer than timeout
+        """
+        with self._lock:
+            flight = self._flights.get(key)
+            leader = flight is None
+            if leader:
+                flight = _Flight()
+                self._flights[key] = flight
+                self.leaders += 1
+            else:
+                self.shared += 1
+
+        if not leader:
+            logger.info(f"🔗 Joining in-flight call: {key}")
+            if not flight.done.wait(self.timeout):
+                raise DriverTimeoutError("Timed out waiting for a concurrent scan",
+                                         f"No result after {self.timeout}s")
+            if flight.error is not None:
+                raise flight.error
+            return flight.result
+
+        try:
+            flight.result = fn()
+            return flight.result
+        except BaseException as e:
+            flight.error = e
+            raise
+        finally:
+            # Sonraki çağrılar yeni bir uçuş başlatır
+            with self._lock:
+                del self._flights[key]
+            flight.done.set()
+
+    def stats(self) -> Dict[str, int]:
+        """Leader / follower counters"""
+        with self._lock:
+            return {"in_flight": len(self._flights), "leaders": self.leaders, "shared": self.shared}
@@ -25,6 +25,13 @@ class AppController {
         this.currentPlatform = "ANDROID";
         this.deletedLocators = new Set();
         this.allElements = [];
+        this.streamScans = true; // Overlay'ler analiz bitmeden çizilir (/api/scan/stream)
+        this.screenshot = null; // Son taramanın görüntü bilgisi (piramit seviyeleri)
+        this.liveView = false; // Nav Mode: görüntü /api/screen/live akışından gelir
+        this.watch = null; // Watch Mode: /api/screen/events bağlantısı (EventSource + tarama seçenekleri)
+        this.sourceHash = null; // Ekrandaki taramanın parmak izi
+        this.scanning = false;
+        this.imageFormat = document.createElement('canvas').toDataURL('image/webp').startsWith('data:image/webp') ? 'webp' : 'jpg';
 
         this.init();
     }
@@ -44,6 +51,9 @@ class AppController {
         // State değişikliklerini dinle
         this.state.subscribe('ui.currentHoverIndex', (idx) => this.handleHighlight(idx));
         this.state.subscribe('elements', (elements) => this.renderAll(elements));
+
+        // Yakınlaştırınca (devicePixelRatio değişir) daha büyük seviye yüklenir
+        window.addEventListener('resize', () => this.upgradeScreenshot());
     }
 
     // --- Core Actions ---
@@ -55,38 +65,172 @@ class AppController {
         this.ui.setLoading(true, "ANALYZING...");
         this.ui.showEmptyState(false);
         this.clearData();
+        this.scanning = true;
 
         try {
-            const data = await this.api.scan(this.currentPlatform, verify, prefix);
-            this.handleScanResult(data);
+            if (this.streamScans) {
+                await this.scanScreenStream(verify, prefix);
+            } else {
+                const data = await this.api.scan(this.currentPlatform, verify, prefix, this.imageOptions());
+                this.handleScanResult(data);
+            }
         } catch (error) {
             console.error(error);
             this.ui.showToast("Error", error.message || "Scan failed", "error");
             this.ui.resetState();
             this.ui.showEmptyState(true);
+        } finally {
+            this.scanning = false;
+            // Sayfa adı değiştiyse ön hesaplama yeni seçeneklerle yapılsın
+            if (this.watch && this.watch.key !== this.watchKey()) this.setWatch(true);
         }
     }
 
     handleScanResult(data) {
         const img = document.getElementById('screenshot');
-        img.src = "data:image/png;base64," + data.image;
+        this.showScreenshot(data);
 
         if (data.window_w && this.overlayMgr) {
             this.overlayMgr.setDeviceSize(data.window_w, data.window_h);
         }
 
-        img.onload = () => {
-            this.ui.resetState();
-            this.ui.showEmptyState(false);
-            if (data.page_name) document.getElementById('pagePrefix').value = data.page_name;
+        // Canlı görüntüde src değişmez, onload beklenmez
+        if (this.liveView) this.applyScanResult(data);
+        else img.onload = () => this.applyScanResult(data);
+    }
+
+    // Görüntü kutusunun fiziksel piksel boyutu (sunucu buna göre seviye seçer)
+    imageOptions() {
+        const box = document.getElementById('screenshot').parentElement;
+        const ratio = window.devicePixelRatio || 1;
+        return {
+            viewport_w: Math.round(box.clientWidth * ratio),
+            viewport_h: Math.round(box.clientHeight * ratio),
+            image_format: this.imageFormat
+        };
+    }
+
+    showScreenshot(data) {
+        this.screenshot = data.screenshot || null;
+        this.sourceHash = data.source_hash || null;
+        if (!this.liveView) document.getElementById('screenshot').src = data.image_url;
+        if (this.screenshot && this.overlayMgr) {
+            this.overlayMgr.setImageSize(this.screenshot.width, this.screenshot.height);
+        }
+    }
+
+    setLiveView(active) {
+        const img = document.getElementById('screenshot');
+        this.liveView = active;
+        if (active) {
+            const level = this.screenshot ? this.screenshot.fit_level : 1;
+            img.src = this.api.liveScreenUrl(this.currentPlatform, level);
+        } else {
+            // Akış bağlantısı kapanır, sunucudaki yakalama döngüsü durur
+            img.src = this.screenshot ? this.screenshot.url : '';
+        }
+    }
+
+    // Watch Mode seçenekleri taramanınkilerle aynı olmalı (ön hesaplanan analiz cache'ten gelir)
+    watchKey() {
+        const verify = document.getElementById('autoVerify').checked;
+        const prefix = document.getElementById('pagePrefix').value || "page";
+        return `${this.currentPlatform}|${verify}|${prefix}`;
+    }
+
+    setWatch(active) {
+        if (this.watch) {
+            // Son istemci ayrılınca sunucudaki yoklama döngüsü durur
+            this.watch.source.close();
+            this.watch = null;
+        }
+        if (!active) return;
+
+        const source = new EventSource(this.api.screenEventsUrl(this.currentPlatform, {
+            verify: document.getElementById('autoVerify').checked,
+            prefix: document.getElementById('pagePrefix').value || "page",
+            since: this.sourceHash || ''
+        }));
+        const rescan = (event) => {
+            const data = JSON.parse(event.data);
+            // Ön hesaplama açıksa analiz hazır olunca taranır
+            if (event.type === 'screen_changed' && data.precompute) return;
+            if (this.scanning || data.source_hash === this.sourceHash) return;
+            this.scanScreen();
+        };
+        source.addEventListener('screen_changed', rescan);
+        source.addEventListener('analysis_ready', rescan);
+        source.addEventListener('analysis_failed', rescan);
+        source.onerror = () => {
+            if (source.readyState !== EventSource.CLOSED) return; // Tarayıcı yeniden bağlanıyor
+            this.ui.showToast("Watch Mode", "Connection lost (is the driver running?)", "error");
+            document.getElementById('watchMode').checked = false;
+            this.ui.toggleWatchMode(false);
+            this.watch = null;
+        };
+        this.watch = { source, key: this.watchKey() };
+    }
+
+    upgradeScreenshot() {
+        const shot = this.screenshot;
+        if (!shot || this.liveView) return;
 
-            const validElements = data.elements.filter(el => !this.deletedLocators.has(el.locator));
-            this.allElements = validElements.map((el, idx) => ({ ...el, index: idx, isDeleted: false }));
+        const { viewport_w, viewport_h } = this.imageOptions();
+        const needed = shot.width * Math.min(viewport_w / shot.width, viewport_h / shot.height);
+        const level = shot.levels.filter(l => l.width >= needed).pop() || shot.levels[0];
+        if (level.level < shot.fit_level) {
+            shot.fit_level = level.level;
+            document.getElementById('screenshot').src = level.url;
+        }
+    }
+
+    applyScanResult(data) {
+        this.ui.resetState();
+        this.ui.showEmptyState(false);
+        if (data.page_name) document.getElementById('pagePrefix').value = data.page_name;
+
+        const validElements = data.elements.filter(el => !this.deletedLocators.has(el.locator));
+        this.allElements = validElements.map((el, idx) => ({ ...el, index: idx, isDeleted: false }));
+
+        this.state.set('elements', this.allElements);
+        if (this.xmlViewer) this.xmlViewer.render(data.raw_source || "");
+        this.ui.showToast("Success", `Found ${validElements.length} elements`, 'success');
+    }
 
-            this.state.set('elements', this.allElements);
-            if (this.xmlViewer) this.xmlViewer.render(data.raw_source || "");
-            this.ui.showToast("Success", `Found ${validElements.length} elements`, 'success');
+    async scanScreenStream(verify, prefix) {
+        const streamed = [];
+        let frame = null;
+
+        // Gelen kayıtları her karede bir kez çiz
+        const paint = () => {
+            frame = null;
+            const visible = streamed.filter(el => !this.deletedLocators.has(el.locator));
+            this.state.set('elements', visible.map((el, idx) => ({ ...el, index: idx, isDeleted: false })));
         };
+
+        const done = await this.api.scanStream(this.currentPlatform, verify, prefix, (record) => {
+            if (record.type === 'screen') {
+                this.showScreenshot(record);
+                if (record.window_w && this.overlayMgr) {
+                    this.overlayMgr.setDeviceSize(record.window_w, record.window_h);
+                }
+            } else if (record.type === 'element') {
+                streamed.push(record);
+                if (!frame) frame = requestAnimationFrame(paint);
+            }
+        }, this.imageOptions());
+        if (frame) cancelAnimationFrame(frame);
+
+        // Erken gelen kayıtların değişken adı sayfa adı belli olunca tamamlanır
+        const pageName = done.page_name && done.page_name.length >= 2 ? done.page_name : "page";
+        const elements = streamed
+            .map(({ type, var_suffix, ...el }) => ({
+                ...el,
+                variable: el.variable || `\${selector_${pageName}_${var_suffix}}`
+            }))
+            .sort((a, b) => a.node - b.node);
+
+        this.applyScanResult({ elements, page_name: done.page_name, raw_source: done.raw_source });
     }
 
     async performTap(x, y, imgW, imgH) {
@@ -103,6 +247,20 @@ class AppController {
         }
     }
 
+    // Noktanın altındaki en üstteki analiz edilmiş element (cihaza gitmeden, son taramanın ağacından)
+    async selectElementAt(x, y, imgW, imgH, fallbackIndex) {
+        let index = fallbackIndex;
+        try {
+            const res = await this.api.hitTest(x, y, imgW, imgH, this.currentPlatform);
+            const byNode = new Map(this.state.getActiveElements().map(el => [el.node, el.index]));
+            const hit = res.stack.find(item => byNode.has(item.node));
+            if (hit) index = byNode.get(hit.node);
+        } catch (e) {
+            console.warn("Hit-test failed, selecting the clicked box", e);
+        }
+        this.state.set('ui.currentHoverIndex', index);
+    }
+
     async performScroll(direction) {
         this.ui.setLoading(true, "SCROLLING...");
         try {
@@ -158,6 +316,18 @@ class AppController {
         });
     }
 
+    // full_xpath taramada istenmediyse sunucuda o element için üretilir
+    async copyFullXPath(element) {
+        try {
+            const xpath = element.full_xpath ||
+                (await this.api.getFullXPath(element.node, this.currentPlatform, this.sourceHash)).full_xpath;
+            await navigator.clipboard.writeText(xpath);
+            this.ui.showToast("Copied", "Full XPath copied to clipboard");
+        } catch (e) {
+            this.ui.showToast("Error", e.userMessage || "Failed to build full XPath", "error");
+        }
+    }
+
     async handleAssertion(type, element) {
         if (!this.state.get('recorder.isRecording')) {
             this.ui.showToast("Info", "Enable Recording first to add assertions", "info");
@@ -223,13 +393,22 @@ class AppController {
 
         window.toggleNavMode = (el) => {
             this.ui.toggleNavMode(el.checked);
+            this.setLiveView(el.checked);
             this.clearData();
             this.state.set('ui.currentHoverIndex', -1);
         };
-        window.toggleVerifyUI = (el) => this.ui.toggleVerifyMode(el.checked);
+        window.toggleWatchMode = (el) => {
+            this.ui.toggleWatchMode(el.checked);
+            this.setWatch(el.checked);
+        };
+        window.toggleVerifyUI = (el) => {
+            this.ui.toggleVerifyMode(el.checked);
+            if (this.watch) this.setWatch(true);
+        };
         window.togglePlatform = () => {
             this.currentPlatform = this.currentPlatform === "ANDROID" ? "IOS" : "ANDROID";
             this.ui.togglePlatform(this.currentPlatform);
+            if (this.watch) this.setWatch(true);
         };
         window.toggleSourceView = (mode) => {
             this.ui.toggleSourceView(mode);
@@ -254,6 +433,8 @@ class AppController {
             this.state.set('ui.currentHoverIndex', index);
         };
 
+        window.selectElementAt = (x, y, imgW, imgH, fallbackIndex) => this.selectElementAt(x, y, imgW, imgH, fallbackIndex);
+
         window.clearSelection = () => {
              this.state.set('ui.currentHoverIndex', -1);
              const svg = document.getElementById('connector-path');
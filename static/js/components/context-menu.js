@@ -47,6 +47,10 @@ class ContextMenu {
                         window.app.ui.showToast('Copied', 'Locator copied to clipboard');
                     }
                 }
+            },
+            {
+                label: '🧭 Copy Full XPath',
+                action: () => window.app.copyFullXPath(targetElement)
             }
         ];
 
@@ -8,6 +8,8 @@ class OverlayManager {
         this.image = document.getElementById(imageId);
         this.deviceW = 0;
         this.deviceH = 0;
+        this.imageW = 0; // Tam çözünürlük (gösterilen rendition daha küçük olabilir)
+        this.imageH = 0;
 
         // Resize Observer: Resim boyutu değişince kutuları güncelle
         if (this.image) {
@@ -28,6 +30,11 @@ class OverlayManager {
         this.deviceH = h;
     }
 
+    setImageSize(w, h) {
+        this.imageW = w;
+        this.imageH = h;
+    }
+
     render(elements) {
         if (!this.container) return;
         this.container.innerHTML = ''; // Temizle
@@ -71,11 +78,14 @@ class OverlayManager {
                 if (window.performTap && this.image) {
                     const cx = el.coords.x + el.coords.w / 2;
                     const cy = el.coords.y + el.coords.h / 2;
-                    window.performTap(cx, cy, this.image.naturalWidth, this.image.naturalHeight);
+                    window.performTap(cx, cy, this.imageW || this.image.naturalWidth, this.imageH || this.image.naturalHeight);
                 }
             } else {
-                // Seçim modu
-                if (window.highlightElement) {
+                // Seçim modu: üst üste binen kutularda sunucunun z-sırası kullanılır (/api/hit-test)
+                if (window.selectElementAt && this.image) {
+                    const rect = this.image.getBoundingClientRect();
+                    window.selectElementAt(e.clientX - rect.left, e.clientY - rect.top, rect.width, rect.height, index);
+                } else if (window.highlightElement) {
                     window.highlightElement(index, true);
                 }
             }
@@ -123,6 +123,12 @@ class UIManager {
         else { ui.classList.remove('active'); document.body.classList.remove('nav-mode'); }
     }
 
+    toggleWatchMode(active) {
+        const ui = document.getElementById('watch-switch-ui');
+        if (active) { ui.classList.add('active'); this.showToast("Watch Mode", "Rescanning when the device screen changes", "info"); }
+        else ui.classList.remove('active');
+    }
+
     toggleVerifyMode(active) {
         const ui = document.getElementById('verify-switch-ui');
         if (active) ui.classList.add('active'); else ui.classList.remove('active');
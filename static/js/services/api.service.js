@@ -18,6 +18,23 @@ class ApiService {
         this.timeout = 30000;
         this.retryAttempts = 2;
         this.retryDelay = 1000;
+        this.conditionalCache = new Map(); // request key -> { etag, data } (If-None-Match)
+        this.conditionalCacheSize = 4;
+    }
+
+    /**
+     * Conditional requests: the last response of a request is kept with its ETag,
+     * a 304 answer returns the kept data instead of a body.
+     */
+    conditionalEntry(key) { return this.conditionalCache.get(key); }
+
+    rememberConditional(key, etag, data) {
+        if (!etag) return;
+        this.conditionalCache.delete(key);
+        this.conditionalCache.set(key, { etag, data });
+        while (this.conditionalCache.size > this.conditionalCacheSize) {
+            this.conditionalCache.delete(this.conditionalCache.keys().next().value);
+        }
     }
 
     async request(endpoint, options = {}) {
@@ -32,6 +49,10 @@ class ApiService {
             config.body = JSON.stringify(options.body);
         }
 
+        const conditionalKey = options.conditional ? `${config.method} ${url} ${config.body || ''}` : null;
+        const known = conditionalKey && this.conditionalEntry(conditionalKey);
+        if (known) config.headers = { ...config.headers, 'If-None-Match': known.etag };
+
         let lastError;
 
         for (let attempt = 0; attempt <= this.retryAttempts; attempt++) {
@@ -40,6 +61,10 @@ class ApiService {
                 const timeoutId = setTimeout(() => controller.abort(), this.timeout);
                 const response = await fetch(url, { ...config, signal: controller.signal });
                 clearTimeout(timeoutId);
+
+                // Değişmedi: son yanıt tekrar kullanılır
+                if (response.status === 304 && known) return known.data;
+
                 const data = await response.json();
 
                 if (!response.ok) {
@@ -50,7 +75,9 @@ class ApiService {
                         data.error?.details
                     );
                 }
-                return data.data || data;
+                const result = data.data || data;
+                if (conditionalKey) this.rememberConditional(conditionalKey, response.headers.get('ETag'), result);
+                return result;
 
             } catch (error) {
                 lastError = error;
@@ -64,14 +91,80 @@ class ApiService {
 
     delay(ms) { return new Promise(resolve => setTimeout(resolve, ms)); }
 
+    /**
+     * NDJSON stream request: calls onRecord for every line, resolves with the "done" record.
+     * No retries (records may already have been consumed).
+     * Conditional: on 304 the records of the last stream are replayed.
+     */
+    async streamRequest(endpoint, body, onRecord) {
+        const payload = JSON.stringify(body);
+        const conditionalKey = `STREAM ${endpoint} ${payload}`;
+        const known = this.conditionalEntry(conditionalKey);
+        const headers = { 'Content-Type': 'application/json' };
+        if (known) headers['If-None-Match'] = known.etag;
+
+        const response = await fetch(`${this.baseUrl}${endpoint}`, {
+            method: 'POST',
+            headers,
+            body: payload
+        });
+
+        if (response.status === 304 && known) {
+            known.data.forEach(onRecord);
+            return known.data[known.data.length - 1];
+        }
+
+        if (!response.ok) {
+            const data = await response.json().catch(() => ({}));
+            throw new ApiError(
+                data.message || data.error?.message || 'Request failed',
+                response.status,
+                data.message || data.error?.message || 'An error occurred',
+                data.details || data.error?.details
+            );
+        }
+
+        const reader = response.body.getReader();
+        const decoder = new TextDecoder();
+        let buffer = '';
+        let done = null;
+        const records = [];
+
+        const handleLine = (line) => {
+            if (!line.trim()) return;
+            const record = JSON.parse(line);
+            if (record.type === 'error') throw new ApiError(record.error, 500, record.error, null);
+            if (record.type === 'done') done = record;
+            records.push(record);
+            onRecord(record);
+        };
+
+        while (true) {
+            const { value, done: finished } = await reader.read();
+            if (finished) break;
+            buffer += decoder.decode(value, { stream: true });
+            const lines = buffer.split('\n');
+            buffer = lines.pop();
+            lines.forEach(handleLine);
+        }
+        handleLine(buffer + decoder.decode());
+
+        if (!done) throw new ApiError('Stream ended early', 500, 'Scan stream was interrupted.', null);
+        this.rememberConditional(conditionalKey, response.headers.get('ETag'), records);
+        return done;
+    }
+
     // ====================
     // API ENDPOINTS
     // ====================
 
     async getConfig() { return await this.request('/api/config', { method: 'GET' }); }
     async saveConfig(config) { return await this.request('/api/config', { method: 'POST', body: config }); }
-    async scan(platform, verify, prefix) { return await this.request('/api/scan', { method: 'POST', body: { platform, verify, prefix } }); }
+    async scan(platform, verify, prefix, imageOptions = {}) { return await this.request('/api/scan', { method: 'POST', body: { platform, verify, prefix, ...imageOptions }, conditional: true }); }
+    async scanStream(platform, verify, prefix, onRecord, imageOptions = {}) { return await this.streamRequest('/api/scan/stream', { platform, verify, prefix, ...imageOptions }, onRecord); }
     async tap(x, y, img_w, img_h, platform) { return await this.request('/api/tap', { method: 'POST', body: { x, y, img_w, img_h, platform } }); }
+    async hitTest(x, y, img_w, img_h, platform) { return await this.request('/api/hit-test', { method: 'POST', body: { x, y, img_w, img_h, platform } }); }
+    async getFullXPath(node, platform, sourceHash) { return await this.request(`/api/elements/${node}/xpath?platform=${platform}&source_hash=${encodeURIComponent(sourceHash)}`, { method: 'GET' }); }
     async scroll(direction, platform) { return await this.request('/api/scroll', { method: 'POST', body: { direction, platform } }); }
     async back() { return await this.request('/api/back', { method: 'POST' }); }
     async hideKeyboard() { return await this.request('/api/hide-keyboard', { method: 'POST' }); }
@@ -93,6 +186,10 @@ class ApiService {
     }
 
     async health() { return await this.request('/health', { method: 'GET' }); }
+
+    // MJPEG: <img src> olarak kullanılır, ekran değiştikçe yeni kare gelir
+    liveScreenUrl(platform, level = 1) { return `${this.baseUrl}/api/screen/live?platform=${platform}&level=${level}`; }
+    screenEventsUrl(platform, params = {}) { return `${this.baseUrl}/api/screen/events?${new URLSearchParams({ platform, ...params })}`; }
 }
 
 const api = new ApiService();
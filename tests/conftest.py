@@ -0,0 +1,16 @@
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from backend.api.services.locator_memo import locator_memo  # noqa: E402
+
+
+@pytest.fixture(autouse=True)
+def fresh_locator_memo():
+    """The locator memo is process-wide: every test starts without remembered locators"""
+    locator_memo.clear()
+    yield
+    locator_memo.clear()
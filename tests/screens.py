@@ -0,0 +1,81 @@
+"""
+Synthetic Android page sources for analyzer tests
+"""
+import random
+from typing import List, Optional
+
+from lxml import etree
+
+WINDOW = {"width": 1080, "height": 2400}
+
+CLASSES = [
+    "android.widget.TextView", "android.widget.Button", "android.widget.ImageView",
+    "android.widget.EditText", "android.widget.LinearLayout", "android.widget.FrameLayout"
+]
+TEXTS = ["", "", "Login", "Cancel", "OK", "Settings", "Profile", "10.30", "Next", "Same"]
+IDS = ["", "", "", "com.app:id/title", "com.app:id/icon", "com.app:id/list", "com.app:id/panel"]
+DESCS = ["", "", "", "", "Back", "Menu"]
+
+
+def node(cls: str, bounds: str, text: str = "", res_id: str = "", desc: str = "",
+         **extra: str) -> etree.Element:
+    elem = etree.Element(cls)
+    elem.set("class", cls)
+    elem.set("text", text)
+    elem.set("resource-id", res_id)
+    elem.set("content-desc", desc)
+    for name, value in extra.items():
+        elem.set(name.replace("_", "-"), value)
+    elem.set("bounds", bounds)
+    return elem
+
+
+def to_source(root: etree.Element) -> str:
+    return etree.tostring(root, encoding="unicode")
+
+
+def random_node(rnd: random.Random) -> etree.Element:
+    x, y = rnd.randrange(0, 900), rnd.randrange(0, 2200)
+    w, h = rnd.randrange(5, 180), rnd.randrange(5, 180)
+    return node(rnd.choice(CLASSES), f"[{x},{y}][{x + w},{y + h}]",
+                rnd.choice(TEXTS), rnd.choice(IDS), rnd.choice(DESCS))
+
+
+def random_screen(rnd: random.Random, size: int = 60) -> etree.Element:
+    """Random tree of about `size` nodes under a full-screen FrameLayout"""
+    root = etree.Element("hierarchy")
+    frame = node("android.widget.FrameLayout", "[0,0][1080,2400]")
+    root.append(frame)
+    elements = [frame]
+    for _ in range(size):
+        parent = rnd.choice(elements)
+        child = random_node(rnd)
+        parent.append(child)
+        elements.append(child)
+    return root
+
+
+def random_edit(rnd: random.Random, root: etree.Element) -> str:
+    """Apply one local edit (what a tap typically changes) and describe it"""
+    elements: List[etree.Element] = list(root.iter())[2:]
+    target = rnd.choice(elements)
+    kind = rnd.choice(["insert", "insert_same_tag", "remove", "text", "res_id", "desc"])
+
+    if kind == "insert":
+        target.insert(rnd.randrange(len(target) + 1), random_node(rnd))
+    elif kind == "insert_same_tag":
+        # Same-tag sibling: shifts sibling indexes of hierarchical paths
+        parent: Optional[etree.Element] = target.getparent()
+        sibling = random_node(rnd)
+        sibling.tag = target.tag
+        sibling.set("class", target.tag)
+        parent.insert(rnd.randrange(len(parent) + 1), sibling)
+    elif kind == "remove":
+        target.getparent().remove(target)
+    elif kind == "text":
+        target.set("text", rnd.choice(TEXTS))
+    elif kind == "res_id":
+        target.set("resource-id", rnd.choice(IDS))
+    else:
+        target.set("content-desc", rnd.choice(DESCS))
+    return kind
@@ -0,0 +1,55 @@
+from backend.core.cache import CacheManager
+
+KEY = ("ANDROID", "", True, False)
+
+
+def cached_screen():
+    cache = CacheManager()
+    cache.save_scan("screen", b"png", "<hierarchy/>", {"width": 1080, "height": 2400}, phash="00")
+    cache.save_analysis("screen", KEY, {"elements": [], "page_name": "Home"})
+    return cache
+
+
+def test_analysis_lookup_does_not_count_as_a_scan_lookup():
+    cache = cached_screen()
+    cache.get_scan("screen")
+    assert cache.get_analysis("screen", KEY) == {"elements": [], "page_name": "Home"}
+    assert cache.get_analysis("other", KEY) is None
+
+    stats = cache.stats()
+    assert (stats["hits"], stats["misses"]) == (1, 0)
+    cache.stop()
+
+
+def test_expired_analysis_is_not_served():
+    cache = cached_screen()
+    cache.ttl = -1
+    assert cache.get_analysis("screen", KEY) is None
+    cache.stop()
+
+
+def test_saving_a_screen_leaves_the_last_scan_to_the_caller():
+    cache = CacheManager()
+    shown = cache.save_scan("shown", b"png", "<hierarchy/>", {"width": 1080, "height": 2400})
+    cache.set_last_scan(shown)
+
+    # Arka planda hazırlanan ekran (watch mode) son taramayı değiştirmez
+    warmed = cache.save_scan("warmed", b"other", "<hierarchy><node/></hierarchy>", {"width": 1080, "height": 2400})
+    cache.replace_image("shown", b"new png")
+    assert cache.get_last_scan() is shown
+    assert warmed["source_hash"] == "warmed" and cache.get_image(warmed["image_id"]) == b"other"
+    cache.stop()
+
+
+def test_shared_screenshot_outlives_one_of_its_entries():
+    cache = CacheManager()
+    window = {"width": 1080, "height": 2400}
+    first = cache.save_scan("first", b"png", "<hierarchy/>", window)
+    cache.save_scan("second", b"png", "<hierarchy><node/></hierarchy>", window)
+
+    # Görüntüyü tutan kayıtlardan biri gider, diğeri hâlâ aynı görüntüyü kullanır
+    cache._remove("second")
+    assert cache.get_image(first["image_id"]) == b"png"
+    cache._remove("first")
+    assert cache.get_image(first["image_id"]) is None
+    cache.stop()
@@ -0,0 +1,147 @@
+import json
+import os
+import time
+
+from backend.core.cache import CacheManager
+from backend.core.disk_cache import DiskCache
+
+KEY = ("ANDROID", "", True, False)
+WINDOW = {"width": 1080, "height": 2400}
+
+
+def disk_cache(directory, max_bytes=1024 * 1024):
+    return DiskCache(str(directory), max_bytes, ttl=3600, flush_interval=3600)
+
+
+def test_records_and_deltas_reload_after_close(tmp_path):
+    cache = disk_cache(tmp_path)
+    cache.put("a", {"timestamp": 1e12, "n": 1}, b"base")
+    cache.append("a", {"n": 2}, b"delta")
+    cache.append("missing", {"n": 3}, b"ignored")
+    cache.close()
+
+    reopened = disk_cache(tmp_path)
+    meta, blobs, deltas = reopened.get("a")
+    assert (meta["n"], blobs) == (1, b"base")
+    assert [(delta["n"], data) for delta, data in deltas] == [(2, b"delta")]
+    assert reopened.get("missing") is None
+    reopened.close()
+
+
+def test_unflushed_records_are_recovered_and_torn_tail_dropped(tmp_path):
+    cache = disk_cache(tmp_path)
+    cache.put("a", {"timestamp": 1e12}, b"base")
+    cache.close()
+
+    # Index yazılmadan kapanmış süreç: kayıtlar data.bin'den yeniden okunur
+    cache = disk_cache(tmp_path)
+    cache.put("b", {"timestamp": 1e12}, b"second")
+    cache.append("a", {}, b"delta")
+    cache._append_file.flush()
+    with open(os.path.join(tmp_path, DiskCache.DATA_FILE), "ab") as f:
+        f.write(b"RPC1torn")
+
+    reopened = disk_cache(tmp_path)
+    assert reopened.get("b")[1] == b"second"
+    assert [data for _, data in reopened.get("a")[2]] == [b"delta"]
+    assert os.path.getsize(os.path.join(tmp_path, DiskCache.DATA_FILE)) == reopened.stats()["bytes"]
+    reopened.close()
+
+
+def test_flush_writes_the_index_of_appended_records(tmp_path):
+    cache = disk_cache(tmp_path)
+    cache.put("a", {"timestamp": 1e12}, b"base")
+    cache.flush()
+    with open(os.path.join(tmp_path, DiskCache.INDEX_FILE), encoding="utf-8") as f:
+        assert "a" in json.load(f)["entries"]
+    cache.close()
+
+
+def test_compaction_keeps_recently_used_records_with_their_deltas(tmp_path):
+    cache = disk_cache(tmp_path, max_bytes=4000)
+    cache.put("old", {"timestamp": 1e12}, b"x" * 800)
+    cache.put("used", {"timestamp": 1e12}, b"y" * 500)
+    cache.append("used", {}, b"delta")
+    # Bütçeyi aşan yazım flusher'ı uyandırır: en uzun süredir kullanılmayan kayıtlar çıkarılır
+    for name in ("c", "d", "e", "f"):
+        cache.get("used")
+        cache.put(name, {"timestamp": 1e12}, b"z" * 800)
+    cache.flush()
+
+    assert cache.get("old") is None
+    meta, blobs, deltas = cache.get("used")
+    assert blobs == b"y" * 500 and [data for _, data in deltas] == [b"delta"]
+    assert cache.stats()["bytes"] <= 4000
+    cache.close()
+
+    reopened = disk_cache(tmp_path, max_bytes=4000)
+    assert reopened.get("old") is None
+    assert [data for _, data in reopened.get("used")[2]] == [b"delta"]
+    reopened.close()
+
+
+def test_record_stored_under_another_key_is_a_miss(tmp_path):
+    cache = disk_cache(tmp_path)
+    cache.put("a", {"timestamp": 1e12}, b"first")
+    cache.put("b", {"timestamp": 1e12}, b"second")
+    # Bozuk index: "a" başka bir anahtarın kaydını gösterir
+    cache._index["a"][:2] = cache._index["b"][:2]
+    assert cache.get("a") is None
+    assert "a" not in cache._index and cache.get("b")[1] == b"second"
+    cache.close()
+
+
+def test_scan_cache_persists_once_and_reloads_analyses(tmp_path):
+    cache = CacheManager(disk_dir=str(tmp_path))
+    cache.save_scan("screen", b"png", "<hierarchy/>", WINDOW, phash="00")
+    cache.save_analysis("screen", KEY, {"elements": [], "page_name": "Home"})
+    # Bir temel kayıt + analiz için küçük bir delta kaydı
+    assert len(cache.disk._index["screen"][4]) == 1
+    cache.stop()
+
+    restarted = CacheManager(disk_dir=str(tmp_path))
+    entry = restarted.get_scan("screen")
+    assert (entry["image"], entry["source"], entry["window"]) == (b"png", "<hierarchy/>", WINDOW)
+    assert restarted.get_analysis("screen", KEY) == {"elements": [], "page_name": "Home"}
+    assert restarted.stats()["disk_hits"] == 1
+    restarted.stop()
+
+
+def test_promoted_entry_starts_a_fresh_memory_ttl(tmp_path):
+    cache = CacheManager(disk_dir=str(tmp_path))
+    cache.save_scan("screen", b"png", "<hierarchy/>", WINDOW)
+    cache.save_analysis("screen", KEY, {"elements": [], "page_name": "Home"})
+    cache.stop()
+
+    # İki dakika önce kaydedilmiş gibi: bellek TTL'ini aşar, disk TTL'i içindedir
+    disk = disk_cache(tmp_path, max_bytes=500 * 1024 * 1024)
+    meta, blobs, deltas = disk.get("screen")
+    saved_at = time.time() - 120
+    disk.put("screen", dict(meta, timestamp=saved_at), blobs)
+    for delta, data in deltas:
+        disk.append("screen", delta, data)
+    disk.close()
+
+    restarted = CacheManager(disk_dir=str(tmp_path), ttl=60)
+    assert restarted.get_scan("screen")["timestamp"] > saved_at
+    assert restarted.get_analysis("screen", KEY) == {"elements": [], "page_name": "Home"}
+    restarted.stop()
+
+
+def test_analysis_of_a_replaced_source_is_not_reloaded(tmp_path):
+    cache = CacheManager(disk_dir=str(tmp_path))
+    cache.save_scan("screen", b"png", "<hierarchy/>", WINDOW)
+    cache.save_analysis("screen", KEY, {"elements": [], "page_name": "Old"})
+    cache.stop()
+
+    # Aynı parmak izi, farklı kaynak: eski analizin delta kaydı kullanılmaz
+    disk = disk_cache(tmp_path, max_bytes=500 * 1024 * 1024)
+    meta, blobs, _ = disk.get("screen")
+    disk.put("screen", dict(meta, source=0), blobs[:meta["image"]])
+    disk.append("screen", {"analysis": list(KEY), "source_crc": 1, "raw_size": 2}, b"{}")
+    disk.close()
+
+    restarted = CacheManager(disk_dir=str(tmp_path))
+    assert restarted.get_scan("screen")["source"] == ""
+    assert restarted.get_analysis("screen", KEY) is None
+    restarted.stop()
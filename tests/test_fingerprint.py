@@ -0,0 +1,40 @@
+from lxml import etree
+
+from backend.core.fingerprint import screen_fingerprint
+from screens import node, to_source
+
+APP = "com.app"
+SYSTEM_UI = "com.android.systemui"
+
+
+def screen(clock="10:30", status_clock="10:30", price="10.30", focused="false"):
+    root = etree.Element("hierarchy")
+    status = node("android.widget.FrameLayout", "[0,0][1080,60]", package=SYSTEM_UI)
+    status.append(node("android.widget.TextView", "[0,0][100,60]", text=status_clock,
+                       res_id="com.android.systemui:id/clock", package=SYSTEM_UI))
+    # System UI text without a skipped resource-id (e.g. a notification header clock)
+    status.append(node("android.widget.TextView", "[900,0][1080,60]", text=clock, package=SYSTEM_UI))
+    root.append(status)
+
+    app = node("android.widget.FrameLayout", "[0,60][1080,2400]", package=APP)
+    app.append(node("android.widget.TextView", "[0,100][500,200]", text=price,
+                    res_id="com.app:id/price", package=APP, focused=focused))
+    root.append(app)
+    return to_source(root)
+
+
+def test_system_ui_clock_is_ignored():
+    assert screen_fingerprint(screen()) == screen_fingerprint(screen(clock="11:45", status_clock="11:45"))
+
+
+def test_app_text_matching_the_clock_pattern_is_content():
+    assert screen_fingerprint(screen()) != screen_fingerprint(screen(price="12.30"))
+
+
+def test_volatile_attributes_are_ignored():
+    assert screen_fingerprint(screen()) == screen_fingerprint(screen(focused="true"))
+
+
+def test_system_packages_come_from_config():
+    config = {"FINGERPRINT_SYSTEM_PKGS": f"{SYSTEM_UI},{APP}"}
+    assert screen_fingerprint(screen(), config) == screen_fingerprint(screen(price="12.30"), config)
@@ -0,0 +1,61 @@
+import copy
+import random
+
+import pytest
+
+from backend.api.services.locator_memo import locator_memo
+from backend.api.services.page_analyzer import PageAnalyzer
+from screens import WINDOW, node, random_edit, random_screen, to_source
+
+
+def analyze(source, previous=None, full_xpath=False):
+    analyzer = PageAnalyzer(None)
+    result = analyzer.analyze(source, "ANDROID", True, "test", WINDOW,
+                              include_full_xpath=full_xpath, previous=previous)
+    return result, analyzer.snapshot
+
+
+def fresh(source, full_xpath=False):
+    locator_memo.clear()
+    return analyze(source, full_xpath=full_xpath)[0]
+
+
+@pytest.mark.parametrize("seed", range(30))
+@pytest.mark.parametrize("full_xpath", [False, True])
+def test_incremental_matches_fresh_analysis(seed, full_xpath):
+    rnd = random.Random(seed)
+    root = random_screen(rnd)
+    _, snapshot = analyze(to_source(root), full_xpath=full_xpath)
+
+    for _ in range(6):
+        edited = copy.deepcopy(root)
+        kind = random_edit(rnd, edited)
+        source = to_source(edited)
+
+        incremental, next_snapshot = analyze(source, previous=snapshot, full_xpath=full_xpath)
+        assert incremental == fresh(source, full_xpath), f"seed {seed}, edit {kind}"
+        root, snapshot = edited, next_snapshot
+
+
+def test_same_tag_sibling_revalidates_hierarchical_path():
+    root = node("hierarchy", "[0,0][1080,2400]")
+    frame = node("android.widget.FrameLayout", "[0,0][1080,2400]")
+    root.append(frame)
+    group = node("android.widget.LinearLayout", "[0,0][1080,1200]")
+    frame.append(group)
+    inner = node("android.widget.LinearLayout", "[0,0][1080,600]")
+    group.append(inner)
+    inner.append(node("android.widget.ImageView", "[0,0][100,100]"))
+    inner.append(node("android.widget.ImageView", "[0,100][100,200]"))
+
+    _, snapshot = analyze(to_source(root))
+
+    # New same-tag sibling of `group`: its step becomes LinearLayout[1]
+    frame.append(node("android.widget.LinearLayout", "[0,1200][1080,2400]"))
+    source = to_source(root)
+    incremental, _ = analyze(source, previous=snapshot)
+
+    locators = [e["locator"] for e in incremental["elements"]]
+    assert "xpath=//android.widget.FrameLayout/android.widget.LinearLayout[1]/" \
+           "android.widget.LinearLayout/android.widget.ImageView[1]" in locators
+    assert incremental == fresh(source)
@@ -0,0 +1,26 @@
+from lxml import etree
+
+from backend.api.services.page_analyzer import PageAnalyzer
+from screens import node, to_source
+
+
+def memo_key(with_comment):
+    root = etree.Element("hierarchy")
+    frame = node("android.widget.FrameLayout", "[0,0][1080,2400]")
+    root.append(frame)
+    frame.append(node("android.widget.TextView", "[0,0][500,100]", text="Email"))
+    if with_comment:
+        frame.append(etree.Comment("spacer"))
+    button = node("android.widget.Button", "[0,100][500,200]", text="Send")
+    frame.append(button)
+
+    analyzer = PageAnalyzer(None)
+    tree = etree.fromstring(to_source(root).replace("<!--spacer-->", "<!--spacer--><?pi x?>"))
+    elem = tree.xpath("//android.widget.Button")[0]
+    index = analyzer.get_index(tree, "ANDROID")
+    info = analyzer._element_info(elem, "ANDROID")
+    return analyzer._memo_key(elem, info, "ANDROID", True, index, index.position(elem))
+
+
+def test_memo_key_skips_comment_and_processing_instruction_siblings():
+    assert memo_key(with_comment=True) == memo_key(with_comment=False)
@@ -0,0 +1,33 @@
+import concurrent.futures
+import logging
+import random
+
+from backend.api.services import page_analyzer
+from backend.api.services.locator_memo import locator_memo
+from backend.api.services.page_analyzer import AnalyzerConstants, PageAnalyzer
+from screens import WINDOW, random_screen, to_source
+
+
+def analyze(source, parallel):
+    locator_memo.clear()
+    return PageAnalyzer(None).analyze(source, "ANDROID", True, "test", WINDOW, parallel=parallel)
+
+
+def test_cold_pool_stays_serial_and_warm_pool_matches_it(monkeypatch, caplog):
+    monkeypatch.setattr(page_analyzer.os, "cpu_count", lambda: 2)
+    monkeypatch.setattr(AnalyzerConstants, "PARALLEL_MIN_CANDIDATES", 10)
+    source = to_source(random_screen(random.Random(3), size=120))
+    serial = analyze(source, parallel=False)
+
+    try:
+        # İlk paralel istek havuzu arka planda başlatır, kendisi tek süreçte çalışır
+        assert analyze(source, parallel=True) == serial
+        assert page_analyzer._process_pool is not None
+        concurrent.futures.wait(page_analyzer._process_pool_warm_up, timeout=60)
+        assert page_analyzer._warm_process_pool(2) is page_analyzer._process_pool
+
+        with caplog.at_level(logging.INFO, logger=page_analyzer.__name__):
+            assert analyze(source, parallel=True) == serial
+        assert "Parallel analysis:" in caplog.text
+    finally:
+        page_analyzer.shutdown_process_pool()
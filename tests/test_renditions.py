@@ -0,0 +1,45 @@
+import io
+
+from PIL import Image, ImageDraw
+
+from backend.api.services import renditions
+
+
+def screenshot(brightness=0, label=None):
+    """PNG of a simple screen: a header bar, a button and optional text-sized mark"""
+    image = Image.new("RGB", (1080, 2400), (200 + brightness, 200 + brightness, 200 + brightness))
+    draw = ImageDraw.Draw(image)
+    draw.rectangle([0, 0, 1080, 160], fill=(30 + brightness, 60 + brightness, 120 + brightness))
+    draw.rectangle([100, 1000, 980, 1150], fill=(20 + brightness, 140 + brightness, 60 + brightness))
+    if label:
+        draw.rectangle(label, fill=(0, 0, 0))
+    buffer = io.BytesIO()
+    image.save(buffer, format="PNG")
+    return buffer.getvalue()
+
+
+def test_recapture_of_the_same_frame_is_the_same_image():
+    first, second = renditions.frame_signature(screenshot()), renditions.frame_signature(screenshot())
+    assert renditions.hash_distance(first[0], second[0]) == 0
+    assert renditions.same_image(first, second)
+
+
+def test_brightness_change_keeps_the_dhash_but_not_the_image():
+    normal, dimmed = renditions.frame_signature(screenshot()), renditions.frame_signature(screenshot(brightness=-40))
+    # dHash yalnızca kenarlara bakar: parlaklık değişimi eşik içinde kalır
+    assert renditions.same_frame(normal[0], dimmed[0])
+    assert not renditions.same_image(normal, dimmed)
+
+
+def test_small_visible_edit_exceeds_the_threshold():
+    plain = renditions.frame_signature(screenshot())
+    edited = renditions.frame_signature(screenshot(label=[140, 1050, 200, 1090]))
+    assert renditions.hash_distance(plain[0], edited[0]) > 0
+    assert not renditions.same_frame(plain[0], edited[0])
+    assert not renditions.same_image(plain, edited)
+
+
+def test_undecodable_screenshot_has_no_signature():
+    assert renditions.frame_signature(b"not an image") == (None, None)
+    assert not renditions.same_image((None, None), (None, None))
+    assert renditions.dhash(screenshot()) == renditions.frame_signature(screenshot())[0]
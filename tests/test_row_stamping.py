@@ -0,0 +1,95 @@
+from lxml import etree
+
+from backend.api.services.page_analyzer import PageAnalyzer
+from screens import WINDOW, node, to_source
+
+ROW = "android.widget.LinearLayout"
+LABEL = "android.widget.TextView"
+ICON = "android.widget.ImageView"
+
+
+def list_screen(labels, list_id="com.app:id/list"):
+    root = etree.Element("hierarchy")
+    frame = node("android.widget.FrameLayout", "[0,0][1080,2400]")
+    root.append(frame)
+    recycler = node("androidx.recyclerview.widget.RecyclerView", "[0,200][1080,2200]", res_id=list_id)
+    frame.append(recycler)
+    for i, label in enumerate(labels):
+        y = 200 + i * 200
+        row = node(ROW, f"[0,{y}][1080,{y + 200}]")
+        row.append(node(LABEL, f"[200,{y}][1000,{y + 100}]", text=label))
+        row.append(node(ICON, f"[0,{y}][180,{y + 180}]"))
+        recycler.append(row)
+    return root
+
+
+def analyze(root):
+    analyzer = PageAnalyzer(None)
+    result = analyzer.analyze(to_source(root), "ANDROID", True, "shop", WINDOW)
+    return result, analyzer
+
+
+def test_rows_without_a_text_or_relative_locator_are_stamped():
+    result, analyzer = analyze(list_screen(["Apple", "Same1", "Same1", "Cherry"]))
+
+    by_text_anchor = f"/ancestor::{ROW}[1]"
+    by_index = f"//*[@resource-id='com.app:id/list']/{ROW}"
+    assert [(e["locator"], e["strategy"], e["variable"]) for e in result["elements"]] == [
+        ("id=com.app:id/list", "ID", "${selector_shop_list_view}"),
+        (f"xpath=//{LABEL}[@text='Apple']", "TEXT_XP", "${selector_shop_apple_lbl}"),
+        (f"xpath=//*[@text='Apple']{by_text_anchor}/{ICON}", "ROW_XP", "${selector_shop_apple_icon}"),
+        (f"xpath={by_index}[2]/{LABEL}", "ROW_XP", "${selector_shop_row_2_same1_lbl}"),
+        (f"xpath={by_index}[2]/{ICON}", "ROW_XP", "${selector_shop_row_2_icon}"),
+        (f"xpath={by_index}[3]/{LABEL}", "ROW_XP", "${selector_shop_row_3_same1_lbl}"),
+        (f"xpath={by_index}[3]/{ICON}", "ROW_XP", "${selector_shop_row_3_icon}"),
+        (f"xpath=//{LABEL}[@text='Cherry']", "TEXT_XP", "${selector_shop_cherry_lbl}"),
+        (f"xpath=//*[@text='Cherry']{by_text_anchor}/{ICON}", "ROW_XP", "${selector_shop_cherry_icon}"),
+    ]
+    # One template for the four rows
+    assert list(analyzer.index.row_templates) == [3]
+
+
+def test_stamped_locators_select_their_element():
+    root = list_screen(["Apple", "Same1", "Same1", "Cherry", "Apple"], list_id="")
+    result, analyzer = analyze(root)
+    tree = analyzer.index.root
+
+    rows = [e for e in result["elements"] if e["strategy"] == "ROW_XP"]
+    assert len(rows) == 9
+    for element in rows:
+        matches = tree.xpath(element["locator"][len("xpath="):])
+        assert matches == [analyzer.index.nodes[element["node"]]], element["locator"]
+
+    variables = [e["variable"] for e in result["elements"]]
+    assert len(set(variables)) == len(variables)
+
+
+def form_screen(labels):
+    """Settings / sign-up form: label + input rows, structurally identical"""
+    root = etree.Element("hierarchy")
+    form = node("android.widget.LinearLayout", "[0,0][1080,2400]")
+    root.append(form)
+    for i, label in enumerate(labels):
+        y = 200 + i * 200
+        row = node(ROW, f"[0,{y}][1080,{y + 200}]")
+        row.append(node(LABEL, f"[0,{y}][1080,{y + 80}]", text=label))
+        row.append(node("android.widget.EditText", f"[0,{y + 80}][1080,{y + 200}]"))
+        form.append(row)
+    return root
+
+
+def test_form_rows_keep_text_and_relative_locators():
+    result, _ = analyze(form_screen(["First name", "Last name", "Email", "Phone"]))
+
+    inputs = [e for e in result["elements"] if e["strategy"] != "TEXT_XP"]
+    assert [e["strategy"] for e in inputs] == ["ANCHOR_XP"] * 4
+    assert [e["variable"] for e in inputs] == [
+        "${selector_shop_first_name_input}", "${selector_shop_last_name_input}",
+        "${selector_shop_email_input}", "${selector_shop_phone_input}"
+    ]
+    first_label = result["elements"][0]
+    assert (first_label["locator"], first_label["variable"]) == (
+        f"xpath=//{LABEL}[@text='First name']", "${selector_shop_first_name_lbl}")
+    assert inputs[0]["locator"] == (
+        "xpath=(//*[contains(@text, 'First name') or contains(@content-desc, 'First name')]"
+        "/following::android.widget.EditText)[1]")
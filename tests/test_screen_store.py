@@ -0,0 +1,33 @@
+from lxml import etree
+
+from backend.api.services.screen_store import ScreenStore
+from backend.api.services.tree_index import TreeIndex
+from screens import node
+
+
+def screen_signature(store, texts):
+    root = etree.Element("hierarchy")
+    frame = node("android.widget.FrameLayout", "[0,0][1080,2400]")
+    root.append(frame)
+    for i, text in enumerate(texts):
+        frame.append(node("android.widget.TextView", f"[0,{i * 50}][1080,{i * 50 + 50}]", text=text))
+    return store.signature(TreeIndex(root, "ANDROID"))
+
+
+def test_chain_of_small_changes_does_not_drift_the_stored_screen():
+    store = ScreenStore()
+    texts = [f"Item {i}" for i in range(40)]
+    original = screen_signature(store, texts)
+    login = store.remember(original, "ANDROID", page_name="Login")
+
+    # Her adım öncekine çok benzer, ama zincirin sonu ilk ekrandan çok farklı
+    for step in range(8):
+        texts[step * 2:step * 2 + 2] = [f"Changed {step}a", f"Changed {step}b"]
+        signature = screen_signature(store, texts)
+        store.remember(signature, "ANDROID", store.match(signature, "ANDROID"))
+
+    final = store.match(screen_signature(store, texts), "ANDROID")
+    assert final is None or final["page_name"] is None
+    # İlk ekran hâlâ kendi imzasıyla tanınır
+    assert store.match(original, "ANDROID") == {"id": login, "similarity": 1.0,
+                                                 "page_name": "Login", "snapshot": None}
@@ -0,0 +1,73 @@
+import random
+
+import pytest
+from lxml import etree
+
+from backend.api.services.tree_index import TreeIndex
+from screens import random_screen
+
+IOS_TYPES = ["XCUIElementTypeButton", "XCUIElementTypeStaticText", "XCUIElementTypeCell", "XCUIElementTypeOther"]
+IOS_LABELS = [None, "", "Login", "Cancel", "OK", "Next"]
+
+
+def ios_screen(rnd: random.Random, size: int = 60) -> etree.Element:
+    """Random iOS tree; label and value are often equal (one XPath match, counted once)"""
+    root = etree.Element("XCUIElementTypeApplication", name="App")
+    elements = [root]
+    for _ in range(size):
+        elem = etree.SubElement(rnd.choice(elements), rnd.choice(IOS_TYPES))
+        label = rnd.choice(IOS_LABELS)
+        if label is not None:
+            elem.set("label", label)
+        value = rnd.choice([None, label, rnd.choice(IOS_LABELS)])
+        if value is not None:
+            elem.set("value", value)
+        elem.set("name", rnd.choice(["", "row", "title"]))
+        elements.append(elem)
+    return root
+
+
+@pytest.mark.parametrize("seed", range(10))
+def test_attribute_counts_match_xpath(seed):
+    root = random_screen(random.Random(seed))
+    index = TreeIndex(root, "ANDROID")
+    assert index.nodes == root.xpath("//*")
+
+    for attr in ("resource-id", "content-desc", "text"):
+        for value in set(root.xpath(f"//@{attr}")) | {"missing"}:
+            assert index.count_attr(attr, value) == len(root.xpath(f"//*[@{attr}=$v]", v=value))
+            for tag in {elem.tag for elem in index.nodes}:
+                assert index.count_attr(attr, value, tag=tag) == len(root.xpath(f"//{tag}[@{attr}=$v]", v=value))
+
+
+@pytest.mark.parametrize("seed", range(10))
+def test_scoped_counts_match_xpath(seed):
+    root = random_screen(random.Random(seed), size=80)
+    index = TreeIndex(root, "ANDROID")
+
+    for ancestor_id in set(root.xpath("//@resource-id")) - {""}:
+        for tag in {elem.tag for elem in index.nodes}:
+            scope = f"//*[@resource-id=$a]//{tag}"
+            assert index.count_scoped(ancestor_id, tag) == len(root.xpath(scope, a=ancestor_id))
+            for value in set(root.xpath("//@text")):
+                assert (index.count_scoped(ancestor_id, tag, "text", value)
+                        == len(root.xpath(f"{scope}[@text=$v]", a=ancestor_id, v=value)))
+
+
+@pytest.mark.parametrize("seed", range(10))
+def test_label_or_value_counts_match_xpath(seed):
+    root = ios_screen(random.Random(seed))
+    index = TreeIndex(root, "IOS")
+
+    for tag in IOS_TYPES:
+        for value in set(root.xpath("//@label | //@value")) | {"missing"}:
+            assert (index.count_label_or_value(tag, value)
+                    == len(root.xpath(f"//{tag}[@label=$v or @value=$v]", v=value)))
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_tag_paths_select_their_node(seed):
+    root = random_screen(random.Random(seed))
+    index = TreeIndex(root, "ANDROID")
+    for pos, elem in enumerate(index.nodes):
+        assert root.xpath(index.tag_path(pos)) == [elem]